@@ -1,9 +1,10 @@
 from django.contrib import admin
 from django.contrib.auth.models import User
+from django.utils import timezone
 from .models import (
     Profile, Post, Story, Comment,
     FriendRequest, Message, Notification,
-    BlockedUser, AdminBroadcast
+    BlockedUser, AdminBroadcast, Conversation, Job, BotRule, Friendship, FriendSuggestion
 )
 
 @admin.register(Profile)
@@ -35,8 +36,8 @@ class CommentAdmin(admin.ModelAdmin):
 
 @admin.register(Message)
 class MessageAdmin(admin.ModelAdmin):
-    list_display = ['sender', 'receiver', 'is_read', 'timestamp']
-    list_filter = ['is_read', 'timestamp']
+    list_display = ['sender', 'receiver', 'timestamp']
+    list_filter = ['timestamp']
     search_fields = ['sender__username', 'receiver__username', 'content']
 
 @admin.register(Notification)
@@ -48,6 +49,34 @@ class NotificationAdmin(admin.ModelAdmin):
 class FriendRequestAdmin(admin.ModelAdmin):
     list_display = ['from_user', 'to_user', 'created_at']
 
+@admin.register(Friendship)
+class FriendshipAdmin(admin.ModelAdmin):
+    list_display = ['user_low', 'user_high', 'created_at']
+    search_fields = ['user_low__username', 'user_high__username']
+    raw_id_fields = ['user_low', 'user_high']
+
+@admin.register(FriendSuggestion)
+class FriendSuggestionAdmin(admin.ModelAdmin):
+    list_display = ['user', 'suggested', 'mutual_count', 'created_at']
+    search_fields = ['user__username']
+    raw_id_fields = ['user', 'suggested']
+
+@admin.register(Conversation)
+class ConversationAdmin(admin.ModelAdmin):
+    list_display = ['owner', 'partner', 'last_message_at', 'unread_count', 'last_read_id']
+    search_fields = ['owner__username', 'partner__username']
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'attempts', 'run_at', 'created_at']
+    list_filter = ['status', 'name']
+    readonly_fields = ['last_error']
+    actions = ['retry_jobs']
+
+    @admin.action(description='Retry selected jobs')
+    def retry_jobs(self, request, queryset):
+        queryset.update(status=Job.PENDING, attempts=0, locked_at=None, run_at=timezone.now())
+
 @admin.register(BlockedUser)
 class BlockedUserAdmin(admin.ModelAdmin):
     list_display = ['blocker', 'blocked', 'created_at']
@@ -57,66 +86,15 @@ class BlockedUserAdmin(admin.ModelAdmin):
 @admin.register(AdminBroadcast)
 class AdminBroadcastAdmin(admin.ModelAdmin):
     """
-    Admin က AdminBroadcast တင်လိုက်ရင် TalkOfficialBot အနေနဲ့
-    User အားလုံးဆီ Message ရောက်သွားပါမယ်။
+    Admin က AdminBroadcast တင်လိုက်ရင် row တစ်ခုပဲ သိမ်းပါတယ်။
+    User တစ်ယောက်ချင်းစီ Chat ဖွင့်တဲ့အခါ ThuTalkBot ရဲ့ Message အဖြစ် ရောက်လာပါမယ် (broadcasts.py)။
     """
     list_display = ['subject', 'created_at']
     search_fields = ['subject', 'message']
 
-    def save_model(self, request, obj, form, change):
-        # ၁။ စာကို Database ထဲ အရင် သိမ်းသည်
-        super().save_model(request, obj, form, change)
-
-        # ၂။ အသစ်ပို့တဲ့ Broadcast ဆိုလျှင် (Edit လုပ်တာမဟုတ်လျှင်)
-        if not change:
-            # Views နှင့် Models ထဲက Bot username 'TalkOfficialBot' နှင့် ညီအောင် ပြင်ပေးထားပါသည်
-            bot_username = 'TalkOfficialBot'
-
-            bot_user, created = User.objects.get_or_create(
-                username=bot_username,
-                defaults={
-                    'is_active': True,
-                    'is_staff': False,
-                    'first_name': 'ThuTalk Official',
-                    'last_name': 'Bot'
-                }
-            )
-
-            # Bot ရဲ့ Profile ကို Update လုပ်သည်
-            bot_profile, _ = Profile.objects.get_or_create(user=bot_user)
-            bot_profile.role = 'Official'
-            bot_profile.is_verified = True
-
-            # Bot အတွက် Talk ID ကို talk-0000 ဟု သတ်မှတ်သည်
-            if not bot_profile.talk_id:
-                bot_profile.talk_id = "talk-0000"
-
-            bot_profile.save()
-
-            # ၃။ User အားလုံးဆီ Message ပို့မည်
-            # Bot ကိုယ်တိုင်နှင့် အခြား AI Bot (ThuTalk) ကို ချန်လှပ်သည်
-            all_users = User.objects.exclude(id=bot_user.id).exclude(username='ThuTalk')
-
-            broadcast_messages = [
-                Message(
-                    sender=bot_user,
-                    receiver=user,
-                    content=f"📢 *{obj.subject}*\n\n{obj.message}"
-                ) for user in all_users
-            ]
-
-            # Bulk create ဖြင့် Message များ တစ်ခါတည်းသွင်းသည်
-            if broadcast_messages:
-                Message.objects.bulk_create(broadcast_messages)
-
-            # ၄။ Notification ပါ ပြရန်
-            notifications = [
-                Notification(
-                    recipient=user,
-                    sender=bot_user,
-                    notification_type='message',
-                    content=f"Official News: {obj.subject}"
-                ) for user in all_users
-            ]
-            if notifications:
-                Notification.objects.bulk_create(notifications)
\ No newline at end of file
+@admin.register(BotRule)
+class BotRuleAdmin(admin.ModelAdmin):
+    """ Save/Delete လုပ်တာနဲ့ ThuTalkBot က rule အသစ်နဲ့ ပြန် compile ပါတယ် (bots.py) """
+    list_display = ['keyword', 'priority', 'is_active', 'updated_at']
+    list_filter = ['is_active']
+    search_fields = ['keyword', 'responses']
\ No newline at end of file
@@ -0,0 +1,158 @@
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.core.files.storage import default_storage
+from django.db import DatabaseError, connection
+
+from .images import variant_name
+
+# --- USERNAME / TALK ID AUTOCOMPLETE ---
+# Active user တွေရဲ့ username နဲ့ Talk ID (lowercase) ကို process memory ထဲမှာ sorted list အဖြစ် ထားပြီး
+# bisect နဲ့ prefix range ကို ရှာပါတယ် (database မမေးပါ)။ wsgi.py / asgi.py က startup မှာ ဆောက်ပြီး
+# Profile post_save / post_delete signal (models.py) က incremental update လုပ်ပါတယ်။
+# တခြား process က ပြောင်းတာကို မသိနိုင်လို့ AUTOCOMPLETE_MAX_AGE ကျော်ရင် background thread တစ်ခုက အသစ်ပြန်ဆောက်ပြီး
+# ဆောက်နေတုန်း index အဟောင်းကို ဆက်သုံးပါတယ်။ ဆောက်နေတုန်း ဝင်လာတဲ့ update တွေကို index အသစ်ပေါ်မှာ ပြန်ထည့်ပါတယ်။
+
+AUTOCOMPLETE_LIMIT = 8
+AUTOCOMPLETE_MAX_AGE = 60 * 10
+
+_lock = threading.Lock()          # _entries / _users / _pending
+_build_lock = threading.Lock()    # တစ်ကြိမ်မှာ build တစ်ခုပဲ
+_entries = []    # [(key, user_id), ...] sorted
+_users = {}      # user_id -> (username, talk_id, avatar file name)
+_built_at = None
+_pending = None  # build နေတုန်း ဝင်လာတဲ့ update_user() args များ (build မလုပ်နေရင် None)
+
+
+def _keys(user_id, username, talk_id):
+    keys = {(username.lower(), user_id)}
+    if talk_id:
+        keys.add((talk_id.lower(), user_id))
+    return keys
+
+
+def _build():
+    # models.py က ဒီ module ကို import လုပ်လို့ ဒီမှာ import လုပ်ရသည်
+    from .models import Profile
+
+    entries, users = [], {}
+    rows = Profile.objects.filter(user__is_active=True).values_list(
+        'user_id', 'user__username', 'talk_id', 'profile_pic', 'profile_pic_variants'
+    )
+    for user_id, username, talk_id, profile_pic, variants in rows.iterator(chunk_size=2000):
+        users[user_id] = (username, talk_id or '', variant_name(profile_pic, variants, 'avatar') or '')
+        entries.extend(_keys(user_id, username, talk_id))
+    entries.sort()
+    return entries, users
+
+
+def _rebuild():
+    """ _build_lock ကို ယူထားပြီးမှ ခေါ်ပါ """
+    global _entries, _users, _built_at, _pending
+    with _lock:
+        _pending = []
+    try:
+        entries, users = _build()
+    except Exception:
+        with _lock:
+            _pending = None
+        raise
+    with _lock:
+        _entries, _users, _built_at = entries, users, time.monotonic()
+        for args in _pending:
+            _apply(*args)
+        _pending = None
+
+
+def _rebuild_in_background():
+    try:
+        _rebuild()
+    except DatabaseError:
+        pass
+    finally:
+        # Thread အတွက် ဖွင့်ထားတဲ့ database connection
+        connection.close()
+        _build_lock.release()
+
+
+def ensure_index():
+    if _built_at is not None and time.monotonic() - _built_at < AUTOCOMPLETE_MAX_AGE:
+        return
+    if _built_at is None:
+        # ပထမဆုံးအကြိမ် - ပြစရာ index မရှိသေးလို့ ဆောက်ပြီးတာကို စောင့်သည် (တခြား thread ဆောက်နေရင်လည်း)
+        with _build_lock:
+            if _built_at is None:
+                _rebuild()
+        return
+    # Index အဟောင်းကို ဆက်သုံးပြီး thread တစ်ခုတည်းက ဆောက်သည်
+    if _build_lock.acquire(blocking=False):
+        threading.Thread(target=_rebuild_in_background, daemon=True).start()
+
+
+def warm_autocomplete():
+    """ Server startup မှာ ခေါ်သည် - Database မရှိသေးရင် (migrate မလုပ်ရသေး) ပထမ request မှ ဆောက်ပါမယ် """
+    try:
+        ensure_index()
+    except DatabaseError:
+        pass
+
+
+def _apply(user_id, username, talk_id, profile_pic, active):
+    """ _lock ကို ယူထားပြီးမှ ခေါ်ပါ """
+    old = _users.pop(user_id, None)
+    if old:
+        for key in _keys(user_id, old[0], old[1]):
+            index = bisect_left(_entries, key)
+            if index < len(_entries) and _entries[index] == key:
+                del _entries[index]
+    if active:
+        _users[user_id] = (username, talk_id or '', profile_pic or '')
+        for key in _keys(user_id, username, talk_id):
+            insort(_entries, key)
+
+
+def update_user(user_id, username=None, talk_id=None, profile_pic=None, active=True):
+    """ User တစ်ယောက်ရဲ့ key များကို အစားထိုးသည် (active=False ဆိုရင် ဖယ်ရုံပဲ) """
+    args = (user_id, username, talk_id, profile_pic, active)
+    with _lock:
+        if _pending is not None:
+            # ဆောက်နေတဲ့ index အသစ်ပေါ်မှာ ပြန်ထည့်ဖို့
+            _pending.append(args)
+        if _built_at is not None:
+            _apply(*args)
+
+
+def remove_user(user_id):
+    update_user(user_id, active=False)
+
+
+def _pic_url(name):
+    return default_storage.url(name) if name else '/static/default_profile.png'
+
+
+def autocomplete(prefix, viewer_id, limit=AUTOCOMPLETE_LIMIT):
+    """ Username / Talk ID က prefix နဲ့ စတဲ့ User များ (ကိုယ်တိုင်နဲ့ Block ဆက်ဆံရေး ရှိသူများ မပါ) """
+    from .relationships import hidden_user_ids
+
+    prefix = prefix.strip().lower()
+    if not prefix:
+        return []
+    ensure_index()
+    hidden = hidden_user_ids(viewer_id)
+
+    found = []
+    with _lock:
+        index = bisect_left(_entries, (prefix,))
+        while index < len(_entries) and len(found) < limit:
+            key, user_id = _entries[index]
+            if not key.startswith(prefix):
+                break
+            if user_id != viewer_id and user_id not in hidden and user_id not in (f[0] for f in found):
+                found.append((user_id,) + _users[user_id])
+            index += 1
+
+    return [
+        {'id': user_id, 'username': username, 'talk_id': talk_id, 'profile_pic': _pic_url(pic)}
+        for user_id, username, talk_id, pic in found
+    ]
@@ -0,0 +1,86 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum
+
+# --- BADGE COUNTERS ---
+# Bell icon (Notification + Friend request) နဲ့ Chat icon ရဲ့ အရေအတွက်ကို cache ထဲမှာ counter အဖြစ် ထားပါတယ်။
+# Write path တွေက adjust_badge() နဲ့ +1/-1 လုပ်ပြီး အရေအတွက် မသိနိုင်တဲ့နေရာ (mark all read, bulk create) က
+# reset_badges() နဲ့ ဖျက်လိုက်ရင် နောက်တစ်ကြိမ် ဖတ်တဲ့အခါ database ကနေ ပြန်တွက်ပါတယ်။
+# Counter မရှိသေးရင် adjust က ဘာမှမလုပ်ပါ (ပြန်တွက်တဲ့အခါ ပါပြီးသားမို့)။ BADGE_TIMEOUT က မှားနေတာကို ကန့်သတ်ထားပါတယ်။
+# adjust / reset က transaction commit ပြီးမှ လုပ်ပါတယ်။ Key ထဲမှာ generation ပါပြီး reset (သို့) counter မရှိတုန်း adjust ဖြစ်ရင်
+# generation အသစ်ပေးလို့ commit မဖြစ်ခင် database ကနေ တွက်နေတဲ့ request က တန်ဖိုးဟောင်းကို သိမ်းမိရင်လည်း ဘယ်သူမှ ပြန်မဖတ်ပါ။
+
+BADGE_TIMEOUT = 60 * 10
+NOTIFICATIONS = 'notifications'
+FRIEND_REQUESTS = 'friend_requests'
+CHATS = 'chats'
+BADGE_KINDS = (NOTIFICATIONS, FRIEND_REQUESTS, CHATS)
+
+
+def _generation_key(user_id):
+    return f'badges:gen:{user_id}'
+
+
+def _generation(user_id):
+    key = _generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def _badge_key(kind, user_id, generation):
+    return f'badges:{kind}:{user_id}:{generation}'
+
+
+def _count(kind, user_id):
+    # models.py က ဒီ module ကို import လုပ်လို့ ဒီမှာ import လုပ်ရသည်
+    from .models import Notification, FriendRequest, Conversation
+
+    if kind == NOTIFICATIONS:
+        return Notification.objects.filter(
+            recipient_id=user_id, is_seen=False
+        ).exclude(notification_type='Message').count()
+    if kind == FRIEND_REQUESTS:
+        return FriendRequest.objects.filter(to_user_id=user_id).count()
+    return Conversation.objects.filter(owner_id=user_id).aggregate(n=Sum('unread_count'))['n'] or 0
+
+
+def badge_counts(user_id):
+    """ {'notifications': Bell icon, 'chats': Chat icon} - cache hit ဆိုရင် query မရှိပါ """
+    generation = _generation(user_id)
+    keys = {kind: _badge_key(kind, user_id, generation) for kind in BADGE_KINDS}
+    cached = cache.get_many(keys.values())
+    fresh = {key: _count(kind, user_id) for kind, key in keys.items() if key not in cached}
+    if fresh:
+        cache.set_many(fresh, BADGE_TIMEOUT)
+    counts = {kind: max(0, cached.get(key, fresh.get(key, 0))) for kind, key in keys.items()}
+    return {
+        'notifications': counts[NOTIFICATIONS] + counts[FRIEND_REQUESTS],
+        'chats': counts[CHATS],
+    }
+
+
+def _bump(user_ids):
+    now = time.time_ns()
+    cache.set_many({_generation_key(uid): now for uid in user_ids}, None)
+
+
+def adjust_badge(user_id, kind, delta):
+    """ Write path (models.py signal) က ခေါ်သည် - commit ပြီးမှ counter ကို +/- လုပ်သည် """
+    def apply():
+        try:
+            cache.incr(_badge_key(kind, user_id, _generation(user_id)), delta)
+        except ValueError:
+            # Counter မရှိ (တွက်နေဆဲ ဖြစ်နိုင်) - ပြန်တွက်ခိုင်းသည်
+            _bump([user_id])
+    transaction.on_commit(apply)
+
+
+def reset_badges(user_ids):
+    """ အရေအတွက် မသိနိုင်တဲ့ ပြောင်းလဲမှု (mark all read, bulk create) ပြီးရင် ခေါ်ပါ - commit ပြီးမှ အားလုံးကို ပြန်တွက်ခိုင်းသည် """
+    user_ids = list(user_ids)
+    transaction.on_commit(lambda: _bump(user_ids))
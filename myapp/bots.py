@@ -0,0 +1,217 @@
+import json
+import os
+import random
+import time
+from collections import deque, namedtuple
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Count, Max
+
+# --- THUTALKBOT ENGINE ---
+# Keyword rule တွေကို bot_rules.json (settings.BOT_RULES_FILE) နဲ့ BotRule table ကနေ ဖတ်ပြီး Aho-Corasick automaton
+# တစ်ခုအဖြစ် တစ်ခါပဲ compile လုပ်ပါတယ်။ Reply တစ်ခုက Message ကို တစ်ခါဖတ်ရုံပဲ (rule အရေအတွက်နဲ့ မဆိုင်ပါ)။
+# BotRule ပြောင်းရင် (models.py signal) ဒီ process က ချက်ချင်း ပြန် compile ပါတယ်။ တခြား process များက
+# RULES_CHECK_INTERVAL တစ်ခါ BotRule ရဲ့ (count, max updated_at) နဲ့ file mtime ကို စစ်ပြီး ပြောင်းရင် ပြန် compile ပါတယ်။
+# Bot ရဲ့ User/Profile id ကိုလည်း process တစ်ခုမှာ တစ်ခါပဲ database ကနေ ယူပါတယ်။
+
+BOT_USERNAME = 'ThuTalkBot'
+BOT_TALK_ID = 'thutalk-01'
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(__file__), 'bot_rules.json')
+RULES_CHECK_INTERVAL = 5
+
+BotIdentity = namedtuple('BotIdentity', ['user_id', 'profile_id'])
+
+_identity = None
+_engine = None
+_engine_stamp = None
+_checked_at = 0.0
+
+
+# --- Bot identity ---
+
+def setup_bots():
+    """
+    ThuTalkBot (Official Bot) တစ်ကောင်တည်းကိုပဲ Setup လုပ်ပေးပါမယ်။
+    """
+    # models.py က ဒီ module ကို import လုပ်လို့ ဒီမှာ import လုပ်ရသည်
+    from .models import Profile
+
+    bot, created = User.objects.get_or_create(username=BOT_USERNAME)
+    profile, _ = Profile.objects.get_or_create(user=bot)
+
+    # Bot ရဲ့ Talk ID နဲ့ Role ကို သတ်မှတ်ပေးခြင်း (မရှိသေးရင်)
+    if not profile.talk_id or profile.talk_id != BOT_TALK_ID:
+        profile.talk_id = BOT_TALK_ID
+        profile.role = 'Official'
+        profile.bio = "ThuTalk Official Broadcast Bot & Assistant 📢🤖"
+        profile.save()
+    return BotIdentity(bot.id, profile.id)
+
+
+def bot_identity():
+    """ (user_id, profile_id) - ပထမဆုံးအကြိမ်မှာပဲ setup_bots() နဲ့ database ကို ကြည့်သည် """
+    global _identity
+    if _identity is None:
+        _identity = setup_bots()
+    return _identity
+
+
+def forget_bot_identity():
+    """ Bot User ကို ဖျက်/ပြန်ဆောက်ရင် ခေါ်ပါ """
+    global _identity
+    _identity = None
+
+
+def bot_auto_reply(user):
+    """ User အသစ် Register လုပ်လျှင် ThuTalkBot မှ နှုတ်ဆက်စာပို့ရန် """
+    from .models import Message
+
+    bot_id = bot_identity().user_id
+    welcome_msg = f"Hello {user.username}! ✨ ThuTalk ကနေ နွေးထွေးစွာ ကြိုဆိုပါတယ်။ ကျွန်တော်ကတော့ သင်တစ်ယောက်တည်း မဟုတ်အောင် အမြဲရှိနေပေးမယ့် အဖော်မွန်ပါ။ စကားတွေ အများကြီး ပြောကြရအောင်နော်!"
+    if not Message.objects.filter(sender_id=bot_id, receiver=user).exists():
+        Message.objects.create(sender_id=bot_id, receiver=user, content=welcome_msg)
+
+
+# --- Keyword matcher ---
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton. first_match() က text ထဲမှာ ပါတဲ့ keyword တွေထဲက index အငယ်ဆုံး (priority အမြင့်ဆုံး)
+    ကို ပြန်ပေးသည်။ keyword တစ်ခု တစ်ခုချင်းစီကို `in` နဲ့ ရှာတာနဲ့ ရလဒ်တူပါတယ်။
+    """
+
+    def __init__(self, keywords):
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [None]
+        for index, word in enumerate(keywords):
+            if not word:
+                continue
+            node = 0
+            for ch in word:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                    self._goto[node][ch] = nxt
+                node = nxt
+            if self._best[node] is None:
+                self._best[node] = index
+
+        # Breadth-first: fail link တွေ ဆောက်ပြီး suffix မှာ ဆုံးတဲ့ keyword ရဲ့ index ကိုပါ ပေါင်းထည့်သည်
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = fail
+                inherited = self._best[fail]
+                if inherited is not None and (self._best[nxt] is None or inherited < self._best[nxt]):
+                    self._best[nxt] = inherited
+
+    def first_match(self, text):
+        goto, fail, best = self._goto, self._fail, self._best
+        node, found = 0, None
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = best[node]
+            if hit is not None and (found is None or hit < found):
+                found = hit
+                if found == 0:
+                    break
+        return found
+
+
+class BotEngine:
+    def __init__(self, rules, default_reply):
+        """ rules: [(keyword, [reply, ...]), ...] - ရှေ့က rule က priority ပိုမြင့်သည် """
+        self.rules = rules
+        self.default_reply = default_reply
+        self.matcher = KeywordMatcher([keyword for keyword, _ in rules])
+
+    def reply(self, content):
+        index = self.matcher.first_match((content or '').lower())
+        if index is None:
+            return self.default_reply
+        return random.choice(self.rules[index][1])
+
+
+# --- Rule loading & hot reload ---
+
+def _rules_file():
+    return getattr(settings, 'BOT_RULES_FILE', DEFAULT_RULES_FILE)
+
+
+def load_rules():
+    """
+    File ထဲက rule များ + BotRule table ထဲက active rule များ။ Keyword တူရင် database က အစားထိုးသည်။
+    Returns (rules, default_reply) - priority (ငယ်ရင် ရှေ့) အလိုက် စီထားသည်
+    """
+    from .models import BotRule
+
+    try:
+        with open(_rules_file(), encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+
+    merged = {}
+    for rule in data.get('rules', []):
+        merged[rule['keyword'].lower()] = (rule.get('priority', 0), rule['responses'])
+    for rule in BotRule.objects.filter(is_active=True).order_by('id'):
+        responses = [line.strip() for line in rule.responses.splitlines() if line.strip()]
+        if responses:
+            merged.pop(rule.keyword.lower(), None)
+            merged[rule.keyword.lower()] = (rule.priority, responses)
+
+    # sorted() က stable ဖြစ်လို့ priority တူရင် file ထဲက အစဉ်အတိုင်း (database rule များက နောက်မှာ) ဖြစ်သည်
+    ordered = sorted(merged.items(), key=lambda item: item[1][0])
+    rules = [(keyword, responses) for keyword, (_, responses) in ordered if responses]
+    default_reply = data.get('default', "နားထောင်ပေးနေပါတယ်ဗျာ။ စိတ်ထဲရှိတာတွေ အကုန်ပြောပြလို့ရတယ်။ ✨")
+    return rules, default_reply
+
+
+def _rules_stamp():
+    from .models import BotRule
+
+    path = _rules_file()
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+    # Cache မဟုတ်ဘဲ database ကနေ ဖတ်လို့ process တိုင်း (worker / cron) က အတူတူ မြင်ပါတယ် - ဖျက်တာကို count က ဖမ်းသည်
+    version = BotRule.objects.aggregate(count=Count('id'), updated=Max('updated_at'))
+    return version['count'], version['updated'], path, mtime
+
+
+def bot_engine():
+    """ Compile ပြီးသား engine - RULES_CHECK_INTERVAL တစ်ခါမှာ BotRule version query တစ်ခုနဲ့ file mtime ကိုပဲ စစ်သည် """
+    global _engine, _engine_stamp, _checked_at
+    now = time.monotonic()
+    if _engine is None or now - _checked_at >= RULES_CHECK_INTERVAL:
+        _checked_at = now
+        stamp = _rules_stamp()
+        if _engine is None or stamp != _engine_stamp:
+            _engine = BotEngine(*load_rules())
+            _engine_stamp = stamp
+    return _engine
+
+
+def reload_bot_rules():
+    """ BotRule ပြောင်းတိုင်း ခေါ်ပါ - ဒီ process က ချက်ချင်း၊ တခြား process များက RULES_CHECK_INTERVAL အတွင်း """
+    global _engine
+    _engine = None
+
+
+def get_bot_response(user_content):
+    """ Keyword based logic for ThuTalkBot """
+    return bot_engine().reply(user_content)
@@ -0,0 +1,89 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+
+# --- FAN-OUT-ON-READ BROADCASTS ---
+# Broadcast ကို AdminBroadcast row တစ်ခုတည်းအဖြစ်ပဲ သိမ်းပါတယ် - ပို့တဲ့အချိန်မှာ User အလိုက် ဘာမှ မရေးပါ။
+# User တစ်ယောက် Inbox / Chat / Badge ကို ဖတ်တဲ့အခါ deliver_broadcasts() က Profile.last_broadcast_id နောက်က
+# broadcast တွေကို ThuTalkBot ရဲ့ Message အဖြစ် အဲ့ဒီ user အတွက်ပဲ ထည့်ပေးပါတယ်။
+# Site ကို ပြန်မလာတဲ့ user တွေအတွက် row မရေးလို့ ပို့တဲ့ cost က user အရေအတွက်နဲ့ မဆိုင်ပါ။
+
+SEEN_TIMEOUT = 60 * 60 * 24
+# Cache က process အလိုက် (LocMem) ဖြစ်ရင်လည်း broadcast အသစ်ကို ဒီအချိန်အတွင်း မြင်ရအောင်
+LATEST_TIMEOUT = 60
+_LATEST_KEY = 'broadcasts:latest'
+
+
+def _seen_key(user_id):
+    return f'broadcasts:seen:{user_id}'
+
+
+def latest_broadcast_id():
+    latest = cache.get(_LATEST_KEY)
+    if latest is None:
+        # models.py က ဒီ module ကို import လုပ်လို့ ဒီမှာ import လုပ်ရသည်
+        from .models import AdminBroadcast
+        latest = AdminBroadcast.objects.aggregate(n=Max('id'))['n'] or 0
+        cache.set(_LATEST_KEY, latest, LATEST_TIMEOUT)
+    return latest
+
+
+def forget_latest_broadcast():
+    """ Broadcast အသစ် save ပြီးတိုင်း ခေါ်ပါ - commit မဖြစ်ခင် id ဟောင်းကို ပြန်မသိမ်းမိအောင် commit ပြီးမှ ဖျက်သည် """
+    transaction.on_commit(lambda: cache.delete(_LATEST_KEY))
+
+
+def broadcast_content(broadcast):
+    if broadcast.subject:
+        return f"📢 {broadcast.subject}\n\n{broadcast.message}"
+    return broadcast.message
+
+
+def deliver_broadcasts(user):
+    """
+    မရောက်သေးတဲ့ broadcast များကို user ရဲ့ ThuTalkBot chat ထဲ ထည့်ပြီး အရေအတွက် ပြန်ပေးသည်။
+    အသစ်မရှိရင် cache နှစ်ခု ဖတ်ရုံပါပဲ။
+    """
+    if not user.is_authenticated:
+        return 0
+    latest = latest_broadcast_id()
+    if not latest:
+        return 0
+
+    from .models import AdminBroadcast, Conversation, Message, Profile
+    from .message_search import index_messages
+    from .events import touch
+    from .bots import bot_identity
+
+    seen = cache.get(_seen_key(user.id))
+    if seen is None:
+        seen = Profile.objects.filter(user_id=user.id).values_list('last_broadcast_id', flat=True).first()
+        if seen is None:
+            return 0
+        cache.set(_seen_key(user.id), seen, SEEN_TIMEOUT)
+    if seen >= latest:
+        return 0
+
+    bot_id = bot_identity().user_id
+
+    # Request နှစ်ခု ပြိုင်လာရင် တစ်ခုတည်းကပဲ ထည့်နိုင်အောင် marker ကို အရင် claim လုပ်သည်။
+    # Claim နဲ့ Message ထည့်တာကို transaction တစ်ခုထဲမှာ လုပ်လို့ တစ်ခုခု မအောင်မြင်ရင် marker ပါ ပြန်ရောက်ပြီး နောက် request မှာ ပြန်ပို့ပါမယ်
+    with transaction.atomic():
+        claimed = Profile.objects.filter(user_id=user.id, last_broadcast_id=seen).update(last_broadcast_id=latest)
+        transaction.on_commit(lambda: cache.delete(_seen_key(user.id)))
+        if not claimed or bot_id == user.id:
+            return 0
+
+        pending = AdminBroadcast.objects.filter(
+            id__gt=seen, id__lte=latest, created_at__gte=user.date_joined
+        ).order_by('id')
+        delivered = Message.objects.bulk_create([
+            Message(sender_id=bot_id, receiver_id=user.id, content=broadcast_content(b)) for b in pending
+        ])
+        # bulk_create က post_save signal မပို့လို့ Inbox, Search index ကို ကိုယ်တိုင် update လုပ်ရသည်
+        for message in delivered:
+            Conversation.record_message(message)
+        index_messages(delivered)
+        if delivered:
+            touch(user.id)
+    return len(delivered)
@@ -0,0 +1,64 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+# --- PER-USER CHANGE STAMP ---
+# User တစ်ယောက်နဲ့ဆိုင်တဲ့ အရာတစ်ခုခု (Message, Read receipt, Notification, Friend request) ပြောင်းတိုင်း
+# touch() နဲ့ stamp အသစ်ပေးထားပါတယ်။ Event stream က ဒီ stamp ပြောင်းမှသာ database ကို မေးပါတယ်။
+# Process အများကြီးနဲ့ run ရင် CACHES က shared backend (Redis/Memcached/DB) ဖြစ်ရပါမယ်။
+# touch() က commit ပြီးမှ stamp ပေးလို့ stamp အသစ်နဲ့ ဖတ်တဲ့ request က data အသစ်ကိုပဲ မြင်ပါတယ်။
+# Stamp မရှိရင် (timeout / cull) 0 မပြန်ဘဲ အသစ်တစ်ခု ထည့်ပေးလို့ ETag ဟောင်းနဲ့ ပြန်မတူနိုင်ပါ။
+
+STAMP_TIMEOUT = 60 * 60 * 24
+
+
+def _stamp_key(user_id):
+    return f'events:stamp:{user_id}'
+
+
+def touch(*user_ids):
+    def apply():
+        stamp = time.time_ns()
+        cache.set_many({_stamp_key(uid): stamp for uid in user_ids if uid}, STAMP_TIMEOUT)
+    transaction.on_commit(apply)
+
+
+def stamp(user_id):
+    key = _stamp_key(user_id)
+    current = cache.get(key)
+    if current is None:
+        cache.add(key, time.time_ns(), STAMP_TIMEOUT)
+        current = cache.get(key)
+    return current
+
+
+async def astamp(user_id):
+    key = _stamp_key(user_id)
+    current = await cache.aget(key)
+    if current is None:
+        await cache.aadd(key, time.time_ns(), STAMP_TIMEOUT)
+        current = await cache.aget(key)
+    return current
+
+
+# --- PRESENCE STAMP ---
+# Profile.last_seen ကို cache ထဲမှာပါ ထားလို့ user_status_api က database မမေးဘဲ ETag တွက်နိုင်ပါတယ်။
+
+PRESENCE_WINDOW = 5 * 60  # Profile.is_online နဲ့ တူရမည်
+
+
+def _seen_key(username):
+    return f'events:seen:{username}'
+
+
+def record_last_seen(username, last_seen):
+    cache.set(_seen_key(username), last_seen.timestamp() if last_seen else 0, STAMP_TIMEOUT)
+
+
+def presence(username):
+    """ 'online' / 'offline' - cache ထဲမှာ မရှိရင် None """
+    seen = cache.get(_seen_key(username))
+    if seen is None:
+        return None
+    return 'online' if time.time() < seen + PRESENCE_WINDOW else 'offline'
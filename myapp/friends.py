@@ -0,0 +1,117 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+# --- FRIEND ADJACENCY CACHE ---
+# Friendship table (row တစ်ခု = Friend တစ်စုံ) ကနေ User တစ်ယောက်ချင်းစီရဲ့ Friend id set ကို cache ထဲမှာ ထားပါတယ်။
+# are_friends() / friend_ids() က cache hit ဆိုရင် query မရှိပါ။
+# Key ထဲမှာ generation ပါပြီး Friendship ပြောင်းတိုင်း (models.py signal) commit ပြီးမှ generation အသစ်ပေးပါတယ်။
+# Accept / Unfriend ပြိုင်လာလို့ commit မဖြစ်ခင် ဖတ်ထားတဲ့ set ဟောင်းကို သိမ်းမိရင်လည်း generation ဟောင်း key မှာပဲ
+# ရောက်လို့ ဘယ်သူမှ ပြန်မဖတ်ပါ။
+# Generation key ကို process တိုင်းက မြင်ရမှ Unfriend လုပ်တာ အားလုံးမှာ ချက်ချင်း သက်ရောက်လို့ production မှာ CACHES က
+# Redis (settings.py) ဖြစ်ရပါမယ်။ LocMemCache ဆိုရင် တခြား process များက FRIENDS_TIMEOUT အတွင်း ပြန်ဖတ်ပါတယ်။
+# Key ပျောက်သွားရင် (timeout / cull) generation အသစ်နဲ့ database ကနေ ပြန်ဖတ်ပါတယ်။
+
+FRIENDS_TIMEOUT = 60 * 10
+FRIENDS_PAGE_SIZE = 30
+
+
+def _generation_key(user_id):
+    return f'friends:gen:{user_id}'
+
+
+def _generation(user_id):
+    key = _generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def friend_ids(user_id):
+    """ Friend ဖြစ်တဲ့ User id များ (frozenset) """
+    key = f'friends:{user_id}:{_generation(user_id)}'
+    ids = cache.get(key)
+    if ids is None:
+        # models.py က ဒီ module ကို import လုပ်လို့ ဒီမှာ import လုပ်ရသည်
+        from .models import Friendship
+
+        rows = Friendship.objects.filter(Q(user_low_id=user_id) | Q(user_high_id=user_id)).values_list(
+            'user_low_id', 'user_high_id'
+        )
+        ids = frozenset(high if low == user_id else low for low, high in rows)
+        cache.set(key, ids, FRIENDS_TIMEOUT)
+    return ids
+
+
+def are_friends(user_id, other_id):
+    return other_id in friend_ids(user_id)
+
+
+def friend_count(user_id):
+    return len(friend_ids(user_id))
+
+
+def friends_queryset(user_id):
+    """ Friend များကို User queryset အဖြစ် (စာရင်းပြဖို့ - id list အရှည်ကြီး မပို့ဘဲ subquery နဲ့) """
+    from django.contrib.auth.models import User
+    from .models import Friendship
+
+    return User.objects.filter(
+        Q(id__in=Friendship.objects.filter(user_low_id=user_id).values('user_high_id')) |
+        Q(id__in=Friendship.objects.filter(user_high_id=user_id).values('user_low_id'))
+    )
+
+
+def friends_page(user_id, after_id=0, page_size=FRIENDS_PAGE_SIZE):
+    """
+    after_id ထက်ကြီးတဲ့ Friend id များ (id အစဉ်) - Returns (ids, has_more)။
+    Friendship ရဲ့ index နှစ်ခု (user_low, user_high) / (user_high, user_low) ပေါ်မှာ range scan နှစ်ခုပဲ ဖြစ်လို့
+    Friend ဘယ်လောက်များများ page တစ်ခုရဲ့ cost က အတူတူပါ။
+    """
+    from .models import Friendship
+
+    higher = Friendship.objects.filter(user_low_id=user_id, user_high_id__gt=after_id).order_by(
+        'user_high_id'
+    ).values_list('user_high_id', flat=True)[:page_size + 1]
+    lower = Friendship.objects.filter(user_high_id=user_id, user_low_id__gt=after_id).order_by(
+        'user_low_id'
+    ).values_list('user_low_id', flat=True)[:page_size + 1]
+    ids = sorted([*higher, *lower])
+    return ids[:page_size], len(ids) > page_size
+
+
+def mutual_friend_counts(viewer_id, user_ids):
+    """
+    user_ids တစ်ယောက်ချင်းစီနဲ့ viewer ရဲ့ Mutual friend အရေအတွက် {user_id: count}။
+    Page တစ်ခုလုံးကို query တစ်ခုတည်း (UNION ALL) - user_ids ရဲ့ Friendship row တွေထဲက တစ်ဖက်က
+    viewer ရဲ့ Friend ဖြစ်တာကို GROUP BY နဲ့ ရေတွက်သည်။
+    """
+    from django.db.models import Count
+    from .models import Friendship
+
+    counts = dict.fromkeys(user_ids, 0)
+    if not counts:
+        return counts
+    viewer_higher = Friendship.objects.filter(user_low_id=viewer_id).values('user_high_id')
+    viewer_lower = Friendship.objects.filter(user_high_id=viewer_id).values('user_low_id')
+    as_low = Friendship.objects.filter(
+        Q(user_high_id__in=viewer_higher) | Q(user_high_id__in=viewer_lower), user_low_id__in=list(counts)
+    ).order_by().values('user_low_id').annotate(mutual=Count('id')).values_list('user_low_id', 'mutual')
+    as_high = Friendship.objects.filter(
+        Q(user_low_id__in=viewer_higher) | Q(user_low_id__in=viewer_lower), user_high_id__in=list(counts)
+    ).order_by().values('user_high_id').annotate(mutual=Count('id')).values_list('user_high_id', 'mutual')
+    for user_id, mutual in as_low.union(as_high, all=True):
+        counts[user_id] += mutual
+    return counts
+
+
+def forget_friends(*user_ids):
+    """ Friendship ပြောင်းပြီးတိုင်း ခေါ်ပါ - transaction commit ပြီးမှ cache generation ကို ပြောင်းသည် """
+    def bump():
+        now = time.time_ns()
+        cache.set_many({_generation_key(uid): now for uid in user_ids}, None)
+    transaction.on_commit(bump)
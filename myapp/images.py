@@ -0,0 +1,172 @@
+import os
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.db import models
+from django.db.models.fields.files import ImageFieldFile
+
+from .jobs import enqueue, enqueue_later
+
+# --- IMAGE VARIANTS ---
+# Upload ထားတဲ့ ပုံ (Post / Story / Message image, Profile pic) ကို မူရင်းအတိုင်း မပြဘဲ
+# run_jobs worker က OpenCV နဲ့ avatar / feed / full size WebP တွေ ထုတ်ပေးပါတယ် (request ထဲမှာ မလုပ်ပါ)။
+# ထုတ်ပြီးတဲ့ file name တွေကို `<field>_variants` JSON field ထဲ {'source': မူရင်း name, 'avatar': ..., ...} အဖြစ် သိမ်းပါတယ်။
+# Template / serializer က `post.image.feed_url`, `profile.profile_pic.avatar_url` လို သုံးပါ -
+# Variant မထုတ်ရသေးရင် (သို့) ပုံပြောင်းသွားလို့ source မတူတော့ရင် မူရင်း URL ကို ပြန်ပေးပါတယ်။
+
+# name: (width, height, crop) - crop ဆိုရင် အလယ်ကနေ ဖြတ်ပြီး အတိအကျ size၊ မဟုတ်ရင် အချိုးမပျက် အတွင်းဝင်အောင် ချုံ့ (မချဲ့ပါ)
+IMAGE_VARIANTS = {
+    'avatar': (256, 256, True),
+    'feed': (1080, 1350, False),
+    'full': (2048, 2048, False),
+}
+WEBP_QUALITY = 80
+VARIANTS_DIR = 'variants'
+# ပုံပြောင်းပြီး variant အသစ် ထုတ်ပြီးရင်လည်း cache ထဲက post card (CARD_TIMEOUT) နဲ့ process တစ်ခုချင်းစီရဲ့
+# autocomplete index (AUTOCOMPLETE_MAX_AGE) က variant ဟောင်း URL ကို ပြနေနိုင်လို့ file ဟောင်းကို ဒီလောက်ကြာမှ ဖျက်သည်
+STALE_VARIANT_GRACE = timedelta(hours=1, minutes=15)
+
+
+class VariantFieldFile(ImageFieldFile):
+
+    def variant_url(self, variant):
+        variants = getattr(self.instance, self.field.variants_field, None) or {}
+        name = variants.get(variant) if variants.get('source') == self.name else None
+        return self.storage.url(name) if name else self.url
+
+    @property
+    def avatar_url(self):
+        return self.variant_url('avatar')
+
+    @property
+    def feed_url(self):
+        return self.variant_url('feed')
+
+    @property
+    def full_url(self):
+        return self.variant_url('full')
+
+
+class VariantImageField(models.ImageField):
+    """ ImageField + `<name>_variants` JSONField (Model မှာ ကိုယ်တိုင် ကြေညာရပါမယ်) """
+    attr_class = VariantFieldFile
+
+    @property
+    def variants_field(self):
+        return f'{self.name}_variants'
+
+
+def variant_name(name, variants, variant):
+    """ File name နဲ့ variants dict ကနေ (values_list နဲ့ ဖတ်ထားတာ) variant ရဲ့ name - မရှိရင် မူရင်း """
+    variants = variants or {}
+    return variants.get(variant, name) if name and variants.get('source') == name else name
+
+
+def _fit(image, width, height):
+    import cv2
+
+    h, w = image.shape[:2]
+    scale = min(width / w, height / h)
+    if scale >= 1:
+        return image
+    return cv2.resize(image, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+
+
+def _crop(image, width, height):
+    import cv2
+
+    h, w = image.shape[:2]
+    scale = max(width / w, height / h)
+    size = (max(width, round(w * scale)), max(height, round(h * scale)))
+    image = cv2.resize(image, size, interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR)
+    top, left = (size[1] - height) // 2, (size[0] - width) // 2
+    return image[top:top + height, left:left + width]
+
+
+def render_variants(data):
+    """ ပုံ bytes ကနေ {variant: WebP bytes} - ပုံ decode မရရင် {} """
+    import cv2
+    import numpy as np
+
+    # Worker thread/process တွေ အများကြီး run နေလို့ OpenCV ရဲ့ internal thread pool ကို မသုံးပါ
+    cv2.setNumThreads(1)
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    # JPEG ရဲ့ EXIF orientation ကို IMREAD_COLOR ကပဲ လှည့်ပေးပြီး PNG / WebP ရဲ့ alpha ကို IMREAD_UNCHANGED ကပဲ ထားပေးသည်
+    flags = cv2.IMREAD_COLOR if data[:2] == b'\xff\xd8' else cv2.IMREAD_UNCHANGED
+    image = cv2.imdecode(buffer, flags) if len(buffer) else None
+    if image is None:
+        return {}
+    if image.dtype == np.uint16:
+        image = (image >> 8).astype(np.uint8)
+    if image.ndim == 2:
+        image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+
+    rendered = {}
+    for variant, (width, height, crop) in IMAGE_VARIANTS.items():
+        resized = _crop(image, width, height) if crop else _fit(image, width, height)
+        ok, encoded = cv2.imencode('.webp', resized, [cv2.IMWRITE_WEBP_QUALITY, WEBP_QUALITY])
+        if ok:
+            rendered[variant] = encoded.tobytes()
+    return rendered
+
+
+def needs_variants(instance, field):
+    name = getattr(instance, field.name).name
+    if not name or name == field.get_default():
+        return False
+    return (getattr(instance, field.variants_field) or {}).get('source') != name
+
+
+def queue_variants(instance, field):
+    """ post_save (models.py) က ခေါ်သည် - ပုံအသစ်ဆိုရင် commit ပြီးမှ Job ထည့်သည် """
+    if not needs_variants(instance, field):
+        return
+    payload = {
+        'model': instance._meta.label_lower, 'pk': instance.pk,
+        'field': field.name, 'source': getattr(instance, field.name).name,
+    }
+    enqueue('image_variants', **payload)
+
+
+def build_variants(model, pk, field_name, name):
+    """
+    Variant များကို ထုတ်ပြီး `<field>_variants` ကို update လုပ်သည် (image_variants job)။
+    Job run နေတုန်း ပုံပြောင်းသွားရင် (name မတူတော့ရင်) ထုတ်ထားတာကို ပြန်ဖျက်ပြီး False ပြန်ပေးသည်။
+    """
+    field = model._meta.get_field(field_name)
+    instance = model.objects.filter(pk=pk, **{field_name: name}).first()
+    if instance is None or not needs_variants(instance, field):
+        return False
+
+    storage = field.storage
+    with storage.open(name, 'rb') as source:
+        rendered = render_variants(source.read())
+
+    stem = os.path.splitext(name)[0]
+    variants = {'source': name}
+    for variant, content in rendered.items():
+        variants[variant] = storage.save(f'{VARIANTS_DIR}/{stem}_{variant}.webp', ContentFile(content))
+
+    updated = model.objects.filter(pk=pk, **{field_name: name}).update(**{field.variants_field: variants})
+    if not updated:
+        # ဘယ်သူမှ မသုံးရသေးတဲ့ အခုထုတ်ထားတာများကို ချက်ချင်း ဖျက်သည်
+        for variant in IMAGE_VARIANTS:
+            if variants.get(variant):
+                storage.delete(variants[variant])
+        return False
+
+    # ပုံဟောင်းရဲ့ variant များကို cache တွေ ကုန်မှ ဖျက်သည်
+    previous = getattr(instance, field.variants_field) or {}
+    stale = [previous[variant] for variant in IMAGE_VARIANTS if previous.get(variant)]
+    if stale:
+        enqueue_later(
+            'delete_stale_variants', STALE_VARIANT_GRACE,
+            model=model._meta.label_lower, field=field_name, names=stale
+        )
+    return True
+
+
+def delete_variant_files(model, field_name, names):
+    storage = model._meta.get_field(field_name).storage
+    for name in names:
+        storage.delete(name)
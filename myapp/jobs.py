@@ -0,0 +1,135 @@
+import traceback
+from datetime import timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+# --- BACKGROUND JOB QUEUE ---
+# Request ထဲမှာ မလိုအပ်တဲ့ side effect တွေကို Job table (database) ထဲ enqueue() နဲ့ ထည့်ထားပြီး
+# `manage.py run_jobs` worker က thread/process pool နဲ့ run ပါတယ်။ Broker မလိုဘဲ SQLite ပေါ်မှာ အလုပ်လုပ်ပါတယ်။
+# Handler တွေကို tasks.py မှာ @job('name') နဲ့ register လုပ်ပါ။ Handler တစ်ခုကို transaction တစ်ခုထဲမှာ run လို့
+# မအောင်မြင်ရင် ဘာမှ မပြောင်းဘဲ backoff နဲ့ ပြန်ကြိုးစားပါတယ်။
+# enqueue() က transaction commit ပြီးမှ Job ထည့်လို့ rollback ဖြစ်သွားတဲ့ request ရဲ့ Job တွေ မ run ပါ။
+# Worker မရှိတဲ့ deploy (Vercel) မှာ settings.JOBS_RUN_INLINE = True (opt-in) ထားရင် commit ပြီးတာနဲ့ request ထဲမှာပဲ run ပြီး
+# မအောင်မြင်တာကို နောက် enqueue() တွေက INLINE_RETRY_BATCH ခုစီ ပြန်ကြိုးစားပါတယ်။
+
+# Worker ပျက်သွားလို့ running မှာ ကျန်နေတဲ့ Job ကို ဒီအချိန်ကျော်ရင် တခြား worker က ပြန်ယူသည်
+JOB_LEASE = timedelta(minutes=5)
+RETRY_BASE_SECONDS = 5
+RETRY_MAX_SECONDS = 60 * 60
+INLINE_RETRY_BATCH = 1
+
+_HANDLERS = {}
+
+
+def job(name, max_attempts=5):
+    """ tasks.py ထဲက function ကို Job handler အဖြစ် register လုပ်သည် """
+    def decorator(func):
+        _HANDLERS[name] = (func, max_attempts)
+        return func
+    return decorator
+
+
+def _handler(name):
+    if name not in _HANDLERS:
+        import_module('myapp.tasks')
+    return _HANDLERS[name]
+
+
+def enqueue(name, **payload):
+    """ Job တစ်ခု ထည့်သည် (commit ပြီးမှ)။ payload က JSON ဖြစ်ရမည် (Model object မဟုတ်ဘဲ id ပေးပါ) """
+    _enqueue(name, payload)
+
+
+def enqueue_later(name, delay, **payload):
+    """ enqueue() နဲ့ တူပြီး delay (timedelta) ကြာမှ run သည် - JOBS_RUN_INLINE ဖြစ်လည်း request ထဲမှာ မ run ပါ """
+    _enqueue(name, payload, delay)
+
+
+def _enqueue(name, payload, delay=None):
+    _, max_attempts = _handler(name)
+
+    def create():
+        if delay is None and getattr(settings, 'JOBS_RUN_INLINE', False):
+            _run_inline(name, payload, max_attempts)
+        else:
+            from .models import Job
+
+            Job.objects.create(
+                name=name, payload=payload, max_attempts=max_attempts, run_at=timezone.now() + (delay or timedelta())
+            )
+    transaction.on_commit(create)
+
+
+def _run_inline(name, payload, max_attempts):
+    from .models import Job
+
+    # Claim လုပ်ပြီးသား (running) အဖြစ် ထည့်လို့ worker ရှိနေရင်လည်း lease မကုန်ခင် မယူပါ
+    job = Job.objects.create(
+        name=name, payload=payload, max_attempts=max_attempts,
+        status=Job.RUNNING, locked_at=timezone.now(), attempts=1
+    )
+    _execute(job)
+    for job_id in claim_jobs(INLINE_RETRY_BATCH):
+        retry = Job.objects.filter(id=job_id, status=Job.RUNNING).first()
+        if retry is not None:
+            _execute(retry)
+
+
+def claim_jobs(limit):
+    """
+    Run လို့ရပြီဖြစ်တဲ့ Job id များကို running အဖြစ် claim လုပ်ပြီး ပြန်ပေးသည်။
+    Row တစ်ခုချင်းစီကို ဖတ်ခဲ့တဲ့ status/locked_at နဲ့ conditional UPDATE လုပ်လို့ worker နှစ်ခု တစ်ခုတည်းကို မယူနိုင်ပါ။
+    """
+    from .models import Job
+
+    now = timezone.now()
+    ready = Q(status=Job.PENDING, run_at__lte=now) | Q(status=Job.RUNNING, locked_at__lt=now - JOB_LEASE)
+    candidates = Job.objects.filter(ready).order_by('run_at', 'id').values_list('id', 'status', 'locked_at')[:limit]
+    claimed = []
+    for job_id, status, locked_at in candidates:
+        if Job.objects.filter(id=job_id, status=status, locked_at=locked_at).update(
+            status=Job.RUNNING, locked_at=now, attempts=F('attempts') + 1
+        ):
+            claimed.append(job_id)
+    return claimed
+
+
+def run_job(job_id):
+    """ Claim လုပ်ထားတဲ့ Job တစ်ခုကို run သည်။ True = အောင်မြင် (row ဖျက်ပြီး), False = retry/failed """
+    from .models import Job
+
+    close_old_connections()
+    try:
+        job = Job.objects.filter(id=job_id, status=Job.RUNNING).first()
+        if job is None:
+            return False
+        return _execute(job)
+    finally:
+        # Thread/Process pool ထဲမှာ connection တွေ ကျန်မနေအောင်
+        close_old_connections()
+
+
+def _execute(job):
+    from .models import Job
+
+    try:
+        func, _ = _handler(job.name)
+        with transaction.atomic():
+            func(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            Job.objects.filter(id=job.id).update(status=Job.FAILED, locked_at=None, last_error=error)
+        else:
+            delay = min(RETRY_BASE_SECONDS * 2 ** (job.attempts - 1), RETRY_MAX_SECONDS)
+            Job.objects.filter(id=job.id).update(
+                status=Job.PENDING, locked_at=None, last_error=error,
+                run_at=timezone.now() + timedelta(seconds=delay)
+            )
+        return False
+    Job.objects.filter(id=job.id).delete()
+    return True
@@ -0,0 +1,57 @@
+import time
+from itertools import chain
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from myapp.bots import BOT_USERNAME
+from myapp.models import BlockedUser, FriendRequest, FriendSuggestion, Friendship
+from myapp.suggestions import FriendGraph, SUGGESTION_TOP_K
+
+
+def _pairs(queryset, *fields):
+    """ values_list ကို Python tuple list မဆောက်ဘဲ (n, 2) int64 array အဖြစ် """
+    rows = queryset.values_list(*fields).iterator(chunk_size=10000)
+    return np.fromiter(chain.from_iterable(rows), dtype=np.int64).reshape(-1, 2)
+
+
+class Command(BaseCommand):
+    help = 'Computes "people you may know" (mutual friends) for every active user and stores the top-K'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=SUGGESTION_TOP_K)
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        started, clock = timezone.now(), time.monotonic()
+        user_ids = np.fromiter(
+            User.objects.filter(is_active=True).exclude(username=BOT_USERNAME).values_list('id', flat=True)
+            .iterator(chunk_size=10000), dtype=np.int64
+        )
+        friends = _pairs(Friendship.objects.all(), 'user_low_id', 'user_high_id')
+        excluded = np.concatenate([
+            _pairs(BlockedUser.objects.all(), 'blocker_id', 'blocked_id'),
+            _pairs(FriendRequest.objects.all(), 'from_user_id', 'to_user_id'),
+        ])
+        graph = FriendGraph(user_ids, friends, excluded)
+        self.stdout.write(f'Loaded {len(graph)} users and {len(friends)} friendships in {time.monotonic() - clock:.1f}s.')
+
+        stored = 0
+        for nodes in graph.batches(options['batch_size']):
+            owners, suggested, mutual = graph.suggest(nodes, options['top_k'])
+            rows = [
+                FriendSuggestion(user_id=int(o), suggested_id=int(s), mutual_count=int(m))
+                for o, s, m in zip(owners.tolist(), suggested.tolist(), mutual.tolist())
+            ]
+            with transaction.atomic():
+                FriendSuggestion.objects.filter(user_id__in=graph.user_ids[nodes].tolist()).delete()
+                FriendSuggestion.objects.bulk_create(rows, batch_size=1000)
+            stored += len(rows)
+
+        # ဒီတစ်ကြိမ် မတွက်ရတော့တဲ့ User (ပိတ်ထား/ဖျက်ထား) ရဲ့ ဟောင်းတွေ
+        FriendSuggestion.objects.filter(created_at__lt=started).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully stored {stored} suggestions in {time.monotonic() - clock:.1f}s.'
+        ))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from myapp.images import VariantImageField, needs_variants, queue_variants
+from myapp.models import Profile, Post, Story, Message
+
+
+class Command(BaseCommand):
+    help = 'Queues image_variants jobs for uploaded images that have no avatar / feed / full variants yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = 0
+        for model in (Profile, Post, Story, Message):
+            for field in model._meta.concrete_fields:
+                if not isinstance(field, VariantImageField):
+                    continue
+                queryset = model.objects.exclude(**{f'{field.name}__isnull': True}).exclude(**{field.name: ''})
+                queryset = queryset.only('pk', field.name, field.variants_field).order_by('pk')
+                last_pk = 0
+                while True:
+                    batch = list(queryset.filter(pk__gt=last_pk)[:options['batch_size']])
+                    if not batch:
+                        break
+                    pending = [instance for instance in batch if needs_variants(instance, field)]
+                    # Batch တစ်ခုလုံးရဲ့ Job တွေကို commit တစ်ခါတည်းနဲ့ ထည့်သည်
+                    with transaction.atomic():
+                        for instance in pending:
+                            queue_variants(instance, field)
+                    total += len(pending)
+                    last_pk = batch[-1].pk
+        self.stdout.write(self.style.SUCCESS(f'Successfully queued {total} images.'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from myapp.models import DeletedMessage
+
+
+class Command(BaseCommand):
+    help = 'Deletes DeletedMessage sync tombstones older than DeletedMessage.RETENTION (run daily from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        # RETENTION ထက်ဟောင်းတဲ့ sync cursor တွေကို get_messages က လက်မခံလို့ ဒီ tombstone တွေ မလိုတော့ပါ
+        cutoff = timezone.now() - DeletedMessage.RETENTION
+        total = 0
+        while True:
+            ids = list(DeletedMessage.objects.filter(deleted_at__lt=cutoff).values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            total += DeletedMessage.objects.filter(id__in=ids).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f'Successfully pruned {total} deleted message tombstones.'))
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from myapp.models import Message, Conversation
+
+
+def build_conversations(message_model, conversation_model, preview_for, read_state, batch_size=1000):
+    """
+    Message table ကနေ Conversation row အားလုံးကို အသစ်ပြန်ဆောက်သည်
+    read_state: {(owner_id, partner_id): last_read_id} - ဒီ id ထက်ကြီးတဲ့ ဝင်စာများကို unread အဖြစ် ရေတွက်သည်
+    """
+    latest = {}
+    pairs = message_model.objects.values('sender_id', 'receiver_id').annotate(last_id=Max('id'))
+    for row in pairs:
+        if row['sender_id'] == row['receiver_id']:
+            continue
+        for key in ((row['sender_id'], row['receiver_id']), (row['receiver_id'], row['sender_id'])):
+            latest[key] = max(latest.get(key, 0), row['last_id'])
+
+    unread = {}
+    for sender_id, receiver_id, message_id in message_model.objects.values_list('sender_id', 'receiver_id', 'id').iterator():
+        key = (receiver_id, sender_id)
+        if message_id > read_state.get(key, 0):
+            unread[key] = unread.get(key, 0) + 1
+
+    last_messages = message_model.objects.in_bulk(set(latest.values()))
+    rows = []
+    for (owner_id, partner_id), message_id in latest.items():
+        message = last_messages[message_id]
+        rows.append(conversation_model(
+            owner_id=owner_id, partner_id=partner_id, last_message_id=message_id,
+            last_message_preview=preview_for(message), last_message_at=message.timestamp,
+            last_message_outgoing=message.sender_id == owner_id,
+            unread_count=unread.get((owner_id, partner_id), 0),
+            last_read_id=read_state.get((owner_id, partner_id), 0),
+        ))
+
+    with transaction.atomic():
+        conversation_model.objects.all().delete()
+        conversation_model.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the Conversation inbox table from Message history'
+
+    def handle(self, *args, **options):
+        # Read watermark များကို row အဟောင်းတွေကနေ ယူထားပြီး ပြန်ထည့်သည်
+        read_state = {
+            (owner_id, partner_id): last_read_id
+            for owner_id, partner_id, last_read_id in Conversation.objects.values_list('owner_id', 'partner_id', 'last_read_id')
+        }
+        count = build_conversations(Message, Conversation, Conversation.preview_for, read_state=read_state)
+        self.stdout.write(self.style.SUCCESS(f'Successfully rebuilt {count} conversations.'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from myapp.models import Message
+from myapp.message_search import fts_enabled, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index for chat messages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if not fts_enabled():
+            self.stdout.write(self.style.WARNING('Message search index is only available on SQLite (FTS5).'))
+            return
+        count = rebuild_index(Message, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Successfully indexed {count} messages.'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from myapp.models import Profile
+from myapp.user_search import fts_enabled, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the username / Talk ID / bio search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if not fts_enabled():
+            self.stdout.write(self.style.WARNING('User search index is only available on SQLite (FTS5).'))
+            return
+        count = rebuild_index(Profile, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Successfully indexed {count} users.'))
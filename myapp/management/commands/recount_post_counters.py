@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from myapp.models import Post, Comment
+
+class Command(BaseCommand):
+    help = 'Recomputes Post.like_count and Post.comment_count to repair counter drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        likes = Post.likes.through.objects.filter(post=OuterRef('pk')).values('post').annotate(n=Count('pk')).values('n')
+        comments = Comment.objects.filter(post=OuterRef('pk')).values('post').annotate(n=Count('pk')).values('n')
+
+        # အမှန်တကယ် count နဲ့ မကိုက်တော့တဲ့ Post တွေကိုပဲ ပြင်မည်
+        drifted = Post.objects.annotate(
+            real_likes=Coalesce(Subquery(likes), 0),
+            real_comments=Coalesce(Subquery(comments), 0),
+        ).exclude(
+            like_count=F('real_likes'), comment_count=F('real_comments')
+        ).only('id', 'like_count', 'comment_count')
+
+        batch, fixed = [], 0
+        for post in drifted.iterator(chunk_size=batch_size):
+            post.like_count = post.real_likes
+            post.comment_count = post.real_comments
+            batch.append(post)
+            if len(batch) >= batch_size:
+                Post.objects.bulk_update(batch, ['like_count', 'comment_count'])
+                fixed += len(batch)
+                batch = []
+        if batch:
+            Post.objects.bulk_update(batch, ['like_count', 'comment_count'])
+            fixed += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully repaired counters on {fixed} posts.'))
@@ -0,0 +1,45 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from myapp.jobs import claim_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = 'Runs queued background jobs (notifications, bot replies, account deletion) on a thread or process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--processes', action='store_true', help='Use a process pool instead of threads')
+        parser.add_argument('--batch-size', type=int, default=20)
+        parser.add_argument('--poll-interval', type=float, default=1.0)
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty')
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        if options['processes']:
+            # spawn: child process တိုင်း database connection အသစ်နဲ့ စပါစေ
+            executor = ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context('spawn'), initializer=django.setup
+            )
+        else:
+            executor = ThreadPoolExecutor(workers)
+
+        done = failed = 0
+        with executor:
+            while True:
+                job_ids = claim_jobs(options['batch_size'])
+                if job_ids:
+                    for ok in executor.map(run_job, job_ids):
+                        if ok:
+                            done += 1
+                        else:
+                            failed += 1
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully ran {done} jobs ({failed} failed or rescheduled).'))
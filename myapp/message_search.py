@@ -0,0 +1,124 @@
+import re
+
+from django.db import connection
+
+# --- MESSAGE FULL-TEXT SEARCH (SQLite FTS5) ---
+# Message.content ကို FTS5 table (rowid = Message id) ထဲမှာ index လုပ်ထားပြီး bm25 နဲ့ rank လုပ်ပါတယ်။
+# မြန်မာစာမှာ စကားလုံးကြား space မပါလို့ syllable တစ်ခုချင်းစီကို space ခြားပြီးမှ index လုပ်ပါတယ်။
+# unicode61 ရဲ့ default က Mark (သရ/အသတ်) တွေကို separator လို့ ယူလို့ M* ကို token character ထဲ ထည့်ထားပါတယ်။
+# Message save/delete ကို models.py signal က sync လုပ်ပြီး bulk_create လုပ်တဲ့နေရာတွေက index_messages() ကို ခေါ်ရပါမယ်။
+
+FTS_TABLE = 'myapp_message_fts'
+SEARCH_PAGE_SIZE = 20
+MAX_SEARCH_PAGE = 50
+
+CREATE_FTS_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "body, sender_id UNINDEXED, receiver_id UNINDEXED, "
+    "tokenize=\"unicode61 categories 'L* N* Co M*' remove_diacritics 0\")"
+)
+DROP_FTS_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+
+# Syllable စတဲ့ စာလုံး: ဗျည်း၊ သရ အပြည့်၊ ဂဏန်း (္ နောက်က ဗျည်းဆင့် နဲ့ ် / ္ ပါတဲ့ ဗျည်းကို မခွဲပါ)
+_SYLLABLE_START = re.compile(
+    r'(?<!္)([က-အဣ-ဧဩဪဿ၀-၉])(?![်္])'
+)
+_WORD = re.compile(r'\w')
+
+
+def fts_enabled(conn=None):
+    return (conn or connection).vendor == 'sqlite'
+
+
+def segment(text):
+    """ "မင်္ဂလာပါ" -> "မင်္ဂ လာ ပါ" (Latin စာများကို မပြောင်းပါ) """
+    return _SYLLABLE_START.sub(r' \1', text or '')
+
+
+def build_match_query(query):
+    """
+    User ရိုက်တဲ့ စကားလုံး တစ်လုံးချင်းစီကို prefix phrase အဖြစ် ပြောင်းပြီး AND နဲ့ ဆက်သည်။
+    မြန်မာ syllable များကို phrase ထဲမှာ ဆက်တိုက်ဖြစ်မှ match ဖြစ်ပါတယ်။
+    """
+    phrases = []
+    for word in query.split():
+        if _WORD.search(word):
+            phrases.append('"{}"*'.format(segment(word).replace('"', '""')))
+    return ' AND '.join(phrases)
+
+
+def _rows(messages):
+    return [
+        (m.id, segment(m.content), m.sender_id, m.receiver_id)
+        for m in messages if m.content
+    ]
+
+
+def index_messages(messages, conn=None):
+    """ Message အသစ်/ပြင်ထားတာ များကို index ထဲ ထည့်/အစားထိုး သည် """
+    conn = conn or connection
+    if not fts_enabled(conn):
+        return
+    messages = list(messages)
+    with conn.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(m.id,) for m in messages])
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, body, sender_id, receiver_id) VALUES (%s, %s, %s, %s)",
+            _rows(messages)
+        )
+
+
+def unindex_message(message_id):
+    if fts_enabled():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [message_id])
+
+
+def rebuild_index(message_model, conn=None, batch_size=1000):
+    """ FTS table ကို Message table ကနေ အသစ်ပြန်ဆောက်သည် (migration ကလည်း သုံးသည်) """
+    conn = conn or connection
+    if not fts_enabled(conn):
+        return 0
+    with conn.cursor() as cursor:
+        cursor.execute(DROP_FTS_SQL)
+        cursor.execute(CREATE_FTS_SQL)
+
+    count, last_id = 0, 0
+    queryset = message_model.objects.exclude(content__isnull=True).exclude(content='').only(
+        'id', 'content', 'sender_id', 'receiver_id'
+    ).order_by('id')
+    while True:
+        batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        with conn.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, body, sender_id, receiver_id) VALUES (%s, %s, %s, %s)",
+                _rows(batch)
+            )
+        count += len(batch)
+        last_id = batch[-1].id
+    return count
+
+
+def search_conversation(user_id, other_id, query, page=1, page_size=SEARCH_PAGE_SIZE):
+    """
+    Chat နှစ်ယောက်ကြားက Message id များကို relevance (bm25) အလိုက် page လိုက် ပြန်ပေးသည်။
+    Returns (message_ids, has_more). SQLite မဟုတ်ရင် None ပြန်ပြီး caller က fallback သုံးရပါမယ်။
+    """
+    if not fts_enabled():
+        return None
+    match = build_match_query(query)
+    if not match:
+        return [], False
+
+    page = max(1, min(page, MAX_SEARCH_PAGE))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            "AND ((sender_id = %s AND receiver_id = %s) OR (sender_id = %s AND receiver_id = %s)) "
+            "ORDER BY rank, rowid DESC LIMIT %s OFFSET %s",
+            [match, user_id, other_id, other_id, user_id, page_size + 1, (page - 1) * page_size]
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+    return ids[:page_size], len(ids) > page_size
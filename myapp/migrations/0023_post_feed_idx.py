@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("myapp", "0022_alter_profile_talk_id"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(fields=["-created_at", "-id"], name="post_feed_idx"),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:12
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Post = apps.get_model("myapp", "Post")
+    Comment = apps.get_model("myapp", "Comment")
+    likes = (
+        Post.likes.through.objects.filter(post=OuterRef("pk"))
+        .values("post")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    comments = (
+        Comment.objects.filter(post=OuterRef("pk"))
+        .values("post")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    Post.objects.update(
+        like_count=Coalesce(Subquery(likes), 0),
+        comment_count=Coalesce(Subquery(comments), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("myapp", "0023_post_feed_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="like_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
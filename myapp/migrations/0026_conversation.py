@@ -0,0 +1,112 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+# Migration ရဲ့ အချိန်က schema (Message.is_read ရှိသေး) အတိုင်း frozen copy - rebuild_inbox command ကို မသုံးပါ
+
+
+def preview_for(message):
+    if message.content:
+        return message.content[:100]
+    if message.image:
+        return "📷 Photo"
+    if message.voice_note:
+        return "🎤 Voice message"
+    return ""
+
+
+def backfill_conversations(apps, schema_editor):
+    Message = apps.get_model("myapp", "Message")
+    Conversation = apps.get_model("myapp", "Conversation")
+
+    latest = {}
+    for row in Message.objects.values("sender_id", "receiver_id").annotate(last_id=Max("id")):
+        if row["sender_id"] == row["receiver_id"]:
+            continue
+        for key in ((row["sender_id"], row["receiver_id"]), (row["receiver_id"], row["sender_id"])):
+            latest[key] = max(latest.get(key, 0), row["last_id"])
+
+    unread = {
+        (row["receiver_id"], row["sender_id"]): row["n"]
+        for row in Message.objects.filter(is_read=False).values("receiver_id", "sender_id").annotate(n=Count("id"))
+    }
+
+    last_messages = Message.objects.in_bulk(set(latest.values()))
+    rows = []
+    for (owner_id, partner_id), message_id in latest.items():
+        message = last_messages[message_id]
+        rows.append(Conversation(
+            owner_id=owner_id, partner_id=partner_id, last_message_id=message_id,
+            last_message_preview=preview_for(message), last_message_at=message.timestamp,
+            last_message_outgoing=message.sender_id == owner_id,
+            unread_count=unread.get((owner_id, partner_id), 0),
+        ))
+    Conversation.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("myapp", "0025_message_sync"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Conversation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("last_message_preview", models.CharField(blank=True, max_length=100)),
+                ("last_message_at", models.DateTimeField(blank=True, null=True)),
+                ("last_message_outgoing", models.BooleanField(default=False)),
+                ("unread_count", models.PositiveIntegerField(default=0)),
+                (
+                    "last_message",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="myapp.message",
+                    ),
+                ),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="conversations",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "partner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["owner", "-last_message_at", "-id"], name="inbox_idx"
+                    )
+                ],
+                "unique_together": {("owner", "partner")},
+            },
+        ),
+        migrations.RunPython(backfill_conversations, migrations.RunPython.noop),
+    ]
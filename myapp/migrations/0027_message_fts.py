@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:05
+
+import re
+
+from django.db import migrations
+
+# Migration ရဲ့ အချိန်က message_search.py အတိုင်း frozen copy (live module ကို import မလုပ်ပါ)
+FTS_TABLE = "myapp_message_fts"
+CREATE_FTS_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "body, sender_id UNINDEXED, receiver_id UNINDEXED, "
+    "tokenize=\"unicode61 categories 'L* N* Co M*' remove_diacritics 0\")"
+)
+DROP_FTS_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+SYLLABLE_START = re.compile(r"(?<!္)([က-အဣ-ဧဩဪဿ၀-၉])(?![်္])")
+
+
+def create_message_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(DROP_FTS_SQL)
+    schema_editor.execute(CREATE_FTS_SQL)
+
+    Message = apps.get_model("myapp", "Message")
+    queryset = Message.objects.exclude(content__isnull=True).exclude(content="").only(
+        "id", "content", "sender_id", "receiver_id"
+    ).order_by("id")
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id__gt=last_id)[:1000])
+        if not batch:
+            break
+        with schema_editor.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, body, sender_id, receiver_id) VALUES (%s, %s, %s, %s)",
+                [(m.id, SYLLABLE_START.sub(r" \1", m.content), m.sender_id, m.receiver_id) for m in batch]
+            )
+        last_id = batch[-1].id
+
+
+def drop_message_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(DROP_FTS_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("myapp", "0026_conversation"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_message_index, drop_message_index),
+    ]
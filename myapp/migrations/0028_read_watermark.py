@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:40
+
+from django.db import migrations, models
+from django.db.models import Max, Min, Q
+
+
+def backfill_watermarks(apps, schema_editor):
+    """ Pair တစ်ခုချင်းစီမှာ ပထမဆုံး မဖတ်ရသေးတဲ့ Message ရဲ့ ရှေ့အထိ (မရှိရင် နောက်ဆုံးအထိ) ဖတ်ပြီးလို့ ယူသည် """
+    Message = apps.get_model("myapp", "Message")
+    Conversation = apps.get_model("myapp", "Conversation")
+    pairs = Message.objects.values("receiver_id", "sender_id").annotate(
+        last_id=Max("id"), first_unread=Min("id", filter=Q(is_read=False))
+    )
+    for row in pairs.iterator():
+        watermark = row["first_unread"] - 1 if row["first_unread"] else row["last_id"]
+        Conversation.objects.filter(
+            owner_id=row["receiver_id"], partner_id=row["sender_id"]
+        ).update(last_read_id=watermark)
+
+
+def restore_is_read(apps, schema_editor):
+    Message = apps.get_model("myapp", "Message")
+    Conversation = apps.get_model("myapp", "Conversation")
+    for owner_id, partner_id, last_read_id in Conversation.objects.values_list(
+        "owner_id", "partner_id", "last_read_id"
+    ).iterator():
+        Message.objects.filter(
+            sender_id=partner_id, receiver_id=owner_id, id__lte=last_read_id
+        ).update(is_read=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("myapp", "0027_message_fts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="conversation",
+            name="last_read_id",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_watermarks, restore_is_read),
+        migrations.RemoveField(
+            model_name="message",
+            name="is_read",
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F
+
+COALESCED_TYPES = ("Like", "Comment")
+VERBS = {"Like": "liked your post.", "Comment": "commented on your post."}
+
+
+def describe(notification_type, sender_name, previous_name, actor_count):
+    names = [n for n in (sender_name, previous_name) if n]
+    others = max(actor_count - len(names), 0)
+    if others:
+        who = f"{', '.join(names)} and {others} other{'s' if others > 1 else ''}"
+    else:
+        who = " and ".join(names)
+    return f"{who} {VERBS[notification_type]}"
+
+
+def merge_notification_groups(apps, schema_editor):
+    """ (recipient, type, post) တစ်ခုမှာ row အများကြီးရှိနေရင် နောက်ဆုံး row တစ်ခုထဲ ပေါင်းသည် """
+    Notification = apps.get_model("myapp", "Notification")
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    Notification.objects.update(updated_at=F("created_at"))
+
+    groups = Notification.objects.filter(
+        notification_type__in=COALESCED_TYPES, post__isnull=False
+    ).values("recipient_id", "notification_type", "post_id").annotate(n=Count("id")).filter(n__gt=1)
+    for group in groups.iterator():
+        rows = list(Notification.objects.filter(
+            recipient_id=group["recipient_id"], notification_type=group["notification_type"], post_id=group["post_id"]
+        ).order_by("-created_at", "-id").values("id", "sender_id", "is_seen"))
+
+        senders = list(dict.fromkeys(row["sender_id"] for row in rows))
+        names = dict(User.objects.filter(id__in=senders[:2]).values_list("id", "username"))
+        previous_id = senders[1] if len(senders) > 1 else None
+        Notification.objects.filter(id=rows[0]["id"]).update(
+            previous_sender_id=previous_id,
+            actor_count=len(senders),
+            is_seen=all(row["is_seen"] for row in rows),
+            content=describe(group["notification_type"], names.get(senders[0]), names.get(previous_id), len(senders)),
+        )
+        Notification.objects.filter(id__in=[row["id"] for row in rows[1:]]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("myapp", "0028_read_watermark"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="actor_count",
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="previous_sender",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(merge_notification_groups, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="notification",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("notification_type__in", ["Like", "Comment"])),
+                fields=("recipient", "notification_type", "post"),
+                name="notification_group_uniq",
+            ),
+        ),
+    ]
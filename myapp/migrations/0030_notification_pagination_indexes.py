@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0029_notification_groups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='friendrequest',
+            index=models.Index(fields=['to_user', '-created_at', '-id'], name='friendreq_inbox_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', '-updated_at', '-id'], name='notification_feed_idx'),
+        ),
+    ]
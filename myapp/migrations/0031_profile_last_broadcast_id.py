@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:45
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def mark_existing_broadcasts_delivered(apps, schema_editor):
+    """ ရှိပြီးသား broadcast တွေကို User တွေဆီ Message အဖြစ် ပို့ပြီးသားမို့ ထပ်မပို့အောင် """
+    AdminBroadcast = apps.get_model("myapp", "AdminBroadcast")
+    Profile = apps.get_model("myapp", "Profile")
+    latest = AdminBroadcast.objects.aggregate(n=Max("id"))["n"] or 0
+    Profile.objects.update(last_broadcast_id=latest)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("myapp", "0030_notification_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="last_broadcast_id",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(mark_existing_broadcasts_delivered, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0032_background_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BotRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('keyword', models.CharField(max_length=100, unique=True)),
+                ('responses', models.TextField(help_text='One reply per line; one is picked at random.')),
+                ('priority', models.IntegerField(default=0)),
+                ('is_active', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
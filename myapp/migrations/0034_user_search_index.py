@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:52
+
+from django.db import migrations
+
+# Migration ရဲ့ အချိန်က user_search.py အတိုင်း frozen copy (live module ကို import မလုပ်ပါ)
+FTS_TABLE = "myapp_user_fts"
+CREATE_FTS_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "username, talk_id, bio, tokenize='trigram')"
+)
+DROP_FTS_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+
+
+def create_user_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(DROP_FTS_SQL)
+    schema_editor.execute(CREATE_FTS_SQL)
+
+    Profile = apps.get_model("myapp", "Profile")
+    queryset = Profile.objects.select_related("user").only(
+        "id", "user_id", "user__username", "talk_id", "bio"
+    ).order_by("id")
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id__gt=last_id)[:1000])
+        if not batch:
+            break
+        with schema_editor.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, username, talk_id, bio) VALUES (%s, %s, %s, %s)",
+                [(p.user_id, p.user.username, p.talk_id or "", p.bio or "") for p in batch]
+            )
+        last_id = batch[-1].id
+
+
+def drop_user_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(DROP_FTS_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("myapp", "0033_bot_rules"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_user_index, drop_user_index),
+    ]
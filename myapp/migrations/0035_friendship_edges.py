@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_profile_friends(apps, schema_editor):
+    """ Profile.friends (တစ်ဖက်ကို row တစ်ခု) ကနေ Friendship row တစ်ခုတည်းသို့ - တစ်ဖက်ပဲ ရှိတာကိုလည်း Friend လို့ ယူသည် """
+    Profile = apps.get_model("myapp", "Profile")
+    Friendship = apps.get_model("myapp", "Friendship")
+    pairs = set()
+    for user_id, friend_id in Profile.friends.through.objects.values_list("profile__user_id", "user_id").iterator():
+        if user_id != friend_id:
+            pairs.add((min(user_id, friend_id), max(user_id, friend_id)))
+    Friendship.objects.bulk_create(
+        [Friendship(user_low_id=low, user_high_id=high) for low, high in pairs],
+        batch_size=1000, ignore_conflicts=True
+    )
+
+
+def restore_profile_friends(apps, schema_editor):
+    Profile = apps.get_model("myapp", "Profile")
+    Friendship = apps.get_model("myapp", "Friendship")
+    profile_ids = dict(Profile.objects.values_list("user_id", "id"))
+    Through = Profile.friends.through
+    rows = []
+    for low, high in Friendship.objects.values_list("user_low_id", "user_high_id").iterator():
+        if low in profile_ids:
+            rows.append(Through(profile_id=profile_ids[low], user_id=high))
+        if high in profile_ids:
+            rows.append(Through(profile_id=profile_ids[high], user_id=low))
+    Through.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0034_user_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Friendship',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user_high', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user_low', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user_high', 'user_low'], name='friendship_high_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user_low', 'user_high'), name='friendship_pair_uniq'), models.CheckConstraint(condition=models.Q(('user_low__lt', models.F('user_high'))), name='friendship_pair_order')],
+            },
+        ),
+        migrations.RunPython(copy_profile_friends, restore_profile_friends),
+        migrations.RemoveField(
+            model_name='profile',
+            name='friends',
+        ),
+    ]
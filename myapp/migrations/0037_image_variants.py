@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:53
+
+import myapp.images
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0036_friend_suggestions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='profile_pic_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='story',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='message',
+            name='image',
+            field=myapp.images.VariantImageField(blank=True, null=True, upload_to='chat_images/'),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=myapp.images.VariantImageField(blank=True, null=True, upload_to='posts/'),
+        ),
+        migrations.AlterField(
+            model_name='profile',
+            name='profile_pic',
+            field=myapp.images.VariantImageField(default='default.png', upload_to='profiles/'),
+        ),
+        migrations.AlterField(
+            model_name='story',
+            name='image',
+            field=myapp.images.VariantImageField(blank=True, null=True, upload_to='stories/'),
+        ),
+    ]
@@ -0,0 +1,90 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations
+
+COALESCED_TYPES = ("Like", "Comment")
+VERBS = {"Like": "liked your post.", "Comment": "commented on your post."}
+# Legacy Comment notification နဲ့ Comment row ရဲ့ created_at ကွာနိုင်တဲ့ အချိန် (request တစ်ခုထဲမှာ ဆောက်ခဲ့လို့)
+COMMENT_MATCH_WINDOW = timedelta(minutes=1)
+
+
+def describe(notification_type, sender_name, previous_name, actor_count):
+    names = [n for n in (sender_name, previous_name) if n]
+    others = max(actor_count - len(names), 0)
+    if others:
+        who = f"{', '.join(names)} and {others} other{'s' if others > 1 else ''}"
+    else:
+        who = " and ".join(names)
+    return f"{who} {VERBS[notification_type]}"
+
+
+def legacy_post_id(Post, Comment, row):
+    """ post မပါတဲ့ row ကို ဘယ် Post အတွက်လဲ - သေချာမသိရင် None """
+    if row["notification_type"] == "Comment":
+        created = row["created_at"]
+        candidates = Comment.objects.filter(
+            user_id=row["sender_id"], post__author_id=row["recipient_id"],
+            created_at__range=(created - COMMENT_MATCH_WINDOW, created + COMMENT_MATCH_WINDOW),
+        ).values_list("post_id", "created_at")
+        nearest = min(candidates, key=lambda c: abs(c[1] - created), default=None)
+        return nearest[0] if nearest else None
+    # Like ရဲ့ အချိန်ကို မသိမ်းထားလို့ recipient ရဲ့ Post တစ်ခုတည်းကိုပဲ Like ထားရင် အဲ့ဒီ Post
+    liked = list(Post.objects.filter(author_id=row["recipient_id"], likes=row["sender_id"]).values_list("id", flat=True)[:2])
+    return liked[0] if len(liked) == 1 else None
+
+
+def merge_legacy_notifications(apps, schema_editor):
+    """
+    0029 က post ပါတဲ့ row တွေကိုပဲ ပေါင်းခဲ့ပြီး Like / Comment notification အဟောင်းတွေမှာ post မပါပါ (NULL)။
+    Comment row / Like ကနေ Post ကို ရှာလို့ရရင် (recipient, type, post) group ထဲ ပေါင်းပြီး
+    မရရင် (recipient, type, sender) တူတာတွေ (Like ပြန်ဖြုတ်/ပြန်နှိပ်လို့ ထပ်နေတာ) ကို တစ်ခုတည်း ထားသည်။
+    """
+    Notification = apps.get_model("myapp", "Notification")
+    Post = apps.get_model("myapp", "Post")
+    Comment = apps.get_model("myapp", "Comment")
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+
+    legacy = Notification.objects.filter(notification_type__in=COALESCED_TYPES, post__isnull=True).order_by(
+        "-created_at", "-id"
+    ).values("id", "recipient_id", "sender_id", "notification_type", "created_at", "is_seen")
+    groups = defaultdict(list)
+    for row in legacy.iterator():
+        post_id = legacy_post_id(Post, Comment, row)
+        key = (row["recipient_id"], row["notification_type"], post_id, None if post_id else row["sender_id"])
+        groups[key].append(row)
+
+    for (recipient_id, notification_type, post_id, _), rows in groups.items():
+        ids = [row["id"] for row in rows]
+        if post_id and Notification.objects.filter(
+            recipient_id=recipient_id, notification_type=notification_type, post_id=post_id
+        ).exists():
+            # Group row အသစ်ရှိပြီးသား - actor_count ကို Like/Comment table ကနေ တွက်ထားလို့ ဒီ row တွေ ပါပြီးသား
+            Notification.objects.filter(id__in=ids).delete()
+            continue
+        if len(rows) == 1 and not post_id:
+            continue
+
+        senders = list(dict.fromkeys(row["sender_id"] for row in rows))
+        names = dict(User.objects.filter(id__in=senders[:2]).values_list("id", "username"))
+        previous_id = senders[1] if len(senders) > 1 else None
+        Notification.objects.filter(id=ids[0]).update(
+            post_id=post_id,
+            previous_sender_id=previous_id,
+            actor_count=len(senders),
+            is_seen=all(row["is_seen"] for row in rows),
+            content=describe(notification_type, names.get(senders[0]), names.get(previous_id), len(senders)),
+        )
+        Notification.objects.filter(id__in=ids[1:]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("myapp", "0038_post_author_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_legacy_notifications, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,23 @@
 import uuid
-from django.db import models
+from django.db import models, transaction, IntegrityError
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models import F, Q, Case, When, Value, Count, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_save, pre_delete, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.utils import timezone
 from datetime import timedelta
 
+from .events import touch
+from .badges import adjust_badge, reset_badges, CHATS, NOTIFICATIONS, FRIEND_REQUESTS
+from .message_search import index_messages, unindex_message
+from .broadcasts import forget_latest_broadcast
+from .bots import BOT_USERNAME, BOT_TALK_ID, forget_bot_identity, reload_bot_rules
+from .user_search import index_profiles, unindex_user
+from .autocomplete import update_user as update_autocomplete_user, remove_user as remove_autocomplete_user
+from .friends import friend_count, forget_friends
+from .images import VariantImageField, queue_variants, variant_name
+
 # 1. Profile Model
 class Profile(models.Model):
     ROLE_CHOICES = [
@@ -18,14 +30,17 @@ class Profile(models.Model):
 
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     talk_id = models.CharField(max_length=50, unique=True, blank=True, null=True)
-    profile_pic = models.ImageField(upload_to='profiles/', default='default.png')
+    profile_pic = VariantImageField(upload_to='profiles/', default='default.png')
+    # avatar / feed / full WebP (images.py)
+    profile_pic_variants = models.JSONField(default=dict, blank=True, editable=False)
     bio = models.TextField(blank=True)
-    friends = models.ManyToManyField(User, related_name='user_friends', blank=True)
 
     # --- Role & Verification ---
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='user')
     is_verified = models.BooleanField(default=False)
     last_seen = models.DateTimeField(null=True, blank=True)
+    # ဒီ id အထိ AdminBroadcast တွေကို Chat ထဲ ထည့်ပြီးပြီ (broadcasts.py)
+    last_broadcast_id = models.BigIntegerField(default=0)
 
     # --- Chat Features ---
     is_typing = models.BooleanField(default=False)
@@ -43,6 +58,11 @@ class Profile(models.Model):
             return timezone.now() < self.last_seen + timedelta(minutes=5)
         return False
 
+    @property
+    def friend_count(self):
+        """ Friendship table ကနေ (friends.py cache) """
+        return friend_count(self.user_id)
+
     def has_ban_expired(self):
         if self.is_banned and self.ban_until:
             return timezone.now() > self.ban_until
@@ -63,21 +83,49 @@ class Profile(models.Model):
 class Post(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posts')
     content = models.TextField()
-    image = models.ImageField(upload_to='posts/', blank=True, null=True)
+    image = VariantImageField(upload_to='posts/', blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     likes = models.ManyToManyField(User, related_name='post_likes', blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # --- Denormalized Counters ---
+    # Feed render တိုင်း COUNT(*) မလုပ်ရအောင် သိမ်းထားခြင်း (recount_post_counters command ဖြင့် ပြန်ညှိနိုင်သည်)
+    like_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        # Home feed / Profile ရဲ့ keyset pagination (created_at, id) အတွက်
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='post_feed_idx'),
+            models.Index(fields=['author', '-created_at', '-id'], name='post_author_idx'),
+        ]
+
     def __str__(self):
         return f"{self.author.username}'s post - {self.id}"
 
     def total_likes(self):
-        return self.likes.count()
+        return self.like_count
+
+    def toggle_like(self, user):
+        """ Like/Unlike လုပ်ပြီး like_count ကို atomic update လုပ်သည်။ Like ဖြစ်သွားရင် True ပြန်ပေးသည် """
+        through = Post.likes.through
+        removed, _ = through.objects.filter(post_id=self.pk, user_id=user.pk).delete()
+        if removed:
+            Post.objects.filter(pk=self.pk).update(like_count=F('like_count') - removed)
+            liked = False
+        else:
+            _, liked = through.objects.get_or_create(post_id=self.pk, user_id=user.pk)
+            if liked:
+                Post.objects.filter(pk=self.pk).update(like_count=F('like_count') + 1)
+        self.refresh_from_db(fields=['like_count'])
+        return liked
 
 # 3. Story Model
 class Story(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='stories')
-    image = models.ImageField(upload_to='stories/', blank=True, null=True)
+    image = VariantImageField(upload_to='stories/', blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     caption = models.CharField(max_length=200, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -107,31 +155,118 @@ class FriendRequest(models.Model):
 
     class Meta:
         unique_together = ('from_user', 'to_user')
+        indexes = [models.Index(fields=['to_user', '-created_at', '-id'], name='friendreq_inbox_idx')]
 
 # 6. Message Model
 class Message(models.Model):
     sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sent_messages')
     receiver = models.ForeignKey(User, on_delete=models.CASCADE, related_name='received_messages')
     content = models.TextField(blank=True, null=True)
-    image = models.ImageField(upload_to='chat_images/', blank=True, null=True)
+    image = VariantImageField(upload_to='chat_images/', blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     voice_note = models.FileField(upload_to='voice_notes/', blank=True, null=True)
     parent = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='replies')
-    is_read = models.BooleanField(default=False)
     timestamp = models.DateTimeField(auto_now_add=True)
+    # Edit ဖြစ်တိုင်း ပြောင်းသည် - get_messages ရဲ့ incremental sync အတွက်
+    # (ဖတ်ပြီး/မဖတ်ရသေး ကို Message row မှာ မသိမ်းပါ - Conversation.last_read_id ကို ကြည့်ပါ)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['sender', 'receiver', 'id'], name='msg_conversation_idx')]
 
     def __str__(self):
         return f"From {self.sender} to {self.receiver}"
 
+# 6.1 Deleted Message (Chat sync tombstone)
+class DeletedMessage(models.Model):
+    """ ဖျက်လိုက်တဲ့ Message id ကို sync လုပ်နေတဲ့ client တွေ သိအောင် မှတ်ထားခြင်း (RETENTION ကျော်ရင် prune_deleted_messages က ဖျက်သည်) """
+    RETENTION = timedelta(days=7)
+
+    message_id = models.BigIntegerField()
+    sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    receiver = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['sender', 'receiver', 'deleted_at'], name='deletedmsg_sync_idx')]
+
 # 7. Notification Model
 class Notification(models.Model):
+    """
+    Like / Comment တွေကို (recipient, type, post) တစ်ခုမှာ row တစ်ခုတည်း ထားပြီး action အသစ်ရောက်တိုင်း
+    update လုပ်ပါတယ် ("A, B and 312 others liked your post.")။ sender က နောက်ဆုံး action လုပ်သူ၊
+    previous_sender က အဲ့ဒီ့ရှေ့က တစ်ယောက်ပါ။ တခြား type တွေက action တစ်ခုကို row တစ်ခုပါပဲ။
+    """
+    COALESCED_TYPES = ('Like', 'Comment')
+    VERBS = {'Like': 'liked your post.', 'Comment': 'commented on your post.'}
+
     recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
     sender = models.ForeignKey(User, on_delete=models.CASCADE)
+    previous_sender = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    actor_count = models.PositiveIntegerField(default=1)
     notification_type = models.CharField(max_length=20)
     content = models.TextField(blank=True, null=True)
     post = models.ForeignKey(Post, on_delete=models.SET_NULL, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Group ထဲကို action အသစ်ဝင်တိုင်း ပြောင်းသည် - Notification page က ဒါနဲ့ စီသည်
+    updated_at = models.DateTimeField(auto_now=True)
     is_seen = models.BooleanField(default=False)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['recipient', 'notification_type', 'post'],
+                condition=Q(notification_type__in=['Like', 'Comment']),
+                name='notification_group_uniq',
+            )
+        ]
+        indexes = [models.Index(fields=['recipient', '-updated_at', '-id'], name='notification_feed_idx')]
+
+    @classmethod
+    def describe(cls, notification_type, sender_name, previous_name, actor_count):
+        names = [n for n in (sender_name, previous_name) if n]
+        others = max(actor_count - len(names), 0)
+        if others:
+            who = f"{', '.join(names)} and {others} other{'s' if others > 1 else ''}"
+        else:
+            who = ' and '.join(names)
+        return f"{who} {cls.VERBS.get(notification_type, 'sent a notification.')}"
+
+    @classmethod
+    def coalesce(cls, recipient, sender, notification_type, post, actor_count):
+        """
+        Group row ကို create/update လုပ်သည်။ actor_count = အဲ့ဒီ Post ကို Like/Comment လုပ်ထားတဲ့ လူအရေအတွက်
+        (caller က source table ကနေ တွက်ပေးလို့ Like ပြန်ဖြုတ်ပြီး ပြန်နှိပ်တာမျိုးနဲ့ မတိုးပါ)
+        """
+        group = cls.objects.filter(
+            recipient=recipient, notification_type=notification_type, post=post
+        ).select_related('sender', 'previous_sender')
+        for _ in range(2):
+            notif = group.first()
+            if notif is None:
+                try:
+                    with transaction.atomic():
+                        return cls.objects.create(
+                            recipient=recipient, sender=sender, notification_type=notification_type, post=post,
+                            actor_count=max(actor_count, 1),
+                            content=cls.describe(notification_type, sender.username, None, max(actor_count, 1)),
+                        )
+                except IntegrityError:
+                    # တခြား request က အရင် create လုပ်သွားရင် update လုပ်မည်
+                    continue
+
+            if notif.sender_id != sender.id:
+                notif.previous_sender = notif.sender
+            notif.sender = sender
+            notif.actor_count = max(actor_count, 2 if notif.previous_sender_id else 1)
+            notif.content = cls.describe(
+                notification_type, sender.username,
+                notif.previous_sender.username if notif.previous_sender_id else None, notif.actor_count
+            )
+            notif.is_seen = False
+            notif.save(update_fields=['sender', 'previous_sender', 'actor_count', 'content', 'is_seen', 'updated_at'])
+            return notif
+
 # 8. Block System Model
 class BlockedUser(models.Model):
     blocker = models.ForeignKey(User, on_delete=models.CASCADE, related_name='blocking')
@@ -150,14 +285,240 @@ class AdminBroadcast(models.Model):
     def __str__(self):
         return f"Broadcast: {self.subject} ({self.created_at.date()})"
 
+# 10. Conversation Model (Chat Inbox)
+class Conversation(models.Model):
+    """
+    User တစ်ယောက်ရဲ့ Chat list အတွက် partner တစ်ယောက်ချင်းစီရဲ့ summary row.
+    Message ပို့/ဖတ်/ဖျက်တိုင်း update လုပ်ထားလို့ chat_list က indexed query တစ်ခုတည်းနဲ့ ပြီးပါတယ်။
+    last_read_id: owner က partner ဆီက Message id ဒီအထိ ဖတ်ပြီးပြီ (Read watermark)။
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='conversations')
+    partner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    last_message = models.ForeignKey(Message, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    last_message_preview = models.CharField(max_length=100, blank=True)
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    last_message_outgoing = models.BooleanField(default=False)
+    unread_count = models.PositiveIntegerField(default=0)
+    last_read_id = models.BigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('owner', 'partner')
+        indexes = [models.Index(fields=['owner', '-last_message_at', '-id'], name='inbox_idx')]
+
+    def __str__(self):
+        return f"{self.owner} <-> {self.partner}"
+
+    @staticmethod
+    def preview_for(message):
+        if message.content:
+            return message.content[:100]
+        if message.image:
+            return "📷 Photo"
+        if message.voice_note:
+            return "🎤 Voice message"
+        return ""
+
+    @classmethod
+    def record_message(cls, message):
+        """ Message အသစ်အတွက် ပို့သူ/လက်ခံသူ row နှစ်ခုလုံးကို upsert လုပ်သည် """
+        if message.sender_id == message.receiver_id:
+            return
+        preview = cls.preview_for(message)
+        # Message တွေ ပြိုင်တူရောက်လာရင် id ပိုကြီးတဲ့ဟာကိုပဲ last message အဖြစ် ထားမည်
+        newer = Q(last_message__isnull=True) | Q(last_message_id__lt=message.id)
+
+        def keep_newer(value, field):
+            return Case(When(newer, then=Value(value)), default=F(field), output_field=cls._meta.get_field(field))
+
+        for owner_id, partner_id, outgoing in (
+            (message.sender_id, message.receiver_id, True),
+            (message.receiver_id, message.sender_id, False),
+        ):
+            unread = 0 if outgoing else 1
+            rows = cls.objects.filter(owner_id=owner_id, partner_id=partner_id)
+            updated = rows.update(
+                last_message_id=keep_newer(message.id, 'last_message_id'),
+                last_message_preview=keep_newer(preview, 'last_message_preview'),
+                last_message_at=keep_newer(message.timestamp, 'last_message_at'),
+                last_message_outgoing=keep_newer(outgoing, 'last_message_outgoing'),
+                unread_count=F('unread_count') + unread,
+            )
+            if not updated:
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(
+                            owner_id=owner_id, partner_id=partner_id, last_message=message,
+                            last_message_preview=preview, last_message_at=message.timestamp,
+                            last_message_outgoing=outgoing, unread_count=unread,
+                        )
+                except IntegrityError:
+                    # တခြား request က အရင် create လုပ်သွားရင် update ပြန်လုပ်မည်
+                    rows.update(unread_count=F('unread_count') + unread)
+                    rows.filter(newer).update(
+                        last_message=message, last_message_preview=preview,
+                        last_message_at=message.timestamp, last_message_outgoing=outgoing,
+                    )
+        adjust_badge(message.receiver_id, CHATS, 1)
+
+    @classmethod
+    def mark_read(cls, owner, partner, upto_id=None):
+        """
+        Watermark ကို ရှေ့တိုးသည် - Conversation row တစ်ခုတည်းကိုပဲ ရေးပါတယ်။
+        upto_id မပါရင် last message အထိ အကုန်ဖတ်ပြီး။ ပြောင်းသွားရင် True ပြန်သည်။
+        """
+        rows = cls.objects.filter(owner=owner, partner=partner)
+        if upto_id is None:
+            changed = bool(rows.filter(last_read_id__lt=F('last_message_id')).update(
+                last_read_id=F('last_message_id'), unread_count=0
+            ) or rows.filter(unread_count__gt=0).update(unread_count=0))
+        else:
+            remaining = Message.objects.filter(
+                sender=partner, receiver=owner, id__gt=upto_id
+            ).order_by().values('receiver').annotate(n=Count('id')).values('n')
+            changed = bool(rows.filter(last_read_id__lt=upto_id).update(
+                last_read_id=upto_id, unread_count=Coalesce(Subquery(remaining), 0)
+            ))
+        if changed:
+            reset_badges([owner.pk])
+        return changed
+
+    @classmethod
+    def read_watermarks(cls, user, other):
+        """ {user_id: last_read_id} - Message m ကို m.receiver က ဖတ်ပြီးလား = m.id <= watermarks[m.receiver_id] """
+        return dict(cls.objects.filter(
+            Q(owner=user, partner=other) | Q(owner=other, partner=user)
+        ).values_list('owner_id', 'last_read_id'))
+
+    @classmethod
+    def record_delete(cls, message, message_id):
+        """ Message ဖျက်ပြီးနောက် ခေါ်ပါ (delete() က message.id ကို None လုပ်လို့ id ကို သီးသန့်ပေးရသည်) """
+        if cls.objects.filter(
+            owner_id=message.receiver_id, partner_id=message.sender_id,
+            last_read_id__lt=message_id, unread_count__gt=0
+        ).update(unread_count=F('unread_count') - 1):
+            adjust_badge(message.receiver_id, CHATS, -1)
+
+        # SET_NULL ကြောင့် last_message က null ဖြစ်သွားတဲ့ row တွေကိုပဲ ပြန်တွက်မည်
+        stale = cls.objects.filter(
+            Q(owner_id=message.sender_id, partner_id=message.receiver_id) |
+            Q(owner_id=message.receiver_id, partner_id=message.sender_id),
+            last_message__isnull=True
+        )
+        for conv in stale:
+            latest = Message.objects.filter(
+                Q(sender_id=conv.owner_id, receiver_id=conv.partner_id) |
+                Q(sender_id=conv.partner_id, receiver_id=conv.owner_id)
+            ).order_by('-id').first()
+            if latest is None:
+                conv.last_message_preview, conv.last_message_at, conv.last_message_outgoing = '', None, False
+            else:
+                conv.last_message = latest
+                conv.last_message_preview = cls.preview_for(latest)
+                conv.last_message_at = latest.timestamp
+                conv.last_message_outgoing = latest.sender_id == conv.owner_id
+            conv.save(update_fields=['last_message', 'last_message_preview', 'last_message_at', 'last_message_outgoing'])
+
+# 11. Background Job Model (jobs.py)
+class Job(models.Model):
+    """
+    Request ထဲမှာ မလုပ်ဘဲ နောက်ကွယ်မှာ လုပ်ရမယ့် အလုပ် (Notification, Bot reply, Account ဖျက်ခြင်း စသည်)။
+    `manage.py run_jobs` worker က run_at ရောက်ပြီး pending ဖြစ်နေတာတွေကို claim လုပ်ပြီး run ပါတယ်။
+    အောင်မြင်ရင် row ကို ဖျက်ပြီး မအောင်မြင်ရင် attempts ကုန်တဲ့အထိ backoff နဲ့ ပြန်ကြိုးစားပါတယ်။
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(PENDING, 'Pending'), (RUNNING, 'Running'), (FAILED, 'Failed')]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'run_at'], name='job_ready_idx')]
+
+    def __str__(self):
+        return f"{self.name} ({self.status}, attempt {self.attempts})"
+
+# 12. Bot Rule Model (bots.py)
+class BotRule(models.Model):
+    """ ThuTalkBot ရဲ့ keyword reply - bot_rules.json ထဲက keyword တူရင် ဒီ row က အစားထိုးပါတယ် """
+    keyword = models.CharField(max_length=100, unique=True)
+    responses = models.TextField(help_text="One reply per line; one is picked at random.")
+    # ငယ်ရင် ရှေ့ - keyword နှစ်ခု ပါနေရင် priority ငယ်တဲ့ rule က ဖြေသည်
+    priority = models.IntegerField(default=0)
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.keyword
+
+# 13. Friendship Model (friends.py)
+class Friendship(models.Model):
+    """
+    Friend နှစ်ယောက်ကြား row တစ်ခုတည်း (user_low id < user_high id)။ Accept နှစ်ခု ပြိုင်လာရင်လည်း
+    unique constraint ကြောင့် တစ်ခုပဲ ဝင်ပါတယ်။ ဖတ်တဲ့အခါ friends.friend_ids() / are_friends() ကို သုံးပါ။
+    """
+    user_low = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    user_high = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user_low', 'user_high'], name='friendship_pair_uniq'),
+            models.CheckConstraint(condition=Q(user_low__lt=F('user_high')), name='friendship_pair_order'),
+        ]
+        indexes = [models.Index(fields=['user_high', 'user_low'], name='friendship_high_idx')]
+
+    def __str__(self):
+        return f"{self.user_low} <-> {self.user_high}"
+
+    @staticmethod
+    def pair(user_id, other_id):
+        return (user_id, other_id) if user_id < other_id else (other_id, user_id)
+
+    @classmethod
+    def add(cls, user_id, other_id):
+        if user_id == other_id:
+            return None
+        low, high = cls.pair(user_id, other_id)
+        friendship, _ = cls.objects.get_or_create(user_low_id=low, user_high_id=high)
+        return friendship
+
+    @classmethod
+    def remove(cls, user_id, other_id):
+        low, high = cls.pair(user_id, other_id)
+        cls.objects.filter(user_low_id=low, user_high_id=high).delete()
+
+# 14. Friend Suggestion Model (suggestions.py)
+class FriendSuggestion(models.Model):
+    """ People you may know - build_friend_suggestions command က User တစ်ယောက်ကို top-K သိမ်းထားသည် """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='friend_suggestions')
+    suggested = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    mutual_count = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['user', 'suggested'], name='suggestion_pair_uniq')]
+        indexes = [models.Index(fields=['user', '-mutual_count', 'suggested'], name='suggestion_rank_idx')]
+
+    def __str__(self):
+        return f"{self.user} -> {self.suggested} ({self.mutual_count} mutual)"
+
 # --- SIGNALS ---
 
 @receiver(post_save, sender=User)
-def create_or_save_user_profile(sender, instance, created, **kwargs):
+def create_or_save_user_profile(sender, instance, created, update_fields=None, **kwargs):
     if created:
         # Bot အတွက် သီးသန့် ID သတ်မှတ်ခြင်း
-        if instance.username == 'ThuTalkBot':
-            new_talk_id = 'thutalk-01'
+        if instance.username == BOT_USERNAME:
+            new_talk_id = BOT_TALK_ID
             role = 'Official'
         else:
             # ပုံမှန် User များအတွက် talk-XXXX format
@@ -178,28 +539,158 @@ def create_or_save_user_profile(sender, instance, created, **kwargs):
             if Profile.objects.filter(talk_id=new_talk_id).exists():
                 new_talk_id = f"talk-{uuid.uuid4().hex[:6]}"
             Profile.objects.create(user=instance, talk_id=new_talk_id)
+        elif update_fields is None or {'username', 'is_active'} & set(update_fields):
+            # Username / Active ပြောင်းတာကို search index နဲ့ autocomplete (Profile signal) ဆီ ရောက်စေဖို့ပဲ -
+            # Login တိုင်း last_login ပဲ save တာဆို မလုပ်ပါ၊ Profile ရဲ့ တခြား field (ပုံ) ကိုလည်း မထိပါ
+            instance.profile.save(update_fields=['user'])
+
+# User search index (user_search.py) - last_seen လို search နဲ့ မဆိုင်တဲ့ field ပဲ save တာဆို မလုပ်ပါ
+_SEARCHABLE_FIELDS = {'talk_id', 'bio', 'user'}
+
+@receiver(post_save, sender=Profile)
+def index_profile_for_search(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or _SEARCHABLE_FIELDS & set(update_fields):
+        index_profiles([instance])
+
+@receiver(post_delete, sender=Profile)
+def unindex_profile_for_search(sender, instance, **kwargs):
+    unindex_user(instance.user_id)
+
+# Autocomplete (autocomplete.py) - update_profile_ajax က username/Talk ID ပြောင်းတာလည်း ဒီကနေ ရောက်ပါတယ်
+# Process memory ထဲက index ကို rollback လုပ်လို့မရလို့ transaction commit ပြီးမှ ပြင်ပါတယ်
+@receiver(post_save, sender=Profile)
+def update_autocomplete(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or {'talk_id', 'profile_pic', 'user'} & set(update_fields):
+        user = instance.user
+        args = (
+            user.id, user.username, instance.talk_id,
+            variant_name(instance.profile_pic.name, instance.profile_pic_variants, 'avatar'),
+        )
+        active = user.is_active
+        transaction.on_commit(lambda: update_autocomplete_user(*args, active=active))
+
+@receiver(post_delete, sender=Profile)
+def remove_from_autocomplete(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: remove_autocomplete_user(user_id))
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(comment_count=F('comment_count') + 1)
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    # Parent comment ဖျက်ရင် cascade ဖြစ်သွားတဲ့ reply တစ်ခုချင်းစီအတွက်လည်း ဒီ signal ရောက်လာပါတယ်
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(comment_count=F('comment_count') - 1)
+
+# Like count - toggle_like က through table ကို တိုက်ရိုက်ပြင်လို့ ဒီ signal တွေ မရောက်ပါ (ကိုယ်တိုင် update လုပ်ပြီးသား)။
+# Admin M2M edit, likes.add/remove/clear နဲ့ User ဖျက်တဲ့ cascade ကိုတော့ ဒီကနေ ညှိပါတယ်
+def _subtract_likes(rows):
+    counts = rows.values('post_id').annotate(n=Count('id')).values_list('post_id', 'n')
+    for post_id, n in counts:
+        Post.objects.filter(pk=post_id).update(like_count=Greatest(F('like_count') - n, 0))
+
+@receiver(m2m_changed, sender=Post.likes.through)
+def sync_like_count(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'post_add' and pk_set:
+        # add() ရဲ့ pk_set ထဲမှာ အသစ်ထည့်လိုက်တာတွေပဲ ပါပါတယ်
+        if reverse:
+            Post.objects.filter(pk__in=pk_set).update(like_count=F('like_count') + 1)
         else:
-            instance.profile.save()
+            Post.objects.filter(pk=instance.pk).update(like_count=F('like_count') + len(pk_set))
+    elif action in ('pre_remove', 'pre_clear'):
+        # ဖျက်မယ့် row တွေ ရှိနေတုန်း ရေတွက်ရပါမယ် - remove() ရဲ့ pk_set မှာ Like မလုပ်ထားတာလည်း ပါနိုင်ပါတယ်
+        rows = sender.objects.filter(user_id=instance.pk) if reverse else sender.objects.filter(post_id=instance.pk)
+        if action == 'pre_remove':
+            rows = rows.filter(post_id__in=pk_set) if reverse else rows.filter(user_id__in=pk_set)
+        _subtract_likes(rows)
+
+@receiver(pre_delete, sender=User)
+def subtract_deleted_user_likes(sender, instance, **kwargs):
+    # Auto-created through model ဖြစ်လို့ cascade delete မှာ post_delete / m2m_changed မရောက်ပါ
+    _subtract_likes(Post.likes.through.objects.filter(user_id=instance.pk))
+
+@receiver(post_save, sender=Message)
+def update_conversations(sender, instance, created, **kwargs):
+    if created:
+        Conversation.record_message(instance)
+    else:
+        # Edit လုပ်ထားတာ last message ဖြစ်နေရင် preview ကို ပြင်မည်
+        Conversation.objects.filter(last_message=instance).update(
+            last_message_preview=Conversation.preview_for(instance)
+        )
+    touch(instance.sender_id, instance.receiver_id)
+
+@receiver(post_save, sender=Message)
+def index_message_content(sender, instance, **kwargs):
+    index_messages([instance])
+
+@receiver(post_delete, sender=Message)
+def unindex_message_content(sender, instance, **kwargs):
+    unindex_message(instance.id)
+
+# Event stream (views.event_stream) ကို Badge ပြောင်းကြောင်း အသိပေးသည်
+@receiver(post_save, sender=Notification)
+def touch_notification_recipient(sender, instance, **kwargs):
+    touch(instance.recipient_id)
+
+@receiver([post_save, post_delete], sender=FriendRequest)
+def touch_friend_request_users(sender, instance, **kwargs):
+    touch(instance.from_user_id, instance.to_user_id)
+
+# Badge counter များ (badges.py) - bulk_create/update() လုပ်တဲ့နေရာတွေက reset_badges() ကို ကိုယ်တိုင် ခေါ်ရပါမယ်
+def _counts_for_badge(notification):
+    return not notification.is_seen and notification.notification_type != 'Message'
+
+@receiver(post_save, sender=Notification)
+def increment_notification_badge(sender, instance, created, **kwargs):
+    if not created:
+        # Admin ကနေ is_seen ပြင်တာမျိုး - ပြန်တွက်ခိုင်းသည်
+        reset_badges([instance.recipient_id])
+    elif _counts_for_badge(instance):
+        adjust_badge(instance.recipient_id, NOTIFICATIONS, 1)
+
+@receiver(post_delete, sender=Notification)
+def decrement_notification_badge(sender, instance, **kwargs):
+    if _counts_for_badge(instance):
+        adjust_badge(instance.recipient_id, NOTIFICATIONS, -1)
+
+@receiver(post_save, sender=FriendRequest)
+def increment_friend_request_badge(sender, instance, created, **kwargs):
+    if created:
+        adjust_badge(instance.to_user_id, FRIEND_REQUESTS, 1)
+
+@receiver(post_delete, sender=FriendRequest)
+def decrement_friend_request_badge(sender, instance, **kwargs):
+    adjust_badge(instance.to_user_id, FRIEND_REQUESTS, -1)
+
+# Friend adjacency cache (friends.py) - User ဖျက်လို့ cascade ဖြစ်တာလည်း ဒီကနေ ရောက်ပါတယ်
+@receiver([post_save, post_delete], sender=Friendship)
+def forget_friend_adjacency(sender, instance, **kwargs):
+    forget_friends(instance.user_low_id, instance.user_high_id)
+
+@receiver([post_save, post_delete], sender=BotRule)
+def recompile_bot_rules(sender, instance, **kwargs):
+    reload_bot_rules()
+
+@receiver(post_delete, sender=User)
+def forget_deleted_bot(sender, instance, **kwargs):
+    if instance.username == BOT_USERNAME:
+        forget_bot_identity()
 
 @receiver(post_save, sender=AdminBroadcast)
-def send_broadcast_to_all_users(sender, instance, created, **kwargs):
+def publish_broadcast(sender, instance, created, **kwargs):
     if created:
-        try:
-            # ThuTalkBot အမည်ဖြင့် User ကို ရှာမည် (မရှိရင် အလိုအလျောက် ဆောက်မည်)
-            bot_user, _ = User.objects.get_or_create(username='ThuTalkBot')
-
-            # Bot ကိုယ်တိုင်ကို ချန်လှပ်ပြီး ကျန်တဲ့ User အားလုံးကို ရှာမည်
-            users = User.objects.exclude(id=bot_user.id)
-
-            broadcast_list = [
-                Message(
-                    sender=bot_user,
-                    receiver=user,
-                    content=f"📢 {instance.subject}\n\n{instance.message}"
-                ) for user in users
-            ]
-            if broadcast_list:
-                Message.objects.bulk_create(broadcast_list)
-        except Exception as e:
-            # Error တက်ရင် site ရပ်မသွားအောင် print ပဲထုတ်ထားမယ်
-            print(f"Broadcast system error: {e}")
\ No newline at end of file
+        # User အလိုက် Message မရေးတော့ပါ - broadcasts.deliver_broadcasts() က ဖတ်တဲ့အချိန်မှ ထည့်ပေးသည်
+        forget_latest_broadcast()
+
+# Image variants (images.py) - ပုံအသစ် upload ရင် run_jobs worker က avatar / feed / full ကို ထုတ်ပါမယ်
+@receiver(post_save, sender=Profile)
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Story)
+@receiver(post_save, sender=Message)
+def queue_image_variants(sender, instance, update_fields=None, **kwargs):
+    for field in sender._meta.concrete_fields:
+        if isinstance(field, VariantImageField) and (update_fields is None or field.name in update_fields):
+            queue_variants(instance, field)
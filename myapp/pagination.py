@@ -0,0 +1,53 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+# Keyset (Cursor) Pagination
+# OFFSET မသုံးဘဲ (key, id) ပေါ်မှာ range scan တစ်ခါတည်းနဲ့ page ယူတာမို့
+# Table ဘယ်လောက်ကြီးကြီး page တစ်ခုရဲ့ cost က အတူတူပါပဲ။
+
+DEFAULT_PAGE_SIZE = 20
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(obj, key='created_at'):
+    """ Row တစ်ခုရဲ့ (key, id) ကို URL-safe token အဖြစ် ပြောင်းသည် """
+    value = getattr(obj, key)
+    if hasattr(value, 'isoformat'):
+        value = value.isoformat()
+    raw = json.dumps([value, obj.pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, model, key='created_at'):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return model._meta.get_field(key).to_python(value), int(pk)
+    except (ValueError, TypeError, ValidationError):
+        raise InvalidCursor(token)
+
+
+def keyset_page(queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE, key='created_at', newest_first=True):
+    """
+    One page of `queryset` ordered on (key, id), newest first by default.
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    op = 'lt' if newest_first else 'gt'
+    sign = '-' if newest_first else ''
+    queryset = queryset.order_by(f'{sign}{key}', f'{sign}id')
+    if cursor:
+        value, pk = decode_cursor(cursor, queryset.model, key)
+        queryset = queryset.filter(Q(**{f'{key}__{op}': value}) | Q(**{key: value, f'id__{op}': pk}))
+
+    items = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = encode_cursor(items[-1], key)
+    return items, next_cursor
@@ -0,0 +1,94 @@
+import re
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from django.utils.timesince import timesince
+
+# --- POST CARD FRAGMENT CACHE ---
+# Post card တွေကို viewer မပါဘဲ တစ်ခါ render ပြီး cache ထဲသိမ်းထားပါတယ်။
+# Key ထဲမှာ post id, updated_at, counter များနဲ့ version ပါလို့ Post ပြောင်းတာနဲ့ key အသစ်ဖြစ်သွားပါတယ်။
+# Viewer နဲ့ဆိုင်တဲ့ အပိုင်းများ (Like state, Delete ခလုတ်, "x ago") ကို marker ကနေ request တိုင်း ဖြည့်ပေးပါတယ်။
+# Author ရဲ့ Profile ပြောင်းတာကို key က မသိလို့ CARD_TIMEOUT နဲ့ ကန့်သတ်ထားပါတယ်။
+
+CARD_TIMEOUT = 60 * 60
+VERSION_TIMEOUT = 60 * 60 * 24
+
+_TS = re.compile(r'<!--ts:(\d+)-->')
+_LIKED = re.compile(r'<!--liked:([^|]*)\|(.*?)-->')
+_OWNER = re.compile(r'<!--owner-->(.*?)<!--/owner-->', re.S)
+_COMMENT_DELETE = re.compile(r'<!--cdel:(\d+)-->(.*?)<!--/cdel-->', re.S)
+
+
+def _version_key(post_id):
+    return f'postcard:ver:{post_id}'
+
+
+def _card_key(template_name, post, version):
+    return 'postcard:{}:{}:{}:{}:{}:{}'.format(
+        template_name, post.pk, int(post.updated_at.timestamp() * 1000000),
+        post.like_count, post.comment_count, version
+    )
+
+
+def invalidate_post_card(post_id):
+    """ Edit/Delete/Like/Comment ဖြစ်တိုင်း ခေါ်ပါ - version တိုးလိုက်ရင် card အဟောင်းကို မသုံးတော့ပါ """
+    key = _version_key(post_id)
+    cache.add(key, 0, VERSION_TIMEOUT)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, VERSION_TIMEOUT)
+
+
+def _record(hits, misses):
+    for name, n in (('hits', hits), ('misses', misses)):
+        if n:
+            key = f'postcard:stats:{name}'
+            cache.add(key, 0, None)
+            try:
+                cache.incr(key, n)
+            except ValueError:
+                cache.set(key, n, None)
+
+
+def card_cache_stats():
+    hits = cache.get('postcard:stats:hits', 0)
+    misses = cache.get('postcard:stats:misses', 0)
+    total = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_rate': round(hits / total, 4) if total else 0.0}
+
+
+def _personalize(html, post, viewer):
+    now = datetime.now(dt_timezone.utc)
+    can_moderate = post.author_id == viewer.id or viewer.is_staff
+    liked = getattr(post, 'liked_by_viewer', False)
+
+    html = _TS.sub(lambda m: timesince(datetime.fromtimestamp(int(m[1]), dt_timezone.utc), now), html)
+    html = _LIKED.sub(lambda m: m[1] if liked else m[2], html)
+    html = _OWNER.sub(lambda m: m[1] if can_moderate else '', html)
+    html = _COMMENT_DELETE.sub(
+        lambda m: m[2] if can_moderate or int(m[1]) == viewer.id else '', html
+    )
+    return mark_safe(html)
+
+
+def render_post_cards(posts, template_name, viewer):
+    """ Post list ကို card HTML list အဖြစ် ပြန်ပေးသည် (cache hit ဆိုရင် render မလုပ်တော့ပါ) """
+    versions = cache.get_many([_version_key(p.pk) for p in posts])
+    keys = [_card_key(template_name, p, versions.get(_version_key(p.pk), 0)) for p in posts]
+    cached = cache.get_many(keys)
+
+    fresh = {}
+    for post, key in zip(posts, keys):
+        if key not in cached:
+            fresh[key] = render_to_string(template_name, {'post': post})
+    if fresh:
+        cache.set_many(fresh, CARD_TIMEOUT)
+    _record(len(posts) - len(fresh), len(fresh))
+
+    return [
+        _personalize(cached.get(key) or fresh[key], post, viewer)
+        for post, key in zip(posts, keys)
+    ]
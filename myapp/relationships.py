@@ -0,0 +1,88 @@
+from django.core.cache import cache
+from django.db.models import Q
+
+from .models import BlockedUser, FriendRequest
+from .friends import friend_ids
+
+# --- BLOCK SET CACHE ---
+# User တစ်ယောက်ချင်းစီအတွက် "ကိုယ် Block ထားသူ" နဲ့ "ကိုယ့်ကို Block ထားသူ" set နှစ်ခုကို cache ထဲသိမ်းထားပါတယ်။
+# block_user / unblock_user မှာ invalidate_block_state() ကို ခေါ်ပေးရပါမယ်။
+# ဒီ cache က ပြသဖို့ (Feed, Search, Chat list) အတွက်ပဲ - Message / Like / Comment / Friend request လို
+# ရေးတဲ့နေရာတွေမှာ is_blocked_between() နဲ့ database ကို တိုက်ရိုက် စစ်ပါ။
+
+BLOCK_STATE_TIMEOUT = 60 * 5
+
+
+def _block_key(user_id):
+    return f'blocks:{user_id}'
+
+
+def block_state(user_id):
+    """ (blocking, blocked_by) - ကိုယ် Block ထားသူ id များ၊ ကိုယ့်ကို Block ထားသူ id များ """
+    key = _block_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        blocking, blocked_by = set(), set()
+        rows = BlockedUser.objects.filter(
+            Q(blocker_id=user_id) | Q(blocked_id=user_id)
+        ).values_list('blocker_id', 'blocked_id')
+        for blocker_id, blocked_id in rows:
+            if blocker_id == user_id:
+                blocking.add(blocked_id)
+            else:
+                blocked_by.add(blocker_id)
+        state = (frozenset(blocking), frozenset(blocked_by))
+        cache.set(key, state, BLOCK_STATE_TIMEOUT)
+    return state
+
+
+def hidden_user_ids(user_id):
+    """ Feed, Chat, Search စတာတွေမှာ မပြရမယ့် User id များ (နှစ်ဖက်လုံး) """
+    blocking, blocked_by = block_state(user_id)
+    return blocking | blocked_by
+
+
+def is_hidden(user_id, other_id):
+    return other_id in hidden_user_ids(user_id)
+
+
+def is_blocked_between(user_id, other_id):
+    """ Database ကနေ စစ်သည် (နှစ်ဖက်လုံး) - cache မသုံးရတဲ့ write path များအတွက် """
+    return BlockedUser.objects.filter(
+        Q(blocker_id=user_id, blocked_id=other_id) | Q(blocker_id=other_id, blocked_id=user_id)
+    ).exists()
+
+
+def invalidate_block_state(*user_ids):
+    cache.delete_many([_block_key(uid) for uid in user_ids])
+
+
+def relationship_flags(user, user_ids):
+    """
+    Viewer နဲ့ User တစ်ယောက်ချင်းစီကြား ဆက်ဆံရေး -
+    {user_id: {'is_friend', 'sent_request', 'received_request', 'is_blocked', 'blocked_by'}}
+    is_blocked = viewer က Block ထားသည်၊ blocked_by = viewer ကို Block ထားသည်။
+    User အရေအတွက် ဘယ်လောက်ဖြစ်ဖြစ် query တစ်ခုပဲ (Friend / Block state က cache)
+    """
+    user_ids = list(user_ids)
+    friends = friend_ids(user.id)
+    sent, received = set(), set()
+    pending = FriendRequest.objects.filter(
+        Q(from_user=user, to_user_id__in=user_ids) | Q(from_user_id__in=user_ids, to_user=user)
+    ).values_list('from_user_id', 'to_user_id')
+    for from_id, to_id in pending:
+        if from_id == user.id:
+            sent.add(to_id)
+        else:
+            received.add(from_id)
+    blocking, blocked_by = block_state(user.id)
+    return {
+        uid: {
+            'is_friend': uid in friends,
+            'sent_request': uid in sent,
+            'received_request': uid in received,
+            'is_blocked': uid in blocking,
+            'blocked_by': uid in blocked_by,
+        }
+        for uid in user_ids
+    }
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Profile, Post, Comment, Message, Story
+from .models import Profile, Post, Comment, Message, Story, Conversation
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -9,39 +9,77 @@ class UserSerializer(serializers.ModelSerializer):
 
 class ProfileSerializer(serializers.ModelSerializer):
     username = serializers.ReadOnlyField(source='user.username')
+    avatar = serializers.SerializerMethodField()
+
     class Meta:
         model = Profile
-        fields = ['username', 'talk_id', 'bio', 'profile_pic', 'role']
+        fields = ['username', 'talk_id', 'bio', 'profile_pic', 'avatar', 'role']
+
+    def get_avatar(self, obj):
+        return obj.profile_pic.avatar_url if obj.profile_pic else '/static/default_profile.png'
 
 class PostSerializer(serializers.ModelSerializer):
     author_name = serializers.ReadOnlyField(source='author.username')
     author_pic = serializers.SerializerMethodField()
-    likes_count = serializers.IntegerField(source='likes.count', read_only=True)
+    likes_count = serializers.IntegerField(source='like_count', read_only=True)
+    comments_count = serializers.IntegerField(source='comment_count', read_only=True)
+    image = serializers.SerializerMethodField()
+    image_full = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
-        fields = ['id', 'author_name', 'author_pic', 'content', 'image', 'created_at', 'likes_count']
+        fields = ['id', 'author_name', 'author_pic', 'content', 'image', 'image_full', 'created_at', 'likes_count', 'comments_count']
+
+    def get_image(self, obj):
+        return obj.image.feed_url if obj.image else None
+
+    def get_image_full(self, obj):
+        return obj.image.full_url if obj.image else None
 
     def get_author_pic(self, obj):
         if obj.author.profile.profile_pic:
-            return obj.author.profile.profile_pic.url
+            return obj.author.profile.profile_pic.avatar_url
         return '/static/default_profile.png'
 
 class MessageSerializer(serializers.ModelSerializer):
     sender_name = serializers.ReadOnlyField(source='sender.username')
+    image = serializers.SerializerMethodField()
+    image_full = serializers.SerializerMethodField()
+    is_read = serializers.SerializerMethodField()
+
     class Meta:
         model = Message
-        fields = ['id', 'sender_name', 'content', 'timestamp', 'is_read', 'image', 'voice_note']
+        fields = ['id', 'sender_name', 'content', 'timestamp', 'is_read', 'image', 'image_full', 'voice_note']
+
+    def get_is_read(self, obj):
+        """
+        Receiver ရဲ့ Conversation.last_read_id (read watermark) ကနေ တွက်သည်။
+        List serialize လုပ်ရင် context={'watermarks': Conversation.read_watermarks(user, other)} ပေးပါ (Message တစ်ခုချင်း query မလုပ်ရအောင်)
+        """
+        watermarks = self.context.get('watermarks')
+        if watermarks is None:
+            watermarks = Conversation.read_watermarks(obj.receiver_id, obj.sender_id)
+        return obj.id <= watermarks.get(obj.receiver_id, 0)
+
+    def get_image(self, obj):
+        return obj.image.feed_url if obj.image else None
+
+    def get_image_full(self, obj):
+        return obj.image.full_url if obj.image else None
 
 class StorySerializer(serializers.ModelSerializer):
     username = serializers.ReadOnlyField(source='user.username')
     user_avatar = serializers.SerializerMethodField()
+    image = serializers.SerializerMethodField()
 
     class Meta:
         model = Story
         fields = ['id', 'username', 'user_avatar', 'image', 'caption', 'created_at']
 
+    def get_image(self, obj):
+        return obj.image.full_url if obj.image else None
+
     def get_user_avatar(self, obj):
         if obj.user.profile.profile_pic:
-            return obj.user.profile.profile_pic.url
+            return obj.user.profile.profile_pic.avatar_url
         return '/static/default_profile.png'
\ No newline at end of file
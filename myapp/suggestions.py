@@ -0,0 +1,97 @@
+import numpy as np
+
+# --- PEOPLE YOU MAY KNOW ---
+# Friend graph ကို CSR (indptr, indices) numpy array အဖြစ် ထားပြီး User အစုလိုက် (batch) friends-of-friends ကို
+# vectorize လုပ်တွက်ပါတယ်။ (owner, candidate) pair တစ်ခုကို int64 key တစ်ခုအဖြစ် ပြောင်းပြီး np.unique ရဲ့ count က
+# mutual friend အရေအတွက်ပါ။ Friend ဖြစ်ပြီးသား၊ Block / Friend request ရှိတဲ့သူတွေကို ဖယ်ပြီး mutual အများဆုံး top-K ကို ယူပါတယ်။
+# build_friend_suggestions command က ဒီ module ကို သုံးပြီး FriendSuggestion table ထဲ သိမ်းပါတယ်။
+
+SUGGESTION_TOP_K = 20
+# Batch တစ်ခုမှာ ဖြန့်ရမယ့် friends-of-friends row အများဆုံး (memory ကန့်သတ်ချက်)
+MAX_BATCH_WORK = 5_000_000
+
+
+def _csr(rows, cols, n):
+    """ Edge (rows[i] -> cols[i]) များကို CSR (indptr, indices) အဖြစ် """
+    order = np.lexsort((cols, rows))
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, cols[order]
+
+
+def _expand(indptr, indices, nodes):
+    """ nodes[i] ရဲ့ neighbor တစ်ခုချင်းစီအတွက် (i, neighbor) - Python loop မပါဘဲ range များကို ဆက်သည် """
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    owner = np.repeat(np.arange(len(nodes), dtype=np.int64), counts)
+    offsets = np.arange(counts.sum(), dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owner, indices[np.repeat(starts, counts) + offsets]
+
+
+class FriendGraph:
+    """
+    user_ids: graph ထဲပါမယ့် User id များ (Active user)
+    friend_pairs / excluded_pairs: (id, id) array - excluded က Block နဲ့ Friend request (ဦးတည်ချက် မခွဲပါ)
+    """
+
+    def __init__(self, user_ids, friend_pairs, excluded_pairs):
+        self.user_ids = np.unique(np.asarray(user_ids, dtype=np.int64))
+        n = len(self.user_ids)
+        a, b = self._positions(friend_pairs)
+        self.indptr, self.indices = _csr(np.concatenate([a, b]), np.concatenate([b, a]), n)
+        a, b = self._positions(excluded_pairs)
+        self.ex_indptr, self.ex_indices = _csr(np.concatenate([a, b]), np.concatenate([b, a]), n)
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def _positions(self, pairs):
+        """ User id pair များကို 0..n-1 position အဖြစ် (graph ထဲမပါတဲ့ user ပါတဲ့ pair ကို ဖယ်သည်) """
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        n = len(self.user_ids)
+        pos = np.searchsorted(self.user_ids, pairs)
+        clipped = np.minimum(pos, max(n - 1, 0))
+        valid = (pos < n).all(axis=1) & (self.user_ids[clipped] == pairs).all(axis=1) if n else np.zeros(len(pairs), bool)
+        valid &= pairs[:, 0] != pairs[:, 1]
+        return pos[valid, 0], pos[valid, 1]
+
+    def batches(self, max_nodes, max_work=MAX_BATCH_WORK):
+        """ Position များကို batch ခွဲသည် - friends-of-friends row အရေအတွက် max_work ထက် မကျော်အောင် """
+        degree = np.diff(self.indptr)
+        neighbor_degree = np.concatenate([[0], np.cumsum(degree[self.indices])])
+        work = neighbor_degree[self.indptr[1:]] - neighbor_degree[self.indptr[:-1]]
+        start, n = 0, len(self)
+        while start < n:
+            cumulative = np.cumsum(work[start:start + max_nodes])
+            size = max(1, int(np.searchsorted(cumulative, max_work, side='right')))
+            yield np.arange(start, min(start + size, n), dtype=np.int64)
+            start += size
+
+    def suggest(self, nodes, top_k=SUGGESTION_TOP_K):
+        """
+        nodes (position) တစ်ခုချင်းစီအတွက် mutual friend အများဆုံး User များ။
+        Returns (owner_ids, suggested_ids, mutual_counts) - owner အလိုက်၊ mutual များရာကနေ စီထားသည်
+        """
+        n = len(self)
+        owner, friends = _expand(self.indptr, self.indices, nodes)
+        hop, candidates = _expand(self.indptr, self.indices, friends)
+        keys = owner[hop] * n + candidates
+
+        # ကိုယ်တိုင်၊ Friend ဖြစ်ပြီးသား၊ Block / Request ရှိသူ
+        ex_owner, excluded = _expand(self.ex_indptr, self.ex_indices, nodes)
+        skip = np.concatenate([
+            owner * n + friends, ex_owner * n + excluded, np.arange(len(nodes), dtype=np.int64) * n + nodes
+        ])
+        keys = keys[~np.isin(keys, skip)]
+
+        keys, mutual = np.unique(keys, return_counts=True)
+        owner, candidates = keys // n, keys % n
+        order = np.lexsort((candidates, -mutual, owner))
+        owner, candidates, mutual = owner[order], candidates[order], mutual[order]
+        rank = np.arange(len(owner)) - np.searchsorted(owner, owner, side='left')
+        keep = rank < top_k
+        return (
+            self.user_ids[nodes[owner[keep]]],
+            self.user_ids[candidates[keep]],
+            mutual[keep],
+        )
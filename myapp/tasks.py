@@ -0,0 +1,73 @@
+from django.apps import apps
+from django.contrib.auth.models import User
+
+from .jobs import job
+from .models import Post, Comment, Message, Notification
+from .bots import bot_identity, bot_auto_reply, get_bot_response
+from .images import build_variants, delete_variant_files
+from .post_cards import invalidate_post_card
+
+# --- BACKGROUND JOB HANDLERS ---
+# views.py က jobs.enqueue('name', ...) နဲ့ ထည့်ထားတာတွေကို run_jobs worker က ဒီ function တွေနဲ့ run ပါတယ်။
+# Enqueue လုပ်ပြီးမှ User/Post ဖျက်သွားတာ ဖြစ်နိုင်လို့ row မရှိတော့ရင် ဘာမှမလုပ်ဘဲ ပြီးပါစေ။
+
+
+@job('welcome_message')
+def welcome_message(user_id):
+    user = User.objects.filter(id=user_id).first()
+    if user:
+        bot_auto_reply(user)
+
+
+@job('bot_reply')
+def bot_reply(user_id, content):
+    if User.objects.filter(id=user_id).exists():
+        Message.objects.create(sender_id=bot_identity().user_id, receiver_id=user_id, content=get_bot_response(content))
+
+
+@job('post_activity_notification')
+def post_activity_notification(post_id, sender_id, notification_type):
+    """ Like / Comment notification group ကို update လုပ်သည် (actor_count ကို run တဲ့အချိန်မှ တွက်သည်) """
+    post = Post.objects.filter(id=post_id).select_related('author').first()
+    sender = User.objects.filter(id=sender_id).first()
+    if post is None or sender is None or post.author_id == sender_id:
+        return
+    if notification_type == 'Like':
+        # Job မ run ခင် Like ပြန်ဖြုတ်သွားရင် မပို့ပါ
+        if not post.likes.filter(id=sender_id).exists():
+            return
+        actor_count = post.like_count - post.likes.filter(id=post.author_id).exists()
+    else:
+        actor_count = Comment.objects.filter(post=post).exclude(user=post.author).values('user').distinct().count()
+    Notification.coalesce(post.author, sender, notification_type, post, actor_count)
+
+
+@job('friend_accepted_notification')
+def friend_accepted_notification(recipient_id, sender_id):
+    sender = User.objects.filter(id=sender_id).first()
+    if sender and User.objects.filter(id=recipient_id).exists():
+        Notification.objects.create(
+            recipient_id=recipient_id, sender=sender,
+            notification_type='FriendRequest', content=f"{sender.username} accepted your friend request."
+        )
+
+
+@job('delete_account', max_attempts=3)
+def delete_account(user_id):
+    """ Post, Message, Notification စတာတွေ cascade ဖျက်ရလို့ request ထဲမှာ မလုပ်ပါ """
+    User.objects.filter(id=user_id, is_active=False).delete()
+
+
+@job('image_variants', max_attempts=3)
+def image_variants(model, pk, field, source):
+    """ Upload ထားတဲ့ ပုံရဲ့ avatar / feed / full WebP များ (images.py) """
+    model = apps.get_model(model)
+    if build_variants(model, pk, field, source) and model is Post:
+        # Cache ထဲက card က မူရင်းပုံ URL နဲ့ ဖြစ်နေလို့
+        invalidate_post_card(pk)
+
+
+@job('delete_stale_variants', max_attempts=3)
+def delete_stale_variants(model, field, names):
+    """ ပုံပြောင်းသွားလို့ မသုံးတော့တဲ့ variant file များ (images.STALE_VARIANT_GRACE ကြာမှ) """
+    delete_variant_files(apps.get_model(model), field, names)
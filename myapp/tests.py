@@ -1,3 +1,456 @@
-from django.test import TestCase
+import random
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .autocomplete import autocomplete, ensure_index
+from .bots import KeywordMatcher
+from .jobs import job, enqueue, claim_jobs, run_job, JOB_LEASE, RETRY_BASE_SECONDS
+from .models import Job, Post, Message, DeletedMessage, Notification, BlockedUser
+from .pagination import keyset_page, encode_cursor, InvalidCursor
+from .relationships import block_state
+from .suggestions import FriendGraph
+from .views import CHAT_SYNC_LIMIT
+
+_ran = []
+
+
+@job('tests_record')
+def _record(value):
+    _ran.append(value)
+
+
+@job('tests_fail', max_attempts=2)
+def _fail():
+    raise RuntimeError('boom')
+
+
+# --- BACKGROUND JOB QUEUE (jobs.py) ---
+
+@override_settings(JOBS_RUN_INLINE=False)
+class JobQueueTests(TestCase):
+
+    def setUp(self):
+        _ran.clear()
+
+    def test_enqueue_waits_for_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue('tests_record', value=1)
+            self.assertFalse(Job.objects.exists())
+        self.assertEqual(Job.objects.get().payload, {'value': 1})
+
+    def test_enqueue_dropped_on_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    enqueue('tests_record', value=1)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(JOBS_RUN_INLINE=True)
+    def test_inline_runs_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue('tests_record', value=2)
+            self.assertEqual(_ran, [])
+        self.assertEqual(_ran, [2])
+        self.assertFalse(Job.objects.exists())
+
+    def test_claim_is_exclusive(self):
+        jobs = [Job.objects.create(name='tests_record', payload={'value': i}) for i in range(3)]
+        first = claim_jobs(10)
+        self.assertEqual(first, [j.id for j in jobs])
+        self.assertEqual(claim_jobs(10), [])
+        self.assertEqual(set(Job.objects.values_list('status', 'attempts')), {(Job.RUNNING, 1)})
+
+    def test_claim_skips_future_jobs(self):
+        Job.objects.create(name='tests_record', payload={'value': 1}, run_at=timezone.now() + timedelta(minutes=1))
+        self.assertEqual(claim_jobs(10), [])
+
+    def test_success_deletes_row(self):
+        j = Job.objects.create(name='tests_record', payload={'value': 3})
+        self.assertTrue(run_job(claim_jobs(1)[0]))
+        self.assertEqual(_ran, [3])
+        self.assertFalse(Job.objects.filter(id=j.id).exists())
+
+    def test_failure_backs_off_then_fails(self):
+        j = Job.objects.create(name='tests_fail', max_attempts=2)
+        before = timezone.now()
+        self.assertFalse(run_job(claim_jobs(1)[0]))
+        j.refresh_from_db()
+        self.assertEqual(j.status, Job.PENDING)
+        self.assertGreaterEqual(j.run_at, before + timedelta(seconds=RETRY_BASE_SECONDS))
+        self.assertIn('boom', j.last_error)
+        self.assertEqual(claim_jobs(1), [])
+
+        Job.objects.filter(id=j.id).update(run_at=timezone.now())
+        self.assertFalse(run_job(claim_jobs(1)[0]))
+        j.refresh_from_db()
+        self.assertEqual((j.status, j.attempts), (Job.FAILED, 2))
+        self.assertEqual(claim_jobs(1), [])
+
+    def test_expired_lease_is_reclaimed(self):
+        now = timezone.now()
+        live = Job.objects.create(name='tests_record', payload={'value': 1}, status=Job.RUNNING, locked_at=now, attempts=1)
+        stale = Job.objects.create(
+            name='tests_record', payload={'value': 2}, status=Job.RUNNING,
+            locked_at=now - JOB_LEASE - timedelta(seconds=1), attempts=1
+        )
+        self.assertEqual(claim_jobs(10), [stale.id])
+        stale.refresh_from_db()
+        self.assertEqual(stale.attempts, 2)
+        self.assertEqual(Job.objects.get(id=live.id).attempts, 1)
+
+
+# --- KEYSET PAGINATION (pagination.py) ---
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='x')
+        self.posts = [Post.objects.create(author=self.user, content=str(i)) for i in range(7)]
+        # created_at တူတဲ့ row များကို id နဲ့ ခွဲရမည်
+        Post.objects.filter(id__in=[p.id for p in self.posts[2:5]]).update(created_at=self.posts[2].created_at)
+
+    def test_cursor_round_trip_visits_every_row_once(self):
+        expected = list(Post.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        seen, cursor = [], None
+        while True:
+            items, cursor = keyset_page(Post.objects.all(), cursor, page_size=2)
+            seen += [p.id for p in items]
+            if cursor is None:
+                break
+        self.assertEqual(seen, expected)
+
+    def test_oldest_first(self):
+        first, cursor = keyset_page(Post.objects.all(), page_size=4, newest_first=False)
+        rest, _ = keyset_page(Post.objects.all(), cursor, page_size=4, newest_first=False)
+        expected = list(Post.objects.order_by('created_at', 'id').values_list('id', flat=True))
+        self.assertEqual([p.id for p in first + rest], expected)
+
+    def test_cursor_decodes_to_same_position(self):
+        post = Post.objects.order_by('-created_at', '-id')[2]
+        items, _ = keyset_page(Post.objects.all(), encode_cursor(post), page_size=1)
+        self.assertEqual(items, [Post.objects.order_by('-created_at', '-id')[3]])
+
+    def test_bad_cursor(self):
+        for token in ('garbage', 'WzEsMl0', 'bnVsbA'):
+            with self.assertRaises(InvalidCursor):
+                keyset_page(Post.objects.all(), token)
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('feed_page'), {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['status'], 'error')
+
+
+# --- POST CARD CACHE (post_cards.py) ---
+
+class PostCardTests(TestCase):
+
+    def setUp(self):
+        self.author = User.objects.create_user('author', password='x')
+        self.viewer = User.objects.create_user('viewer', password='x')
+        self.post = Post.objects.create(author=self.author, content='hello')
+        self.post.likes.add(self.viewer)
+
+    def _feed_html(self, user):
+        self.client.force_login(user)
+        response = self.client.get(reverse('feed_page'))
+        self.assertEqual(response.status_code, 200)
+        return response.json()['html']
+
+    def test_cached_card_is_personalized_per_viewer(self):
+        delete_url = reverse('delete_post', args=[self.post.id])
+        as_viewer = self._feed_html(self.viewer)
+        as_author = self._feed_html(self.author)
+
+        self.assertIn('bi-heart-fill text-danger', as_viewer)
+        self.assertNotIn(delete_url, as_viewer)
+        self.assertNotIn('bi-heart-fill', as_author)
+        self.assertIn(delete_url, as_author)
+        for html in (as_viewer, as_author):
+            self.assertNotIn('<!--liked', html)
+            self.assertNotIn('<!--owner', html)
+            self.assertNotIn('<!--ts', html)
+
+    def test_like_refreshes_cached_card(self):
+        self._feed_html(self.author)
+        self.client.force_login(self.author)
+        self.client.post(reverse('like_post', args=[self.post.id]))
+        self.assertIn('bi-heart-fill text-danger', self._feed_html(self.author))
+
+
+# --- NOTIFICATION GROUPS (models.Notification) ---
+
+@override_settings(JOBS_RUN_INLINE=True)
+class NotificationCoalescingTests(TestCase):
+
+    def setUp(self):
+        self.author = User.objects.create_user('author', password='x')
+        self.post = Post.objects.create(author=self.author, content='hello')
+
+    def _like(self, user):
+        self.client.force_login(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('like_post', args=[self.post.id]))
+
+    def test_likes_share_one_row(self):
+        likers = [User.objects.create_user(name, password='x') for name in ('ann', 'bob', 'cat')]
+        for user in likers:
+            self._like(user)
+
+        notif = Notification.objects.get(recipient=self.author)
+        self.assertEqual((notif.notification_type, notif.post_id), ('Like', self.post.id))
+        self.assertEqual((notif.sender, notif.previous_sender, notif.actor_count), (likers[2], likers[1], 3))
+        self.assertEqual(notif.content, 'cat, bob and 1 other liked your post.')
+        self.assertFalse(notif.is_seen)
+
+    def test_relike_does_not_inflate_count(self):
+        bob = User.objects.create_user('bob', password='x')
+        self._like(bob)
+        self._like(bob)  # unlike
+        self._like(bob)
+        notif = Notification.objects.get(recipient=self.author)
+        self.assertEqual((notif.actor_count, notif.content), (1, 'bob liked your post.'))
+
+    def test_own_like_is_silent(self):
+        self._like(self.author)
+        self.assertFalse(Notification.objects.exists())
+
+
+# --- THUTALKBOT (bots.py) ---
+
+class KeywordMatcherTests(TestCase):
+
+    @staticmethod
+    def _naive(keywords, text):
+        return next((i for i, word in enumerate(keywords) if word and word in text), None)
+
+    def test_matches_naive_scan(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            keywords = [''.join(rng.choice('abc') for _ in range(rng.randint(0, 4))) for _ in range(rng.randint(1, 8))]
+            matcher = KeywordMatcher(keywords)
+            for _ in range(10):
+                text = ''.join(rng.choice('abcd') for _ in range(rng.randint(0, 12)))
+                self.assertEqual(matcher.first_match(text), self._naive(keywords, text), (keywords, text))
+
+    def test_unicode_keywords(self):
+        keywords = ['မင်္ဂလာ', 'ကျေးဇူး', 'hello']
+        matcher = KeywordMatcher(keywords)
+        for text in ('ကျေးဇူးပါ မင်္ဂလာပါ', 'say hello', 'ဘာမှမဟုတ်'):
+            self.assertEqual(matcher.first_match(text), self._naive(keywords, text))
+
+
+# --- BLOCKING (relationships.py) ---
+
+class BlockEnforcementTests(TestCase):
+
+    def setUp(self):
+        self.alice = User.objects.create_user('alice', password='x')
+        self.bob = User.objects.create_user('bob', password='x')
+        self.client.force_login(self.alice)
+
+    def _send(self):
+        return self.client.post(reverse('send_message', args=['bob']), {'content': 'hi'})
+
+    def test_send_allowed(self):
+        self.assertEqual(self._send().status_code, 200)
+        self.assertEqual(Message.objects.count(), 1)
+
+    def test_blocked_either_way(self):
+        for blocker, blocked in ((self.alice, self.bob), (self.bob, self.alice)):
+            BlockedUser.objects.all().delete()
+            BlockedUser.objects.create(blocker=blocker, blocked=blocked)
+            self.assertEqual(self._send().status_code, 403)
+        self.assertFalse(Message.objects.exists())
+
+    def test_stale_cached_block_state_does_not_allow_send(self):
+        block_state(self.alice.id)
+        block_state(self.bob.id)
+        # invalidate_block_state() မခေါ်ဘဲ (တခြား process က Block လုပ်သလို) row ထည့်သည်
+        BlockedUser.objects.create(blocker=self.bob, blocked=self.alice)
+        self.assertEqual(self._send().status_code, 403)
+        self.assertFalse(Message.objects.exists())
+
+
+# --- PEOPLE YOU MAY KNOW (suggestions.py) ---
+
+class FriendGraphTests(TestCase):
+
+    def test_suggest_ranks_by_mutual_friends(self):
+        friends = [(1, 2), (1, 3), (2, 4), (3, 4), (2, 5), (3, 6), (6, 7)]
+        graph = FriendGraph([1, 2, 3, 4, 5, 6, 7], friends, [])
+        owners, suggested, mutual = graph.suggest(np.arange(len(graph)))
+        result = {}
+        for owner, user, count in zip(owners.tolist(), suggested.tolist(), mutual.tolist()):
+            result.setdefault(owner, []).append((user, count))
+
+        self.assertEqual(result[1], [(4, 2), (5, 1), (6, 1)])
+        self.assertEqual(result[7], [(3, 1)])
+        for owner, rows in result.items():
+            friend_ids = {b if a == owner else a for a, b in friends if owner in (a, b)}
+            self.assertFalse({user for user, _ in rows} & (friend_ids | {owner}))
+
+    def test_excluded_pairs_and_top_k(self):
+        graph = FriendGraph([1, 2, 3, 4, 5], [(1, 2), (2, 3), (2, 4), (2, 5)], [(5, 1)])
+        owners, suggested, mutual = graph.suggest(np.array([0]), top_k=1)
+        self.assertEqual((owners.tolist(), suggested.tolist(), mutual.tolist()), ([1], [3], [1]))
+        _, suggested, _ = graph.suggest(np.array([0]))
+        self.assertEqual(suggested.tolist(), [3, 4])
+
+    def test_unknown_users_are_ignored(self):
+        graph = FriendGraph([1, 2, 3], [(1, 2), (2, 3), (3, 99)], [(1, 42)])
+        owners, suggested, _ = graph.suggest(np.array([0]))
+        self.assertEqual((owners.tolist(), suggested.tolist()), ([1], [3]))
+
+
+# --- CHAT SYNC (views._sync_messages) ---
+
+class ChatSyncTests(TestCase):
+
+    def setUp(self):
+        self.alice = User.objects.create_user('alice', password='x')
+        self.bob = User.objects.create_user('bob', password='x')
+        Message.objects.bulk_create([
+            Message(sender=self.bob, receiver=self.alice, content=str(i)) for i in range(CHAT_SYNC_LIMIT + 50)
+        ])
+        self.client.force_login(self.alice)
+
+    def _sync(self, cursor=None):
+        response = self.client.get(reverse('get_messages', args=['bob']), {'cursor': cursor} if cursor else {})
+        self.assertEqual(response.status_code, 200, (cursor, response.content))
+        return response.json()
+
+    def test_bulk_edit_is_paged(self):
+        cursor = self._sync()['cursor']
+        Message.objects.update(updated_at=timezone.now())
+
+        seen, pages = [], 0
+        while True:
+            data = self._sync(cursor)
+            seen += [m['id'] for m in data['messages']]
+            cursor, pages = data['cursor'], pages + 1
+            if not data['has_more']:
+                break
+            self.assertLess(pages, 5)
+        self.assertEqual(sorted(seen), sorted(Message.objects.values_list('id', flat=True)))
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_new_messages_are_paged(self):
+        cursor = self._sync()['cursor']
+        Message.objects.bulk_create([
+            Message(sender=self.bob, receiver=self.alice, content='new') for _ in range(CHAT_SYNC_LIMIT + 1)
+        ])
+        first = self._sync(cursor)
+        self.assertTrue(first['has_more'])
+
+        # Overlap window ထဲက row တွေ ပြန်ပါနိုင်ပေမယ့် cursor က ရှေ့ဆက်တိုးပြီး ဆုံးရမည်
+        seen, data = {m['id'] for m in first['messages']}, first
+        for _ in range(5):
+            data = self._sync(data['cursor'])
+            seen |= {m['id'] for m in data['messages']}
+            if not data['has_more']:
+                break
+        self.assertFalse(data['has_more'])
+        self.assertTrue(set(Message.objects.filter(content='new').values_list('id', flat=True)) <= seen)
+
+    def test_expired_cursor(self):
+        old = timezone.now() - DeletedMessage.RETENTION - timedelta(days=1)
+        cursor = f"1:{int(old.timestamp() * 1000000)}:0"
+        response = self.client.get(reverse('get_messages', args=['bob']), {'cursor': cursor})
+        self.assertEqual(response.status_code, 400)
+
+    def test_prune_deleted_messages(self):
+        keep = DeletedMessage.objects.create(message_id=1, sender=self.alice, receiver=self.bob)
+        old = DeletedMessage.objects.create(message_id=2, sender=self.alice, receiver=self.bob)
+        DeletedMessage.objects.filter(id=old.id).update(deleted_at=timezone.now() - DeletedMessage.RETENTION - timedelta(hours=1))
+        call_command('prune_deleted_messages', stdout=StringIO())
+        self.assertEqual(list(DeletedMessage.objects.values_list('id', flat=True)), [keep.id])
+
+
+# --- LIKE COUNTER (models.Post.like_count) ---
+
+class LikeCountTests(TestCase):
+
+    def setUp(self):
+        self.author = User.objects.create_user('author', password='x')
+        self.fans = [User.objects.create_user(f'fan{i}', password='x') for i in range(3)]
+        self.post = Post.objects.create(author=self.author, content='hello')
+
+    def _count(self):
+        self.post.refresh_from_db(fields=['like_count'])
+        return self.post.like_count
+
+    def test_toggle_like(self):
+        self.assertTrue(self.post.toggle_like(self.fans[0]))
+        self.assertEqual(self.post.like_count, 1)
+        self.assertFalse(self.post.toggle_like(self.fans[0]))
+        self.assertEqual(self.post.like_count, 0)
+
+    def test_add_remove_and_clear(self):
+        self.post.likes.add(*self.fans)
+        self.post.likes.add(self.fans[0])
+        self.assertEqual(self._count(), 3)
+        self.post.likes.remove(self.fans[0])
+        self.assertEqual(self._count(), 2)
+        self.post.likes.clear()
+        self.assertEqual(self._count(), 0)
+
+    def test_reverse_add_and_user_deletion(self):
+        for fan in self.fans:
+            fan.post_likes.add(self.post)
+        self.assertEqual(self._count(), 3)
+        self.fans[1].delete()
+        self.assertEqual(self._count(), 2)
+        self.assertEqual(self._count(), self.post.likes.count())
+
+
+# --- AUTOCOMPLETE (autocomplete.py) ---
+
+class AutocompleteTests(TestCase):
+
+    def setUp(self):
+        self.viewer = User.objects.create_user('viewer', password='x')
+        ensure_index()
+
+    def _usernames(self, prefix):
+        return [row['username'] for row in autocomplete(prefix, self.viewer.id)]
+
+    def test_rolled_back_signup_stays_out_of_index(self):
+        try:
+            with transaction.atomic():
+                User.objects.create_user('ghost', password='x')
+                raise RuntimeError('rollback')
+        except RuntimeError:
+            pass
+        self.assertEqual(self._usernames('ghost'), [])
+
+    def test_committed_signup_is_indexed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user('walker', password='x')
+        self.assertEqual(self._usernames('walk'), ['walker'])
+
+
+# --- SERVER-SENT EVENTS (views.event_stream) ---
+
+class EventStreamTests(TestCase):
+
+    def setUp(self):
+        self.alice = User.objects.create_user('alice', password='x')
+        self.bob = User.objects.create_user('bob', password='x')
+
+    async def test_blocked_chat_is_refused(self):
+        await BlockedUser.objects.acreate(blocker=self.bob, blocked=self.alice)
+        await self.async_client.aforce_login(self.alice)
+        response = await self.async_client.get(reverse('event_stream'), {'chat': 'bob'})
+        self.assertEqual(response.status_code, 403)
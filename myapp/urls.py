@@ -12,10 +12,13 @@ urlpatterns = [
 
     # --- Core & Notifications ---
     path('', views.home, name='home'),
+    path('api/feed/', views.feed_page, name='feed_page'),
     path('search/', views.search_page, name='search_page'),
+    path('api/autocomplete/', views.autocomplete_users, name='autocomplete_users'),
     path('notifications/', views.notifications, name='notifications'),
     path('notifications/mark-all-read/', views.mark_all_notifications_read, name='mark_all_notifications_read'),
     path('get_unread_count/', views.get_unread_count, name='get_unread_count'),
+    path('api/events/', views.event_stream, name='event_stream'),
 
     # --- Posts & Real-time Interaction (AJAX) ---
     path('post/add/', views.add_post, name='add_post'),
@@ -24,6 +27,7 @@ urlpatterns = [
     path('like/<int:pk>/', views.like_post, name='like_post'),
     path('add_comment/<int:post_id>/', views.add_comment, name='add_comment'),
     path('comment/delete/<int:comment_id>/', views.delete_comment, name='delete_comment'),
+    path('api/comments/<int:post_id>/', views.comment_thread, name='comment_thread'),
 
     # --- Story System ---
     path('story/add/', views.add_story, name='add_story'),
@@ -33,6 +37,7 @@ urlpatterns = [
     path('profile/edit/', views.edit_profile_view, name='edit_profile'),
     path('profile/<str:username>/', views.profile_view, name='profile_view'),
     path('profile/<str:username>/friends/', views.all_friends_view, name='all_friends_view'),
+    path('profile/<str:username>/posts/', views.profile_posts_page, name='profile_posts_page'),
     path('block/<int:user_id>/', views.block_user, name='block_user'),
     path('unblock/<int:user_id>/', views.unblock_user, name='unblock_user'),
     path('unfriend/<int:user_id>/', views.unfriend_user, name='unfriend_user'),
@@ -43,6 +48,8 @@ urlpatterns = [
     path('friend/accept/<int:request_id>/', views.accept_friend, name='accept_friend'),
     path('friend/delete/<int:request_id>/', views.delete_request, name='delete_request'),
     path('friend/cancel/<int:user_id>/', views.cancel_friend_request, name='cancel_friend_request'),
+    path('api/friend-suggestions/', views.friend_suggestions, name='friend_suggestions'),
+    path('api/relationships/', views.relationships_api, name='relationships_api'),
 
     # --- Chat System & APIs ---
     path('chats/', views.chat_list, name='chat_list'),
@@ -65,6 +72,7 @@ urlpatterns = [
     path('admin/ban-user/<int:user_id>/', views.ban_user, name='ban_user'),
     path('admin/change-role/<int:user_id>/', views.change_user_role, name='change_user_role'),
     path('official-broadcast/', views.admin_broadcast_view, name='admin_broadcast'),
+    path('api/cache/post-cards/', views.post_card_cache_stats, name='post_card_cache_stats'),
 ]
 
 # Media & Static Files handling
@@ -0,0 +1,147 @@
+from itertools import product
+
+from django.db import connection
+from django.db.models import Q
+
+# --- USER SEARCH INDEX (SQLite FTS5 trigram) ---
+# Username, Talk ID, Bio ကို FTS5 trigram table (rowid = User id) ထဲမှာ index လုပ်ထားလို့ စာလုံး ၃ လုံးနဲ့အထက်
+# query တွေက substring match ကို index ကနေ ရှာပါတယ်။ Exact > Prefix > bm25 (Username/Talk ID က Bio ထက် အလေးပို) နဲ့ rank လုပ်ပါတယ်။
+# ၁-၂ လုံးဆိုရင် trigram မရလို့ auth_user.username / Profile.talk_id ရဲ့ unique index ပေါ်မှာ prefix range နဲ့ ရှာပါတယ်။
+# Profile save/delete ကို models.py signal က sync လုပ်ပါတယ်။
+
+FTS_TABLE = 'myapp_user_fts'
+USER_SEARCH_PAGE_SIZE = 20
+MAX_USER_SEARCH_PAGE = 50
+MIN_TRIGRAM_LENGTH = 3
+
+CREATE_FTS_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "username, talk_id, bio, tokenize='trigram')"
+)
+DROP_FTS_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+
+# Prefix range ရဲ့ အဆုံး (UTF-8 မှာ အကြီးဆုံး code point)
+_MAX_CHAR = '\U0010ffff'
+
+
+def fts_enabled(conn=None):
+    return (conn or connection).vendor == 'sqlite'
+
+
+def _rows(profiles):
+    return [(p.user_id, p.user.username, p.talk_id or '', p.bio or '') for p in profiles]
+
+
+def index_profiles(profiles, conn=None):
+    """ Profile (user ပါ select_related လုပ်ထားတာ) များကို index ထဲ ထည့်/အစားထိုး သည် """
+    conn = conn or connection
+    if not fts_enabled(conn):
+        return
+    profiles = list(profiles)
+    with conn.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(p.user_id,) for p in profiles])
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, username, talk_id, bio) VALUES (%s, %s, %s, %s)",
+            _rows(profiles)
+        )
+
+
+def unindex_user(user_id):
+    if fts_enabled():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [user_id])
+
+
+def rebuild_index(profile_model, conn=None, batch_size=1000):
+    """ FTS table ကို Profile table ကနေ အသစ်ပြန်ဆောက်သည် (migration ကလည်း သုံးသည်) """
+    conn = conn or connection
+    if not fts_enabled(conn):
+        return 0
+    with conn.cursor() as cursor:
+        cursor.execute(DROP_FTS_SQL)
+        cursor.execute(CREATE_FTS_SQL)
+
+    count, last_id = 0, 0
+    queryset = profile_model.objects.select_related('user').only(
+        'id', 'user_id', 'user__username', 'talk_id', 'bio'
+    ).order_by('id')
+    while True:
+        batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        with conn.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, username, talk_id, bio) VALUES (%s, %s, %s, %s)",
+                _rows(batch)
+            )
+        count += len(batch)
+        last_id = batch[-1].id
+    return count
+
+
+def _like_prefix(text):
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def _case_variants(prefix):
+    """ "ab" -> ab, aB, Ab, AB (unique index က case-sensitive ဖြစ်လို့) """
+    return {''.join(chars) for chars in product(*({c.lower(), c.upper()} for c in prefix))}
+
+
+def _search_trigram(words, query, exclude_id, limit, offset):
+    match = ' AND '.join('"{}"'.format(w.replace('"', '""')) for w in words)
+    prefix = _like_prefix(query)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid != %s "
+            "ORDER BY CASE WHEN lower(username) = lower(%s) OR lower(talk_id) = lower(%s) THEN 0 "
+            "WHEN username LIKE %s ESCAPE '\\' OR talk_id LIKE %s ESCAPE '\\' THEN 1 ELSE 2 END, "
+            f"bm25({FTS_TABLE}, 10.0, 10.0, 1.0), rowid "
+            "LIMIT %s OFFSET %s",
+            [match, exclude_id, query, query, prefix, prefix, limit, offset]
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _search_prefix(prefix, exclude_id, limit, offset):
+    # models.py က ဒီ module ကို import လုပ်လို့ ဒီမှာ import လုပ်ရသည်
+    from django.contrib.auth.models import User
+    from .models import Profile
+
+    # Case variant တစ်ခုချင်းစီက index range တစ်ခု - OR လုပ်ထားလို့ table တစ်ခုကို query တစ်ခုပဲ
+    username_q, talk_id_q = Q(), Q()
+    for variant in _case_variants(prefix):
+        username_q |= Q(username__gte=variant, username__lt=variant + _MAX_CHAR)
+        talk_id_q |= Q(talk_id__gte=variant, talk_id__lt=variant + _MAX_CHAR)
+    matches = dict(
+        User.objects.filter(username_q).exclude(id=exclude_id).order_by('username')
+        .values_list('id', 'username')[:limit + offset]
+    )
+    talk_ids = Profile.objects.filter(talk_id_q).exclude(user_id=exclude_id).order_by('talk_id').values_list(
+        'user_id', 'talk_id'
+    )[:limit + offset]
+    for user_id, talk_id in talk_ids:
+        matches.setdefault(user_id, talk_id)
+    ordered = sorted(matches, key=lambda uid: (matches[uid].lower() != prefix.lower(), matches[uid].lower(), uid))
+    return ordered[offset:offset + limit]
+
+
+def search_users(query, exclude_id, page=1, page_size=USER_SEARCH_PAGE_SIZE):
+    """
+    Rank လုပ်ထားတဲ့ User id များကို page လိုက် ပြန်ပေးသည်။
+    Returns (user_ids, has_more). SQLite မဟုတ်ရင် None ပြန်ပြီး caller က fallback သုံးရပါမယ်။
+    """
+    if not fts_enabled():
+        return None
+    query = query.strip()
+    if not query:
+        return [], False
+
+    page = max(1, min(page, MAX_USER_SEARCH_PAGE))
+    offset = (page - 1) * page_size
+    words = [w for w in query.split() if len(w) >= MIN_TRIGRAM_LENGTH]
+    if words:
+        ids = _search_trigram(words, query, exclude_id, page_size + 1, offset)
+    else:
+        ids = _search_prefix(query.split()[0], exclude_id, page_size + 1, offset)
+    return ids[:page_size], len(ids) > page_size
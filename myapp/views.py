@@ -1,66 +1,42 @@
+import asyncio
 import json
-import random
+import time
 import uuid
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
 
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, logout, authenticate, update_session_auth_hash
 from django.contrib.auth.forms import AuthenticationForm, PasswordChangeForm
 from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
+from django.views.decorators.http import condition
 from django.contrib.auth.models import User
-from django.db.models import Q, Max, Count
-from django.http import JsonResponse
+from django.db.models import Q, Max, Count, Exists, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
 from django.utils import timezone
+from django.utils.timesince import timesince
 from django.contrib import messages
 from django.contrib.humanize.templatetags.humanize import naturaltime
 
-from .models import Profile, Post, Comment, Message, Notification, FriendRequest, Story, BlockedUser, AdminBroadcast
+from .models import Profile, Post, Comment, Message, DeletedMessage, Conversation, Notification, FriendRequest, Story, BlockedUser, AdminBroadcast, Friendship, FriendSuggestion
 from .forms import RegisterForm, PostForm, CommentForm, ProfileUpdateForm, UserUpdateForm
-
-# --- BOT SETUP & LOGIC ---
-
-def setup_bots():
-    """
-    ThuTalkBot (Official Bot) တစ်ကောင်တည်းကိုပဲ Setup လုပ်ပေးပါမယ်။
-    """
-    bot, created = User.objects.get_or_create(username='ThuTalkBot')
-    profile, _ = Profile.objects.get_or_create(user=bot)
-
-    # Bot ရဲ့ Talk ID နဲ့ Role ကို သတ်မှတ်ပေးခြင်း (မရှိသေးရင်)
-    if not profile.talk_id or profile.talk_id != 'thutalk-01':
-        profile.talk_id = 'thutalk-01'
-        profile.role = 'Official'
-        profile.bio = "ThuTalk Official Broadcast Bot & Assistant 📢🤖"
-        profile.save()
-
-def bot_auto_reply(user):
-    """ User အသစ် Register လုပ်လျှင် ThuTalkBot မှ နှုတ်ဆက်စာပို့ရန် """
-    setup_bots()
-    try:
-        chat_bot = User.objects.get(username='ThuTalkBot')
-        welcome_msg = f"Hello {user.username}! ✨ ThuTalk ကနေ နွေးထွေးစွာ ကြိုဆိုပါတယ်။ ကျွန်တော်ကတော့ သင်တစ်ယောက်တည်း မဟုတ်အောင် အမြဲရှိနေပေးမယ့် အဖော်မွန်ပါ။ စကားတွေ အများကြီး ပြောကြရအောင်နော်!"
-        if not Message.objects.filter(sender=chat_bot, receiver=user).exists():
-            Message.objects.create(sender=chat_bot, receiver=user, content=welcome_msg)
-    except User.DoesNotExist:
-        pass
-
-def get_bot_response(user_content):
-    """ Keyword based logic for ThuTalkBot """
-    content = user_content.lower()
-    responses = {
-        "ပင်ပန်း": ["ဒီနေ့အတွက် တကယ်တော်ခဲ့ပါတယ်နော်။ ❤️", "ပင်ပန်းနေပြီလား? ခဏလောက် နားလိုက်ပါဦး။"],
-        "နေမကောင်း": ["ဟာ... ဂရုစိုက်ပါဦး။ ဆေးသောက်ပြီးပြီလား? 💊", "အားရှိအောင် စားပြီး အိပ်ရေးဝဝအိပ်နော်။"],
-        "ဝမ်းနည်း": ["ဘာတွေဖြစ်လို့လဲ? စိတ်မကောင်းမဖြစ်ပါနဲ့နော်။ ကျွန်တော် ဒီမှာ ရှိနေပေးပါတယ်။ 🫂"],
-        "မင်္ဂလာပါ": ["မင်္ဂလာပါဗျာ! ဒီနေ့လေးက သင့်အတွက် ပျော်စရာတွေပဲ ယူဆောင်လာပါစေ။ ✨", "Hi! စကားလာပြောတာ ဝမ်းသာပါတယ်ခင်ဗျ။"],
-        "ကျေးဇူး": ["မလိုပါဘူးဗျာ၊ ကူညီပေးနိုင်တာ ကျွန်တော့်အတွက် ဝမ်းသာစရာပါ။ 😊"],
-        "အိပ်တော့": ["ဟုတ်ကဲ့ပါ... မင်းလည်း စောစောအိပ်နော်။ အိပ်မက်လှလှမက်ပါစေ။ ✨", "Good night ပါဗျာ။ 🌙"],
-        "နေကောင်းလား": ["ကျွန်တော် နေကောင်းပါတယ်ဗျာ။ မေးပေးလို့ ကျေးဇူးအများကြီးတင်ပါတယ်။ ❤️"]
-    }
-    for key, value in responses.items():
-        if key in content:
-            return random.choice(value)
-    return "နားထောင်ပေးနေပါတယ်ဗျာ။ စိတ်ထဲရှိတာတွေ အကုန်ပြောပြလို့ရတယ်။ ✨"
+from .pagination import keyset_page, encode_cursor, InvalidCursor
+from .post_cards import render_post_cards, invalidate_post_card, card_cache_stats
+from .relationships import block_state, hidden_user_ids, is_hidden, is_blocked_between, invalidate_block_state, relationship_flags
+from .events import touch, stamp, astamp, record_last_seen, presence
+from .badges import badge_counts, reset_badges
+from .message_search import search_conversation, SEARCH_PAGE_SIZE, MAX_SEARCH_PAGE
+from .broadcasts import deliver_broadcasts, latest_broadcast_id
+from .jobs import enqueue
+from .bots import BOT_USERNAME
+from .user_search import search_users, USER_SEARCH_PAGE_SIZE, MAX_USER_SEARCH_PAGE
+from .autocomplete import autocomplete
+from .friends import friends_queryset, friends_page, mutual_friend_counts
+from .suggestions import SUGGESTION_TOP_K
 
 # --- AUTHENTICATION ---
 
@@ -71,7 +47,7 @@ def register_view(request):
         form = RegisterForm(request.POST)
         if form.is_valid():
             user = form.save()
-            bot_auto_reply(user)
+            enqueue('welcome_message', user_id=user.id)
             login(request, user)
             messages.success(request, f"Welcome {user.username}!")
             return redirect('home')
@@ -108,19 +84,58 @@ def logout_view(request):
 
 # --- CORE (HOME & FEED) ---
 
+def _with_liked_by_viewer(posts, viewer):
+    """ Heart icon အတွက် liker list တစ်ခုလုံးမယူဘဲ EXISTS subquery တစ်ခုတည်းနဲ့ စစ်သည် """
+    return posts.annotate(liked_by_viewer=Exists(
+        Post.likes.through.objects.filter(post_id=OuterRef('pk'), user_id=viewer.pk)
+    ))
+
+# Post card တစ်ခုမှာ နောက်ဆုံး Comment ဘယ်နှခုပြမလဲ (ကျန်တာကို comment_thread API က လိုမှယူမည်)
+COMMENT_PREVIEW_SIZE = 3
+COMMENT_PAGE_SIZE = 20
+
+def _comment_queryset():
+    replies = Comment.objects.filter(parent=OuterRef('pk')).values('parent').annotate(n=Count('pk')).values('n')
+    return Comment.objects.select_related('user', 'user__profile').annotate(
+        reply_count=Coalesce(Subquery(replies), 0)
+    )
+
+def _with_comment_previews(posts):
+    """ Page ထဲက Post အားလုံးရဲ့ နောက်ဆုံး top-level Comment များကို windowed query တစ်ခုတည်းနဲ့ ယူသည် """
+    return posts.prefetch_related(Prefetch(
+        'comments',
+        queryset=_comment_queryset().filter(parent__isnull=True).order_by('-created_at', '-id')[:COMMENT_PREVIEW_SIZE + 1],
+        to_attr='preview_comments'
+    ))
+
+def _attach_comment_cursors(posts):
+    for post in posts:
+        previews = post.preview_comments
+        post.earlier_comments_cursor = None
+        if len(previews) > COMMENT_PREVIEW_SIZE:
+            previews.pop()
+            post.earlier_comments_cursor = encode_cursor(previews[-1])
+        previews.reverse()  # အဟောင်း -> အသစ် အစဉ်ဖြင့် ပြရန်
+    return posts
+
+def _feed_queryset(viewer, all_blocked_ids):
+    posts = Post.objects.exclude(
+        author_id__in=all_blocked_ids
+    ).select_related('author', 'author__profile')
+    return _with_comment_previews(_with_liked_by_viewer(posts, viewer))
+
 @login_required(login_url='login')
 def home(request):
     profile, _ = Profile.objects.get_or_create(user=request.user)
     profile.last_seen = timezone.now()
     profile.save(update_fields=['last_seen'])
+    record_last_seen(request.user.username, profile.last_seen)
 
     if profile.is_banned and not profile.has_ban_expired():
         logout(request)
         return redirect('login')
 
-    blocked_ids = BlockedUser.objects.filter(blocker=request.user).values_list('blocked', flat=True)
-    blocking_me = BlockedUser.objects.filter(blocked=request.user).values_list('blocker', flat=True)
-    all_blocked_ids = list(blocked_ids) + list(blocking_me)
+    all_blocked_ids = hidden_user_ids(request.user.id)
 
     time_threshold = timezone.now() - timedelta(hours=24)
     stories = Story.objects.filter(
@@ -131,26 +146,41 @@ def home(request):
     for s in stories:
         stories_data.append({
             'id': s.id,
-            'image': s.image.url if s.image else '',
+            'image': s.image.full_url if s.image else '',
             'caption': s.caption or '',
             'username': s.user.username,
             'is_mine': s.user == request.user,
             'role': s.user.profile.role,
-            'user_avatar': s.user.profile.profile_pic.url if s.user.profile.profile_pic else '/static/default_profile.png',
+            'user_avatar': s.user.profile.profile_pic.avatar_url if s.user.profile.profile_pic else '/static/default_profile.png',
             'created_at': str(naturaltime(s.created_at))
         })
 
-    posts = Post.objects.exclude(
-        author_id__in=all_blocked_ids
-    ).select_related('author', 'author__profile').prefetch_related('likes', 'comments', 'comments__user').order_by('-created_at')
+    posts, next_cursor = keyset_page(_feed_queryset(request.user, all_blocked_ids))
+    _attach_comment_cursors(posts)
 
     return render(request, 'home.html', {
-        'posts': posts,
+        'cards': render_post_cards(posts, 'includes/feed_post.html', request.user),
+        'next_cursor': next_cursor,
         'stories': stories,
         'stories_json': json.dumps(stories_data),
         'user_profile': profile
     })
 
+@login_required
+def feed_page(request):
+    """ Infinite scroll အတွက် နောက် page ရဲ့ Post card HTML ကို ပြန်ပေးသည် """
+    try:
+        posts, next_cursor = keyset_page(
+            _feed_queryset(request.user, hidden_user_ids(request.user.id)), request.GET.get('cursor')
+        )
+    except InvalidCursor:
+        return JsonResponse({'status': 'error', 'message': 'Invalid cursor.'}, status=400)
+    _attach_comment_cursors(posts)
+
+    cards = render_post_cards(posts, 'includes/feed_post.html', request.user)
+    html = render_to_string('includes/feed_posts.html', {'cards': cards})
+    return JsonResponse({'status': 'success', 'html': html, 'next_cursor': next_cursor})
+
 # --- POSTS & COMMENTS ---
 
 @login_required
@@ -178,6 +208,7 @@ def edit_post(request, pk):
         if request.FILES.get('image'):
             post.image = request.FILES.get('image')
         post.save()
+        invalidate_post_card(post.id)
         messages.success(request, "Post updated!")
         return redirect('home')
     return render(request, 'edit_post.html', {'post': post})
@@ -186,6 +217,7 @@ def edit_post(request, pk):
 def delete_post(request, pk):
     post = get_object_or_404(Post, pk=pk)
     if post.author == request.user or request.user.is_staff:
+        invalidate_post_card(post.id)
         post.delete()
         if request.headers.get('x-requested-with') == 'XMLHttpRequest':
             return JsonResponse({'status': 'success'})
@@ -196,88 +228,150 @@ def delete_post(request, pk):
 def add_comment(request, post_id):
     post = get_object_or_404(Post, id=post_id)
     if request.method == "POST":
+        if is_blocked_between(request.user.id, post.author_id):
+            return JsonResponse({'status': 'error'}, status=403)
         content = request.POST.get('content')
         parent_id = request.POST.get('parent_id')
         if content:
             parent_obj = Comment.objects.filter(id=parent_id).first() if parent_id else None
             comment = Comment.objects.create(post=post, user=request.user, content=content, parent=parent_obj)
+            invalidate_post_card(post.id)
 
             if post.author != request.user:
-                Notification.objects.create(
-                    recipient=post.author, sender=request.user,
-                    notification_type='Comment', content=f"{request.user.username} commented on your post."
-                )
+                enqueue('post_activity_notification', post_id=post.id, sender_id=request.user.id, notification_type='Comment')
 
+            post.refresh_from_db(fields=['comment_count'])
             return JsonResponse({
                 'status': 'success', 'username': request.user.username,
                 'content': str(content), 'comment_id': comment.id,
-                'profile_pic': request.user.profile.profile_pic.url if request.user.profile.profile_pic else '/static/default_profile.png',
-                'comment_count': post.comments.count(),
+                'profile_pic': request.user.profile.profile_pic.avatar_url if request.user.profile.profile_pic else '/static/default_profile.png',
+                'comment_count': post.comment_count,
                 'parent_id': parent_id
             })
     return JsonResponse({'status': 'error'})
 
+@login_required
+def comment_thread(request, post_id):
+    """
+    Comment thread ကို page လိုက် ယူရန်။
+    parent_id မပါရင် top-level comment များ (အသစ် -> အဟောင်း), ပါရင် အဲ့ဒီ comment ရဲ့ reply များ (အဟောင်း -> အသစ်)
+    """
+    post = get_object_or_404(Post, id=post_id)
+    # Block ဆက်ဆံရေး ရှိရင် Feed မှာ မပြသလို ဒီမှာလည်း မရှိသလို ပြန်သည်
+    if is_hidden(request.user.id, post.author_id):
+        raise Http404
+    parent_id = request.GET.get('parent_id')
+    comments = _comment_queryset().filter(post=post)
+    if parent_id:
+        if not parent_id.isdigit():
+            return JsonResponse({'status': 'error'}, status=400)
+        comments = comments.filter(parent_id=parent_id)
+    else:
+        comments = comments.filter(parent__isnull=True)
+
+    try:
+        page, next_cursor = keyset_page(
+            comments, request.GET.get('cursor'), COMMENT_PAGE_SIZE, newest_first=not parent_id
+        )
+    except InvalidCursor:
+        return JsonResponse({'status': 'error', 'message': 'Invalid cursor.'}, status=400)
+
+    can_moderate = post.author_id == request.user.id or request.user.is_staff
+    comment_list = []
+    for c in page:
+        comment_list.append({
+            'id': c.id, 'parent_id': c.parent_id,
+            'username': c.user.username, 'content': str(c.content),
+            'profile_pic': c.user.profile.profile_pic.avatar_url if c.user.profile.profile_pic else '/static/default_profile.png',
+            'timesince': timesince(c.created_at),
+            'reply_count': c.reply_count,
+            'can_delete': can_moderate or c.user_id == request.user.id
+        })
+    return JsonResponse({'status': 'success', 'comments': comment_list, 'next_cursor': next_cursor})
+
 @login_required
 def delete_comment(request, comment_id):
     comment = get_object_or_404(Comment, id=comment_id)
     post = comment.post
     if comment.user == request.user or post.author == request.user or request.user.is_staff:
         comment.delete()
-        return JsonResponse({'status': 'success', 'comment_count': post.comments.count()})
+        invalidate_post_card(post.id)
+        post.refresh_from_db(fields=['comment_count'])
+        return JsonResponse({'status': 'success', 'comment_count': post.comment_count})
     return JsonResponse({'status': 'error'}, status=403)
 
 @login_required
 def like_post(request, pk):
     post = get_object_or_404(Post, pk=pk)
-    if request.user in post.likes.all():
-        post.likes.remove(request.user)
-        liked = False
-    else:
-        post.likes.add(request.user)
-        liked = True
-        if post.author != request.user:
-            Notification.objects.create(
-                recipient=post.author, sender=request.user,
-                notification_type='Like', content=f"{request.user.username} liked your post."
-            )
-    return JsonResponse({'liked': liked, 'like_count': post.likes.count()})
+    if is_blocked_between(request.user.id, post.author_id):
+        return JsonResponse({'status': 'error'}, status=403)
+    liked = post.toggle_like(request.user)
+    invalidate_post_card(post.id)
+    if liked and post.author != request.user:
+        enqueue('post_activity_notification', post_id=post.id, sender_id=request.user.id, notification_type='Like')
+    return JsonResponse({'liked': liked, 'like_count': post.like_count})
 
 # --- CHAT SYSTEM ---
 
+# --- CONDITIONAL GET (ETag) ---
+# Polling endpoint တွေက user ရဲ့ change stamp (events.py) ကိုပဲ ကြည့်ပြီး မပြောင်းရင် query/render မလုပ်ဘဲ 304 ပြန်သည်။
+# Stamp မပါတဲ့ အပြောင်းအလဲ (Online status, Profile ပုံ) တွေအတွက် ETAG_WINDOW တစ်ခါ full response ပြန်ပို့သည်။
+ETAG_WINDOW = 60
+
+def _stamp_etag(request, *parts):
+    if not request.user.is_authenticated:
+        return None
+    window = int(time.time() // ETAG_WINDOW)
+    # Broadcast အသစ်က user stamp ကို မပြောင်းလို့ (ဖတ်မှ ထည့်လို့) latest id ပါ ထည့်ထားသည်
+    return '-'.join(str(p) for p in (stamp(request.user.id), latest_broadcast_id(), window) + parts)
+
+def _badges_etag(request):
+    return _stamp_etag(request, 'badges')
+
+def _inbox_etag(request):
+    # Page အပြည့် ဖွင့်တာ (flash messages ပါနိုင်) မဟုတ်ဘဲ list refresh (XMLHttpRequest) ကိုပဲ
+    if request.headers.get('x-requested-with') != 'XMLHttpRequest':
+        return None
+    return _stamp_etag(request, 'inbox', request.GET.get('cursor', ''))
+
+def _sync_etag(request, username):
+    # Cursor sync ကိုပဲ - client က ETag နဲ့ cursor ကို response တစ်ခုတည်းကနေ ယူထားရပါမယ်
+    if not request.GET.get('cursor') or request.GET.get('before_id'):
+        return None
+    return _stamp_etag(request, 'sync', username)
+
+def _presence_etag(request, username):
+    state = presence(username)
+    return f'presence-{state}' if state else None
+
+INBOX_PAGE_SIZE = 30
+
 @login_required
+@condition(etag_func=_inbox_etag)
 def chat_list(request):
-    blocked_ids = BlockedUser.objects.filter(blocker=request.user).values_list('blocked', flat=True)
-    blocking_me = BlockedUser.objects.filter(blocked=request.user).values_list('blocker', flat=True)
-    all_blocked = list(blocked_ids) + list(blocking_me)
-
-    users = User.objects.filter(
-        Q(sent_messages__receiver=request.user) | Q(received_messages__sender=request.user)
-    ).distinct().exclude(id=request.user.id).exclude(id__in=all_blocked)
-
-    chat_data = []
-    for user in users:
-        Profile.objects.get_or_create(user=user)
-        last_msg = Message.objects.filter(
-            (Q(sender=request.user) & Q(receiver=user)) | (Q(sender=user) & Q(receiver=request.user))
-        ).order_by('-timestamp').first()
-        unread = Message.objects.filter(sender=user, receiver=request.user, is_read=False).count()
-        chat_data.append({
-            'user': user, 'last_message': last_msg,
-            'unread_count': unread, 'role': user.profile.role
-        })
+    deliver_broadcasts(request.user)
+    conversations = Conversation.objects.filter(
+        owner=request.user, last_message_at__isnull=False
+    ).exclude(partner_id__in=hidden_user_ids(request.user.id)).select_related('partner', 'partner__profile')
 
-    chat_data.sort(key=lambda x: x['last_message'].timestamp if x['last_message'] else timezone.now(), reverse=True)
-    return render(request, 'chat_list.html', {'chat_data': chat_data})
+    try:
+        page, next_cursor = keyset_page(conversations, request.GET.get('cursor'), INBOX_PAGE_SIZE, key='last_message_at')
+    except InvalidCursor:
+        page, next_cursor = keyset_page(conversations, None, INBOX_PAGE_SIZE, key='last_message_at')
+    return render(request, 'chat_list.html', {'conversations': page, 'next_cursor': next_cursor})
 
 @login_required
 def chat_room(request, username):
+    deliver_broadcasts(request.user)
     receiver = get_object_or_404(User, username=username)
     Profile.objects.get_or_create(user=receiver)
 
-    Message.objects.filter(sender=receiver, receiver=request.user, is_read=False).update(is_read=True)
+    if Conversation.mark_read(request.user, receiver):
+        touch(request.user.id, receiver.id)
 
-    is_blocked = BlockedUser.objects.filter(blocker=request.user, blocked=receiver).exists()
-    am_i_blocked = BlockedUser.objects.filter(blocker=receiver, blocked=request.user).exists()
+    blocking, blocked_by = block_state(request.user.id)
+    is_blocked = receiver.id in blocking
+    am_i_blocked = receiver.id in blocked_by
 
     return render(request, 'chat.html', {
         'receiver': receiver,
@@ -289,31 +383,48 @@ def chat_room(request, username):
 def chat_profile_view(request, username):
     viewed_user = get_object_or_404(User, username=username)
     Profile.objects.get_or_create(user=viewed_user)
-    return render(request, 'chat_profile.html', {'viewed_user': viewed_user})
+    return render(request, 'chat_profile.html', {
+        'viewed_user': viewed_user, **relationship_flags(request.user, [viewed_user.id])[viewed_user.id]
+    })
 
 @login_required
 def search_messages(request, username):
+    """ ?q=...&page=N - FTS index ကနေ relevance အလိုက် page လိုက် ရှာသည် """
     receiver = get_object_or_404(User, username=username)
-    query = request.GET.get('q', '')
-    messages_query = Message.objects.filter(
-        (Q(sender=request.user, receiver=receiver) | Q(sender=receiver, receiver=request.user)),
-        content__icontains=query
-    ).order_by('-timestamp')
-
+    query = request.GET.get('q', '').strip()
+    page = request.GET.get('page', '1')
+    page = int(page) if page.isdigit() else 1
+
+    if not query:
+        return JsonResponse({'results': [], 'page': page, 'has_more': False})
+
+    found = search_conversation(request.user.id, receiver.id, query, page)
+    if found is None:
+        # FTS မရှိတဲ့ database - substring search ကို page နဲ့ ကန့်သတ်ထားသည်
+        page = max(1, min(page, MAX_SEARCH_PAGE))
+        offset = (page - 1) * SEARCH_PAGE_SIZE
+        ids = list(_conversation(request.user, receiver).filter(
+            content__icontains=query
+        ).order_by('-id').values_list('id', flat=True)[offset:offset + SEARCH_PAGE_SIZE + 1])
+        found = (ids[:SEARCH_PAGE_SIZE], len(ids) > SEARCH_PAGE_SIZE)
+    ids, has_more = found
+
+    by_id = Message.objects.select_related('sender').in_bulk(ids)
     results = []
-    for m in messages_query:
+    for m in (by_id[i] for i in ids if i in by_id):
         results.append({
+            'id': m.id,
             'content': str(m.content),
             'sender': m.sender.username,
             'timestamp': m.timestamp.strftime('%I:%M %p')
         })
-    return JsonResponse({'results': results})
+    return JsonResponse({'results': results, 'page': page, 'has_more': has_more})
 
 @login_required
 def send_message(request, username):
     receiver = get_object_or_404(User, username=username)
 
-    if BlockedUser.objects.filter(Q(blocker=request.user, blocked=receiver) | Q(blocker=receiver, blocked=request.user)).exists():
+    if is_blocked_between(request.user.id, receiver.id):
         return JsonResponse({'status': 'error', 'message': 'Messaging blocked.'}, status=403)
 
     if request.method == "POST":
@@ -330,10 +441,9 @@ def send_message(request, username):
                 parent=parent_msg
             )
 
-            # Bot Reply Logic
-            if receiver.username == 'ThuTalkBot':
-                bot_reply_content = get_bot_response(content)
-                Message.objects.create(sender=receiver, receiver=request.user, content=bot_reply_content)
+            # Bot Reply Logic (worker က ပို့ပြီး chat sync နဲ့ ရောက်လာပါမယ်)
+            if receiver.username == BOT_USERNAME:
+                enqueue('bot_reply', user_id=request.user.id, content=content)
 
             return JsonResponse({
                 'status': 'success', 'id': message.id, 'content': str(message.content),
@@ -341,29 +451,135 @@ def send_message(request, username):
             })
     return JsonResponse({'status': 'error'}, status=400)
 
+# Chat sync: ပထမဆုံး load မှာ နောက်ဆုံး page တစ်ခုပဲ ယူပြီး နောက်ပိုင်း poll တွေမှာ cursor နဲ့ အသစ်/ပြောင်းထားတာပဲ ယူသည်
+CHAT_PAGE_SIZE = 50
+CHAT_SYNC_LIMIT = 200
+# updated_at ယူပြီးမှ commit ဖြစ်တဲ့ row တွေ မလွတ်သွားအောင် since ကို နည်းနည်း နောက်ဆုတ်ထားသည် (client က id နဲ့ dedupe လုပ်သည်)
+CHAT_SYNC_OVERLAP = timedelta(seconds=2)
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+def _conversation(user, other):
+    return Message.objects.filter(Q(sender=user, receiver=other) | Q(sender=other, receiver=user))
+
+def _message_json(m, watermarks):
+    return {
+        'id': m.id, 'sender': m.sender.username, 'content': str(m.content),
+        'image': m.image.feed_url if m.image else None,
+        'image_full': m.image.full_url if m.image else None,
+        'voice_note': m.voice_note.url if m.voice_note else None,
+        'timestamp': m.timestamp.strftime('%I:%M %p'), 'timestamp_iso': m.timestamp.isoformat(),
+        'is_read': m.id <= watermarks.get(m.receiver_id, 0),
+        'parent_content': str(m.parent.content) if m.parent else None
+    }
+
+# Cursor = "after_id:since:since_id" - after_id ထက်ကြီးတာက message အသစ်၊ (updated_at, id) > (since, since_id) က
+# ပြင်ထားတဲ့ message ဟောင်း။ since ကို microsecond အတိအကျ သိမ်းလို့ updated_at တူတဲ့ row အများကြီးကိုလည်း id နဲ့ page လိုက်ယူနိုင်သည်
+def _encode_sync_cursor(after_id, since, since_id=0):
+    return f"{after_id}:{(since - _EPOCH) // timedelta(microseconds=1)}:{since_id}"
+
+def _decode_sync_cursor(token):
+    try:
+        parts = token.split(':')
+        if len(parts) == 2:
+            # Cursor အဟောင်း (millisecond, since_id မပါ)
+            after_id, since_ms = parts
+            since_us, since_id = int(since_ms) * 1000, 0
+        else:
+            after_id, since_us, since_id = parts
+        since = _EPOCH + timedelta(microseconds=int(since_us))
+    except OverflowError:
+        raise ValueError(token)
+    if since < timezone.now() - DeletedMessage.RETENTION:
+        # ဖျက်ထားတဲ့ Message tombstone တွေ prune လုပ်ပြီးသား ဖြစ်နိုင်လို့ client က အစကနေ ပြန် load လုပ်ရမည်
+        raise ValueError(token)
+    return int(after_id), since, int(since_id)
+
+def _sync_messages(user, receiver, cursor=None):
+    """
+    get_messages နဲ့ event_stream နှစ်ခုလုံး သုံးတဲ့ sync core ပါ။
+    cursor မပါရင် နောက်ဆုံး page, ပါရင် cursor နောက်ပိုင်း ပြောင်းထားတာများ။ Cursor မှားရင် ValueError။
+    """
+    conversation = _conversation(user, receiver).select_related('sender', 'parent')
+    floor = timezone.now() - CHAT_SYNC_OVERLAP
+
+    deleted = []
+    if cursor:
+        after_id, since, since_id = _decode_sync_cursor(cursor)
+        new = list(conversation.filter(id__gt=after_id).order_by('id')[:CHAT_SYNC_LIMIT + 1])
+        # ပြင်ထားတဲ့ (Edit) message ဟောင်းများ - (updated_at, id) keyset နဲ့ page လိုက်
+        edited = list(conversation.filter(id__lte=after_id).filter(
+            Q(updated_at__gt=since) | Q(updated_at=since, id__gt=since_id)
+        ).order_by('updated_at', 'id')[:CHAT_SYNC_LIMIT + 1])
+        deleted = list(DeletedMessage.objects.filter(
+            Q(sender=user, receiver=receiver) | Q(sender=receiver, receiver=user),
+            deleted_at__gt=since, message_id__lte=after_id
+        ).values_list('message_id', flat=True))
+
+        # has_more = ကျန်သေးလို့ client က ချက်ချင်း ထပ်ယူရမည်
+        has_more = len(new) > CHAT_SYNC_LIMIT or len(edited) > CHAT_SYNC_LIMIT
+        new, edited = new[:CHAT_SYNC_LIMIT], edited[:CHAT_SYNC_LIMIT]
+        if len(edited) == CHAT_SYNC_LIMIT:
+            since, since_id = edited[-1].updated_at, edited[-1].id
+        elif floor > since:
+            since, since_id = floor, 0
+        msgs = edited + new
+        last_id = max([after_id] + [m.id for m in new])
+    else:
+        page = list(conversation.order_by('-id')[:CHAT_PAGE_SIZE + 1])
+        has_more = len(page) > CHAT_PAGE_SIZE
+        msgs = page[:CHAT_PAGE_SIZE][::-1]
+        last_id = max([0] + [m.id for m in msgs])
+        since, since_id = floor, 0
+
+    # Watermark ထက်သစ်တဲ့ incoming message ရှိမှသာ Conversation row တစ်ခုကို UPDATE လုပ်သည်
+    watermarks = Conversation.read_watermarks(user, receiver)
+    newest_incoming = max([m.id for m in msgs if m.sender_id == receiver.id], default=0)
+    if newest_incoming > watermarks.get(user.id, 0):
+        if Conversation.mark_read(user, receiver, newest_incoming):
+            touch(user.id, receiver.id)
+        watermarks[user.id] = newest_incoming
+
+    return {
+        'messages': [_message_json(m, watermarks) for m in msgs],
+        'deleted': deleted,
+        'cursor': _encode_sync_cursor(last_id, since, since_id),
+        # cursor မပါရင် history အဟောင်း ရှိသေးလား၊ ပါရင် sync ကျန်သေးလား
+        'has_more': has_more,
+        # Partner က ကိုယ့် Message တွေကို ဒီ id အထိ ဖတ်ပြီး (Read receipt)
+        'read_upto': watermarks.get(receiver.id, 0),
+    }
+
 @login_required
+@condition(etag_func=_sync_etag)
 def get_messages(request, username):
+    """
+    ?before_id=N -> N ထက်ဟောင်းတဲ့ history page (scroll up)
+    ?cursor=...  -> cursor နောက်ပိုင်း အသစ်ရောက်လာတာ၊ ပြင်ထားတာ၊ ဖျက်ထားတာ များ
+    (မပါရင်)      -> နောက်ဆုံး page နဲ့ cursor အသစ်
+    """
     receiver = get_object_or_404(User, username=username)
-    messages_query = Message.objects.filter(
-        (Q(sender=request.user, receiver=receiver) | Q(sender=receiver, receiver=request.user))
-    ).order_by('timestamp').select_related('sender', 'parent')
-
-    Message.objects.filter(sender=receiver, receiver=request.user, is_read=False).update(is_read=True)
-
-    msg_list = []
-    for m in messages_query:
-        msg_list.append({
-            'id': m.id, 'sender': m.sender.username, 'content': str(m.content),
-            'image': m.image.url if m.image else None,
-            'voice_note': m.voice_note.url if m.voice_note else None,
-            'timestamp': m.timestamp.strftime('%I:%M %p'), 'is_read': m.is_read,
-            'parent_content': str(m.parent.content) if m.parent else None
+    deliver_broadcasts(request.user)
+
+    before_id = request.GET.get('before_id')
+    if before_id:
+        if not before_id.isdigit():
+            return JsonResponse({'status': 'error'}, status=400)
+        conversation = _conversation(request.user, receiver).select_related('sender', 'parent')
+        page = list(conversation.filter(id__lt=before_id).order_by('-id')[:CHAT_PAGE_SIZE + 1])
+        watermarks = Conversation.read_watermarks(request.user, receiver)
+        return JsonResponse({
+            'messages': [_message_json(m, watermarks) for m in reversed(page[:CHAT_PAGE_SIZE])],
+            'has_more': len(page) > CHAT_PAGE_SIZE,
+            'me': request.user.username
         })
-    return JsonResponse({
-        'messages': msg_list,
-        'me': request.user.username,
-        'is_online': receiver.profile.is_online()
-    })
+
+    try:
+        data = _sync_messages(request.user, receiver, request.GET.get('cursor'))
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'Invalid cursor.'}, status=400)
+    data['me'] = request.user.username
+    data['is_online'] = receiver.profile.is_online()
+    return JsonResponse(data)
 
 @login_required
 def edit_message(request, message_id):
@@ -380,68 +596,152 @@ def edit_message(request, message_id):
 def delete_message(request, message_id):
     message = get_object_or_404(Message, id=message_id)
     if message.sender == request.user or message.receiver == request.user:
+        message_id = message.id
+        DeletedMessage.objects.create(message_id=message_id, sender_id=message.sender_id, receiver_id=message.receiver_id)
         message.delete()
+        Conversation.record_delete(message, message_id)
+        touch(message.sender_id, message.receiver_id)
         return JsonResponse({'status': 'success'})
     return JsonResponse({'status': 'error'}, status=403)
 
 # --- PROFILE & SOCIAL ---
 
+def _profile_posts_queryset(author, viewer):
+    return _with_comment_previews(_with_liked_by_viewer(
+        Post.objects.filter(author=author).select_related('author', 'author__profile'), viewer
+    ))
+
+@login_required
+def profile_posts_page(request, username):
+    """ Profile ရဲ့ Infinite scroll - နောက် page ရဲ့ Post card HTML """
+    viewed_user = get_object_or_404(User, username=username)
+    try:
+        posts, next_cursor = keyset_page(_profile_posts_queryset(viewed_user, request.user), request.GET.get('cursor'))
+    except InvalidCursor:
+        return JsonResponse({'status': 'error', 'message': 'Invalid cursor.'}, status=400)
+    _attach_comment_cursors(posts)
+
+    cards = render_post_cards(posts, 'includes/profile_post.html', request.user)
+    html = render_to_string('includes/feed_posts.html', {'cards': cards})
+    return JsonResponse({'status': 'success', 'html': html, 'next_cursor': next_cursor})
+
 @login_required
 def profile_view(request, username):
     viewed_user = get_object_or_404(User, username=username)
     profile, _ = Profile.objects.get_or_create(user=viewed_user)
-    posts = Post.objects.filter(author=viewed_user).select_related('author', 'author__profile').order_by('-created_at')
+    posts, next_cursor = keyset_page(_profile_posts_queryset(viewed_user, request.user))
+    _attach_comment_cursors(posts)
+    cards = render_post_cards(posts, 'includes/profile_post.html', request.user)
 
-    is_friend = request.user.profile.friends.filter(id=viewed_user.id).exists()
-    sent_request = FriendRequest.objects.filter(from_user=request.user, to_user=viewed_user).exists()
-    received_request = FriendRequest.objects.filter(from_user=viewed_user, to_user=request.user).exists()
-    is_blocked = BlockedUser.objects.filter(blocker=request.user, blocked=viewed_user).exists()
-    is_bot = (viewed_user.username == 'ThuTalkBot' or profile.role == 'Official')
+    is_bot = (viewed_user.username == BOT_USERNAME or profile.role == 'Official')
 
     return render(request, 'profile.html', {
-        'viewed_user': viewed_user, 'user_profile': profile,
-        'user_posts': posts, 'is_friend': is_friend,
-        'sent_request': sent_request, 'received_request': received_request,
-        'is_blocked': is_blocked, 'is_bot': is_bot
+        'viewed_user': viewed_user, 'user_profile': profile, 'cards': cards, 'next_cursor': next_cursor,
+        **relationship_flags(request.user, [viewed_user.id])[viewed_user.id],
+        'is_bot': is_bot,
+        'friends_preview': friends_queryset(viewed_user.id).select_related('profile').order_by('id')[:5],
     })
 
 @login_required
 def search_page(request):
     query = request.GET.get('q', '').strip()
-    users_data = []
+    page = request.GET.get('page', '1')
+    page = max(1, min(int(page) if page.isdigit() else 1, MAX_USER_SEARCH_PAGE))
+    users_data, has_more = [], False
     if query:
-        users = User.objects.filter(
-            Q(username__icontains=query) |
-            Q(profile__talk_id__icontains=query) |
-            Q(profile__bio__icontains=query)
-        ).exclude(id=request.user.id).select_related('profile')
-
-        for u in users:
+        found = search_users(query, request.user.id, page)
+        if found is None:
+            # SQLite မဟုတ်တဲ့ database - index မရှိလို့ ရိုးရိုး ရှာသည်
+            offset = (page - 1) * USER_SEARCH_PAGE_SIZE
+            ids = list(User.objects.filter(
+                Q(username__icontains=query) |
+                Q(profile__talk_id__icontains=query) |
+                Q(profile__bio__icontains=query)
+            ).exclude(id=request.user.id).order_by('username').values_list('id', flat=True)[offset:offset + USER_SEARCH_PAGE_SIZE + 1])
+            found = ids[:USER_SEARCH_PAGE_SIZE], len(ids) > USER_SEARCH_PAGE_SIZE
+        ids, has_more = found
+
+        by_id = User.objects.select_related('profile').in_bulk(ids)
+        flags = relationship_flags(request.user, ids)
+        for u in (by_id[i] for i in ids if i in by_id):
             users_data.append({
                 'user': u,
-                'is_friend': request.user.profile.friends.filter(id=u.id).exists(),
-                'sent_request': FriendRequest.objects.filter(from_user=request.user, to_user=u).exists(),
-                'received_request': FriendRequest.objects.filter(from_user=u, to_user=request.user).exists(),
-                'is_blocked': BlockedUser.objects.filter(blocker=request.user, blocked=u).exists(),
-                'is_bot': (u.username == 'ThuTalkBot' or u.profile.role == 'Official'),
+                **flags[u.id],
+                'is_bot': (u.username == BOT_USERNAME or u.profile.role == 'Official'),
                 'role': u.profile.role
             })
-    return render(request, 'search.html', {'users_data': users_data, 'query': query})
+    return render(request, 'search.html', {
+        'users_data': users_data, 'query': query,
+        'page': page, 'next_page': page + 1 if has_more else None,
+    })
+
+@login_required
+def autocomplete_users(request):
+    """ Search box typeahead - Username / Talk ID prefix (memory ထဲက index ကနေ) """
+    return JsonResponse({'status': 'success', 'results': autocomplete(request.GET.get('q', ''), request.user.id)})
 
 @login_required
 def all_friends_view(request, username):
+    """ Friend စာရင်း - id အစဉ်နဲ့ cursor page လိုက်၊ Friend တစ်ယောက်ချင်းစီမှာ viewer နဲ့ Mutual friend အရေအတွက် """
     user = get_object_or_404(User, username=username)
-    Profile.objects.get_or_create(user=user)
+    profile, _ = Profile.objects.get_or_create(user=user)
+    try:
+        after_id = max(0, int(request.GET.get('cursor', 0)))
+    except ValueError:
+        after_id = 0
+
+    ids, has_more = friends_page(user.id, after_id)
+    friends = list(User.objects.filter(id__in=ids).select_related('profile').order_by('id'))
+    mutual = mutual_friend_counts(request.user.id, ids)
+    for friend in friends:
+        friend.mutual_count = mutual[friend.id]
+
     return render(request, 'all_friends.html', {
         'viewed_user': user,
-        'friends': user.profile.friends.all().select_related('profile')
+        'friends': friends,
+        'friend_count': profile.friend_count,
+        'next_cursor': ids[-1] if has_more else None,
     })
 
+@login_required
+def friend_suggestions(request):
+    """ People you may know - build_friend_suggestions command က တွက်ထားတာကို ပြန်ပေးရုံ """
+    rows = list(FriendSuggestion.objects.filter(user=request.user).select_related(
+        'suggested', 'suggested__profile'
+    ).order_by('-mutual_count', 'suggested_id')[:SUGGESTION_TOP_K])
+
+    # တွက်ပြီးနောက် Friend ဖြစ်သွား/Request ပို့ထား/Block လုပ်ထားတာတွေကို ဖယ်သည်
+    flags = relationship_flags(request.user, [r.suggested_id for r in rows])
+    suggestions = []
+    for r in rows:
+        if any(flags[r.suggested_id].values()):
+            continue
+        u = r.suggested
+        suggestions.append({
+            'id': u.id, 'username': u.username, 'talk_id': u.profile.talk_id,
+            'profile_pic': u.profile.profile_pic.avatar_url if u.profile.profile_pic else '/static/default_profile.png',
+            'mutual_count': r.mutual_count,
+        })
+    return JsonResponse({'status': 'success', 'suggestions': suggestions})
+
+MAX_RELATIONSHIP_IDS = 100
+
+@login_required
+def relationships_api(request):
+    """ Mobile client - ?ids=1,2,3 User list တစ်ခုလုံးရဲ့ relationship flag များကို တစ်ခါတည်း ယူရန် """
+    raw_ids = [i for i in request.GET.get('ids', '').split(',') if i]
+    if len(raw_ids) > MAX_RELATIONSHIP_IDS or not all(i.isdigit() for i in raw_ids):
+        return JsonResponse({'status': 'error', 'message': 'Invalid ids.'}, status=400)
+    flags = relationship_flags(request.user, {int(i) for i in raw_ids})
+    return JsonResponse({'status': 'success', 'relationships': {str(uid): f for uid, f in flags.items()}})
+
 # --- FRIEND ACTIONS ---
 
 @login_required
 def send_friend_request(request, user_id):
     to_user = get_object_or_404(User, id=user_id)
+    if is_blocked_between(request.user.id, to_user.id):
+        return JsonResponse({'status': 'error'}, status=403)
     if to_user != request.user:
         FriendRequest.objects.get_or_create(from_user=request.user, to_user=to_user)
         return JsonResponse({'status': 'success'})
@@ -455,13 +755,9 @@ def cancel_friend_request(request, user_id):
 @login_required
 def accept_friend(request, request_id):
     f_request = get_object_or_404(FriendRequest, id=request_id, to_user=request.user)
-    request.user.profile.friends.add(f_request.from_user)
-    f_request.from_user.profile.friends.add(request.user)
+    Friendship.add(request.user.id, f_request.from_user_id)
 
-    Notification.objects.create(
-        recipient=f_request.from_user, sender=request.user,
-        notification_type='FriendRequest', content=f"{request.user.username} accepted your friend request."
-    )
+    enqueue('friend_accepted_notification', recipient_id=f_request.from_user_id, sender_id=request.user.id)
     f_request.delete()
     return redirect('notifications')
 
@@ -473,17 +769,17 @@ def delete_request(request, request_id):
 @login_required
 def unfriend_user(request, user_id):
     target = get_object_or_404(User, id=user_id)
-    request.user.profile.friends.remove(target)
-    target.profile.friends.remove(request.user)
+    Friendship.remove(request.user.id, target.id)
     return JsonResponse({'status': 'success'})
 
 @login_required
 def block_user(request, user_id):
     target = get_object_or_404(User, id=user_id)
     BlockedUser.objects.get_or_create(blocker=request.user, blocked=target)
+    invalidate_block_state(request.user.id, target.id)
+    touch(request.user.id, target.id)
 
-    request.user.profile.friends.remove(target)
-    target.profile.friends.remove(request.user)
+    Friendship.remove(request.user.id, target.id)
     FriendRequest.objects.filter(Q(from_user=request.user, to_user=target) | Q(from_user=target, to_user=request.user)).delete()
 
     return JsonResponse({'status': 'success'})
@@ -492,6 +788,8 @@ def block_user(request, user_id):
 def unblock_user(request, user_id):
     target = get_object_or_404(User, id=user_id)
     BlockedUser.objects.filter(blocker=request.user, blocked=target).delete()
+    invalidate_block_state(request.user.id, target.id)
+    touch(request.user.id, target.id)
     return JsonResponse({'status': 'success'})
 
 # --- SETTINGS & UPDATE ---
@@ -548,7 +846,10 @@ def change_password(request):
 def delete_account(request):
     if request.method == "POST":
         user = request.user
-        user.delete()
+        # Login ပြန်ဝင်လို့ မရအောင် ပိတ်ပြီး data တွေကို worker က ဖျက်ပါမယ်
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+        enqueue('delete_account', user_id=user.id)
         logout(request)
         messages.success(request, "Account deleted.")
         return redirect('login')
@@ -556,29 +857,134 @@ def delete_account(request):
 
 # --- NOTIFICATIONS & STORIES ---
 
+NOTIFICATION_PAGE_SIZE = 20
+FRIEND_REQUEST_PAGE_SIZE = 10
+
+def _page_or_first(queryset, cursor, page_size, key='created_at'):
+    try:
+        return keyset_page(queryset, cursor, page_size, key=key)
+    except InvalidCursor:
+        return keyset_page(queryset, None, page_size, key=key)
+
 @login_required
 def notifications(request):
     f_requests = FriendRequest.objects.filter(to_user=request.user).select_related('from_user', 'from_user__profile')
-    general_notifs = Notification.objects.filter(recipient=request.user).select_related('sender', 'sender__profile').order_by('-created_at')
+    general_notifs = Notification.objects.filter(recipient=request.user).select_related('sender', 'sender__profile')
 
-    general_notifs.filter(is_seen=False).update(is_seen=True)
+    friend_requests, next_request_cursor = _page_or_first(f_requests, request.GET.get('req_cursor'), FRIEND_REQUEST_PAGE_SIZE)
+    page, next_cursor = _page_or_first(general_notifs, request.GET.get('cursor'), NOTIFICATION_PAGE_SIZE, key='updated_at')
+
+    # ပြလိုက်တဲ့ row တွေကိုပဲ seen လုပ်သည် (page ထဲမှာတော့ unread dot ကို ဆက်ပြထားသည်)
+    unseen_ids = [n.id for n in page if not n.is_seen]
+    if unseen_ids and Notification.objects.filter(id__in=unseen_ids, is_seen=False).update(is_seen=True):
+        reset_badges([request.user.id])
+        touch(request.user.id)
 
     return render(request, 'notification.html', {
-        'friend_requests': f_requests,
-        'notifications': general_notifs
+        'friend_requests': friend_requests,
+        'next_request_cursor': next_request_cursor,
+        'notifications': page,
+        'next_cursor': next_cursor,
     })
 
 @login_required
 def mark_all_notifications_read(request):
-    Notification.objects.filter(recipient=request.user, is_seen=False).update(is_seen=True)
+    if Notification.objects.filter(recipient=request.user, is_seen=False).update(is_seen=True):
+        reset_badges([request.user.id])
+        touch(request.user.id)
     return redirect('notifications')
 
 @login_required
+@condition(etag_func=_badges_etag)
 def get_unread_count(request):
-    notif_count = Notification.objects.filter(recipient=request.user, is_seen=False).count()
-    freq_count = FriendRequest.objects.filter(to_user=request.user).count()
-    chat_count = Message.objects.filter(receiver=request.user, is_read=False).count()
-    return JsonResponse({'notifications': notif_count + freq_count, 'chats': chat_count})
+    deliver_broadcasts(request.user)
+    return JsonResponse(badge_counts(request.user.id))
+
+# --- SERVER-SENT EVENTS ---
+# Badge, Inbox, Chat message, Presence တွေကို poll မလုပ်ဘဲ connection တစ်ခုတည်းကနေ push လုပ်ပေးသည်။
+# ASGI (uvicorn/daphne) နဲ့ run မှသာ အလုပ်လုပ်ပါတယ် - WSGI ဆိုရင် 204 ပြန်ပြီး client က polling ကို ပြန်သုံးပါတယ်။
+# Loop တစ်ခါချင်းစီမှာ cache stamp (events.py) တစ်ခုပဲ ဖတ်ပြီး stamp ပြောင်းမှ database ကို မေးသည်။
+
+EVENT_STREAM_TICK = 1           # stamp စစ်တဲ့ interval (seconds)
+EVENT_STREAM_REFRESH = 15       # stamp မပြောင်းလည်း badge ကို ပြန်စစ်ပြီး heartbeat ပို့သည်
+EVENT_STREAM_PRESENCE = 30      # Chat partner ရဲ့ Online status စစ်တဲ့ interval
+EVENT_STREAM_MAX_AGE = 300      # Worker တစ်ခုကို အကြာကြီး မချုပ်ထားအောင် ပိတ်ပြီး client ကို reconnect ခိုင်းသည်
+EVENT_STREAM_RETRY_MS = 2000
+
+def _sse(event, data, event_id=None):
+    lines = [f'id: {event_id}'] if event_id else []
+    lines += [f'event: {event}', f'data: {json.dumps(data)}']
+    return '\n'.join(lines) + '\n\n'
+
+async def _event_stream(user, partner, cursor):
+    yield f'retry: {EVENT_STREAM_RETRY_MS}\n\n'
+    started = time.monotonic()
+    last_stamp = None
+    last_refresh = last_presence = float('-inf')
+    badges = None
+    online = None
+    read_upto = None
+
+    while time.monotonic() - started < EVENT_STREAM_MAX_AGE:
+        now = time.monotonic()
+        current = await astamp(user.id)
+        if current != last_stamp or now - last_refresh >= EVENT_STREAM_REFRESH:
+            changed = last_stamp is not None and current != last_stamp
+            last_stamp, last_refresh = current, now
+
+            if await sync_to_async(deliver_broadcasts)(user):
+                continue  # touch() လုပ်ထားလို့ နောက် loop မှာ stamp အသစ်နဲ့ ပြန်စစ်မည်
+            counts = await sync_to_async(badge_counts)(user.id)
+            if counts != badges:
+                badges = counts
+                yield _sse('unread', counts)
+            if changed:
+                yield _sse('inbox', {})
+            if partner is not None and cursor:
+                try:
+                    data = await sync_to_async(_sync_messages)(user, partner, cursor)
+                except ValueError:
+                    cursor = None
+                else:
+                    cursor = data['cursor']
+                    if data['has_more']:
+                        last_refresh = float('-inf')  # နောက် tick မှာ ကျန်တာ ဆက်ယူမည်
+                    if data['messages'] or data['deleted'] or data['read_upto'] != read_upto:
+                        read_upto = data['read_upto']
+                        # id ထည့်ထားလို့ reconnect ရင် browser က Last-Event-ID နဲ့ cursor ကို ပြန်ပို့ပါတယ်
+                        yield _sse('messages', data, event_id=cursor)
+            yield ': ping\n\n'
+
+        if partner is not None and now - last_presence >= EVENT_STREAM_PRESENCE:
+            last_presence = now
+            profile = await Profile.objects.filter(user=partner).afirst()
+            is_online = bool(profile and profile.is_online())
+            if is_online != online:
+                online = is_online
+                yield _sse('presence', {'username': partner.username, 'is_online': is_online})
+
+        await asyncio.sleep(EVENT_STREAM_TICK)
+
+@login_required
+async def event_stream(request):
+    """ ?chat=<username>&cursor=<sync cursor> ပါရင် အဲ့ဒီ Chat ရဲ့ message များကိုပါ push လုပ်သည် """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+
+    user = await request.auser()
+    partner = None
+    chat = request.GET.get('chat')
+    if chat:
+        partner = await User.objects.filter(username=chat).afirst()
+        # Block ဆက်ဆံရေး ရှိရင် message / presence မပို့ပါ (Client က polling ပြောင်းပါလိမ့်မယ်)
+        if partner is not None and await sync_to_async(is_blocked_between)(user.id, partner.id):
+            return JsonResponse({'status': 'error'}, status=403)
+    cursor = request.headers.get('Last-Event-ID') or request.GET.get('cursor')
+
+    response = StreamingHttpResponse(_event_stream(user, partner, cursor), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 @login_required
 def add_story(request):
@@ -604,20 +1010,17 @@ def admin_broadcast_view(request):
     if request.method == "POST":
         msg_content = request.POST.get('message')
         if msg_content:
-            setup_bots()
-            try:
-                broadcast_bot = User.objects.get(username='ThuTalkBot')
-                all_users = User.objects.exclude(id=broadcast_bot.id)
-
-                messages_to_send = [Message(sender=broadcast_bot, receiver=user, content=msg_content) for user in all_users]
-                Message.objects.bulk_create(messages_to_send)
-
-                messages.success(request, f"Broadcast sent to all users.")
-            except User.DoesNotExist:
-                messages.error(request, "Bot user not found.")
+            # Row တစ်ခုပဲ သိမ်းသည် - User တွေ Chat ဖွင့်တဲ့အခါ ThuTalkBot ကနေ ရောက်လာပါမယ်
+            AdminBroadcast.objects.create(subject=None, message=msg_content)
+            messages.success(request, f"Broadcast sent to all users.")
             return redirect('home')
     return render(request, 'admin_broadcast.html')
 
+@staff_member_required
+def post_card_cache_stats(request):
+    """ Post card fragment cache ရဲ့ hit/miss စာရင်း """
+    return JsonResponse(card_cache_stats())
+
 @staff_member_required
 def ban_user(request, user_id):
     target = get_object_or_404(User, id=user_id)
@@ -655,6 +1058,8 @@ def search_by_id(request):
     return redirect('home')
 
 @login_required
+@condition(etag_func=_presence_etag)
 def user_status_api(request, username):
     user = get_object_or_404(User, username=username)
+    record_last_seen(username, user.profile.last_seen)
     return JsonResponse({'is_online': user.profile.is_online()})
\ No newline at end of file
@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mysite.settings')
 
 application = get_asgi_application()
+
+# Username / Talk ID autocomplete index ကို ပထမ request မရောက်ခင် ဆောက်ထားသည်
+from myapp.autocomplete import warm_autocomplete  # noqa: E402
+warm_autocomplete()
@@ -68,9 +68,33 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # run_jobs worker က thread/process အများနဲ့ ရေးတဲ့အခါ write lock ရဖို့ timeout စက္ကန့်အထိ စောင့်ပါတယ်
+        # (Job claim က conditional UPDATE နဲ့ ကာထားလို့ site တစ်ခုလုံးကို IMMEDIATE transaction မလိုပါ)
+        'OPTIONS': {'timeout': 20},
     }
 }
 
+# Cache
+# Production မှာ REDIS_URL (Redis) ထားပါ - Block set, change stamp, badge counter, friend adjacency, post card
+# စတာတွေကို worker process အားလုံးက တစ်ခုတည်း မျှသုံးပြီး database ကို မမေးရပါ။
+# REDIS_URL မရှိရင် LocMemCache (process တစ်ခုချင်းစီမှာ သီးသန့်) ဖြစ်လို့ process တစ်ခုက ပြောင်းတာကို
+# တခြား process များက timeout ကုန်မှ မြင်ပါမယ် - badge (BADGE_TIMEOUT), block set (BLOCK_STATE_TIMEOUT, ရေးတဲ့နေရာတွေက
+# database ကို စစ်သည်), friend set (FRIENDS_TIMEOUT), ETag (ETAG_WINDOW), SSE (EVENT_STREAM_REFRESH), broadcast (LATEST_TIMEOUT)။
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 100000},
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -125,6 +149,12 @@ if not DEBUG:
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# --- Background Jobs (myapp/jobs.py) ---
+# Default က Job table ထဲ ထည့်ရုံပဲ - `python manage.py run_jobs` worker (သို့) cron က `run_jobs --once` နဲ့ run ပါ။
+# Worker မရှိတဲ့ deploy (Vercel - vercel.json) မှာ JOBS_RUN_INLINE=1 ထားရင် commit ပြီးမှ request ထဲမှာပဲ run ပါမယ်
+# (Image variant ထုတ်တာ အပါအဝင် side effect တိုင်းက request latency ထဲ ပါလာပါမယ်)
+JOBS_RUN_INLINE = os.environ.get('JOBS_RUN_INLINE') == '1'
+
 # Authentication Redirects
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'home'
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mysite.settings')
 
 application = get_wsgi_application()
+
+# Username / Talk ID autocomplete index ကို ပထမ request မရောက်ခင် ဆောက်ထားသည်
+from myapp.autocomplete import warm_autocomplete  # noqa: E402
+warm_autocomplete()